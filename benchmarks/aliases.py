@@ -0,0 +1,112 @@
+"""Load time and memory with and without yaml aliases sharing, on a
+generated specification where every operation uses the same (aliased)
+parameters and responses, and on a specification without aliases.
+
+Usage: python -m benchmarks.aliases [paths]
+"""
+import asyncio
+import copy
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as t
+
+import yaml
+
+import openapydantic
+from benchmarks import common
+
+
+def aliased_spec(
+    paths: int,
+) -> t.Dict[str, t.Any]:
+    # yaml.safe_dump writes anchors and aliases for the shared objects
+    pet_spec = common.load_fixture(common.PETSTORE_EXPANDED)
+    operation = copy.deepcopy(pet_spec["paths"]["/pets"]["get"])
+    schema = copy.deepcopy(pet_spec["components"]["schemas"]["NewPet"])
+    responses = {
+        "200": {
+            "description": "pets",
+            "content": {"application/json": {"schema": schema}},
+        },
+        "default": operation["responses"]["default"],
+    }
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "aliases", "version": "1"},
+        "paths": {
+            f"/pets{index}": {
+                "get": {
+                    "parameters": operation["parameters"],
+                    "responses": responses,
+                },
+            }
+            for index in range(paths)
+        },
+        "components": pet_spec["components"],
+    }
+
+
+def write_yaml(
+    raw_api: t.Dict[str, t.Any],
+) -> str:
+    file_descriptor, file_path = tempfile.mkstemp(suffix=".yaml")
+    with os.fdopen(file_descriptor, "w") as file:
+        yaml.safe_dump(raw_api, file)
+    return file_path
+
+
+def load(
+    file_path: str,
+    share_aliases: bool,
+) -> t.Any:
+    return asyncio.run(
+        openapydantic.load_api(file_path=file_path, share_aliases=share_aliases),
+    )
+
+
+def measure(
+    file_path: str,
+    share_aliases: bool,
+) -> t.Tuple[float, int]:
+    start = time.perf_counter()
+    api = load(file_path, share_aliases)
+    duration = time.perf_counter() - start
+    del api
+
+    # memory measured apart: tracemalloc slows the load down
+    gc.collect()
+    tracemalloc.start()
+    api = load(file_path, share_aliases)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del api  # kept alive while measured
+    return duration, size
+
+
+def main(
+    paths: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), 50)
+    raw_api["openapi"] = "3.0.2"
+    specs = {
+        f"aliased ({paths} paths)": write_yaml(aliased_spec(paths)),
+        "no alias (factor 50)": write_yaml(raw_api),
+    }
+    print(f"{'spec':<24}{'share_aliases':>14}{'time':>10}{'memory':>12}")
+    for name, file_path in specs.items():
+        for share_aliases in (False, True):
+            duration, size = measure(file_path, share_aliases)
+            print(
+                f"{name:<24}{str(share_aliases):>14}{duration * 1000:>8.0f}ms"
+                f"{size / 2**20:>10.1f}MB",
+            )
+        os.remove(file_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
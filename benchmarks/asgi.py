@@ -0,0 +1,92 @@
+"""Contract validation middleware overhead per request, on the expanded
+petstore scaled 100 times (200 paths): GET /pets/{id} requests, responses
+validated inline or in the background for a sample of them.
+
+Usage: python -m benchmarks.asgi [requests]
+"""
+import asyncio
+import json
+import sys
+import time
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import asgi
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+PET = json.dumps({"id": 1, "name": "rex", "tag": "dog"}).encode()
+
+
+async def app(
+    scope: t.Dict[str, t.Any],
+    receive: t.Any,
+    send: t.Any,
+) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        },
+    )
+    await send({"type": "http.response.body", "body": PET})
+
+
+async def run(
+    application: t.Any,
+    requests: int,
+) -> float:
+    async def receive() -> t.Dict[str, t.Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: t.Dict[str, t.Any]) -> None:
+        pass
+
+    start = time.perf_counter()
+    for index in range(requests):
+        suffix = f"_{index % 100}" if index % 100 else ""
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": f"/pets/{index}{suffix}",
+            "query_string": b"",
+            "headers": [],
+        }
+        await application(scope, receive, send)
+    if isinstance(application, asgi.ContractValidationMiddleware):
+        await application.drain()
+    return time.perf_counter() - start
+
+
+def main(
+    requests: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), 100)
+    raw_api["openapi"] = "3.0.2"
+    api = versions.get_version_module(OpenApiVersion.v3_0_2).load_api(
+        raw_api=raw_api,
+    )
+    configurations: t.Dict[str, t.Dict[str, t.Any]] = {
+        "requests only": {},
+        "10% responses": {"response_sample_rate": 0.1},
+        "all responses": {"response_sample_rate": 1},
+        "all, background": {"response_sample_rate": 1, "background": True},
+    }
+
+    bare = asyncio.run(run(app, requests))
+    print(f"{'configuration':<20}{'per request':>14}{'overhead':>12}")
+    print(f"{'no middleware':<20}{bare / requests * 1e6:>12.1f}us")
+    for name, options in configurations.items():
+        middleware = asgi.ContractValidationMiddleware(app, api=api, **options)
+        duration = asyncio.run(run(middleware, requests))
+        assert middleware.metrics.invalid_responses == 0  # nosec
+        print(
+            f"{name:<20}{duration / requests * 1e6:>12.1f}us"
+            f"{middleware.metrics.mean_overhead * 1e6:>10.1f}us",
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,60 @@
+"""Load time benchmark of the model backends (pydantic v1 and pydantic v2).
+
+The specification is parsed once, only the models building (validation and
+reference interpolation) is measured. The pydantic_v2 backend is only
+measured when pydantic>=2 is installed.
+
+Usage: python -m benchmarks.backends [factor]
+"""
+import sys
+import time
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import compat
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+ModelBackend = openapydantic.common.ModelBackend
+
+FIXTURES = {
+    "uspto": common.USPTO,
+    "petstore-expanded": common.PETSTORE_EXPANDED,
+}
+
+
+def measure(
+    raw_api: t.Dict[str, t.Any],
+    backend: ModelBackend,
+    runs: int = 3,
+) -> float:
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2, backend)
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        version_module.load_api(raw_api=raw_api)  # type: ignore
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main(
+    factor: int,
+) -> None:
+    backends: t.List[ModelBackend] = [ModelBackend.pydantic_v1]
+    if compat.PYDANTIC_V2:
+        backends.append(ModelBackend.pydantic_v2)
+    else:
+        print("pydantic v2 is not installed, pydantic_v2 backend skipped")
+
+    print(f"scale factor: {factor}")
+    print(f"{'fixture':<20}{'backend':<14}{'load':>12}")
+    for name, fixture in FIXTURES.items():
+        scaled = common.scale_spec(common.load_fixture(fixture), factor)
+        for backend in backends:
+            duration = measure(scaled, backend)
+            print(f"{name:<20}{backend.value:<14}{duration * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,80 @@
+import copy
+import json
+import os
+import tempfile
+import typing as t
+
+import yaml
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, "tests", "integration")
+
+USPTO = os.path.join(FIXTURES_DIR, "v3.0.1", "fixture", "ok", "uspto.yaml")
+PETSTORE_EXPANDED = os.path.join(
+    FIXTURES_DIR,
+    "v3.0.0",
+    "fixture",
+    "ok",
+    "petstore-expanded.yaml",
+)
+
+
+def load_fixture(
+    file_path: str,
+) -> t.Dict[str, t.Any]:
+    with open(file_path) as file:
+        return yaml.safe_load(file)  # type: ignore
+
+
+def _rename_references(
+    obj: t.Any,
+    suffix: str,
+) -> t.Any:
+    if isinstance(obj, dict):
+        result = {}
+        for key, value in obj.items():
+            if key == "$ref" and isinstance(value, str):
+                result[key] = f"{value}{suffix}"
+            else:
+                result[key] = _rename_references(value, suffix)
+        return result
+    if isinstance(obj, list):
+        return [_rename_references(value, suffix) for value in obj]
+    return obj
+
+
+def scale_spec(
+    raw_api: t.Dict[str, t.Any],
+    factor: int,
+) -> t.Dict[str, t.Any]:
+    """Duplicate every path and component `factor` times.
+
+    Each copy gets its own suffix (and references are renamed accordingly)
+    so the scaled spec looks like a big generated spec: same structure,
+    same property names and descriptions, but distinct objects.
+    """
+    scaled = copy.deepcopy(raw_api)
+    scaled["paths"] = {}
+    components = raw_api.get("components", {})
+    scaled["components"] = {key: {} for key in components}
+
+    for index in range(factor):
+        suffix = f"_{index}" if index else ""
+        for path, item in raw_api.get("paths", {}).items():
+            scaled["paths"][f"{path}{suffix}"] = _rename_references(item, suffix)
+        for component_type, values in components.items():
+            for key, value in values.items():
+                scaled["components"][component_type][
+                    f"{key}{suffix}"
+                ] = _rename_references(value, suffix)
+    return scaled
+
+
+def write_spec(
+    raw_api: t.Dict[str, t.Any],
+) -> str:
+    # json is valid yaml and a lot faster to dump
+    file_descriptor, file_path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(file_descriptor, "w") as file:
+        json.dump(raw_api, file)
+    return file_path
@@ -0,0 +1,37 @@
+"""Json export with interpolated references vs keeping the references to
+components, on the expanded petstore scaled up: time and size.
+
+Usage: python -m benchmarks.export [factor]
+"""
+import sys
+import time
+
+import openapydantic
+from benchmarks import common
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def main(
+    factor: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), factor)
+    raw_api["openapi"] = "3.0.2"
+    api = versions.get_version_module(OpenApiVersion.v3_0_2).load_api(
+        raw_api=raw_api,
+    )
+    print(f"{len(api.paths)} paths")
+    print(f"{'export':<20}{'time':>10}{'size':>12}")
+    for name, options in (
+        ("interpolated", {"exclude_components": False}),
+        ("keep_references", {"keep_references": True}),
+    ):
+        start = time.perf_counter()
+        result = api.as_clean_json(**options)
+        duration = time.perf_counter() - start
+        print(f"{name:<20}{duration * 1000:>8.0f}ms{len(result) / 2**10:>10.0f}KB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
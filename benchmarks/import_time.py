@@ -0,0 +1,75 @@
+"""Import time benchmark.
+
+Each statement runs in a fresh interpreter; the median duration is
+reported. With --max-ms, exit with an error when `import openapydantic`
+is slower (regression guard for CI).
+
+Usage: python -m benchmarks.import_time [--runs 10] [--max-ms 50]
+"""
+import argparse
+import statistics
+import subprocess  # nosec
+import sys
+import typing as t
+
+from benchmarks import common
+
+STATEMENTS = {
+    "import openapydantic": "import openapydantic",
+    "import versions": "from openapydantic import versions",
+    "first load_api": (
+        "import asyncio, openapydantic; "
+        "asyncio.run(openapydantic.load_api(file_path={file_path!r}, "
+        "version=openapydantic.OpenApiVersion.v3_0_2))"
+    ),
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(
+    statement: str,
+    runs: int,
+) -> float:
+    durations = []
+    for _ in range(runs):
+        output = subprocess.run(  # nosec
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=common.ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        durations.append(float(output.split()[-1]))
+    return statistics.median(durations) * 1000
+
+
+def main(
+    argv: t.Optional[t.Sequence[str]] = None,
+) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, statement in STATEMENTS.items():
+        results[name] = measure(
+            statement.format(file_path=common.PETSTORE_EXPANDED),
+            args.runs,
+        )
+        print(f"{name:<24}{results[name]:>8.1f}ms")
+
+    if args.max_ms is not None and results["import openapydantic"] > args.max_ms:
+        print(f"import openapydantic is slower than {args.max_ms}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Memory benchmark for string and value interning.
+
+Usage: python -m benchmarks.interning [factor]
+"""
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+FIXTURES = {
+    "uspto": common.USPTO,
+    "petstore-expanded": common.PETSTORE_EXPANDED,
+}
+
+
+def measure(
+    file_path: str,
+    intern: bool,
+) -> t.Tuple[int, int, int]:
+    gc.collect()
+    tracemalloc.start()
+    raw_api = asyncio.run(versions.load_spec(file_path=file_path, intern=intern))
+    raw_api_size, _ = tracemalloc.get_traced_memory()
+    del raw_api
+    gc.collect()
+    tracemalloc.reset_peak()
+
+    api = asyncio.run(
+        openapydantic.load_api(
+            file_path=file_path,
+            version=OpenApiVersion.v3_0_2,
+            intern=intern,
+        )
+    )
+    gc.collect()
+    api_size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del api
+    return raw_api_size, api_size, peak
+
+
+def main(
+    factor: int,
+) -> None:
+    print(f"scale factor: {factor}")
+    print(f"{'fixture':<20}{'intern':<8}{'raw_api':>12}{'api':>12}{'peak':>12}")
+    for name, fixture in FIXTURES.items():
+        scaled = common.scale_spec(common.load_fixture(fixture), factor)
+        file_path = common.write_spec(scaled)
+        try:
+            for intern in (False, True):
+                raw_api_size, api_size, peak = measure(file_path, intern)
+                print(
+                    f"{name:<20}{str(intern):<8}"
+                    f"{raw_api_size / 2**20:>10.1f}MB"
+                    f"{api_size / 2**20:>10.1f}MB"
+                    f"{peak / 2**20:>10.1f}MB"
+                )
+        finally:
+            os.remove(file_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
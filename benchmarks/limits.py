@@ -0,0 +1,63 @@
+"""Expansion estimation vs models building of a reference bomb: each schema
+references the previous one twice, so the expanded document doubles with
+each level.
+
+Usage: python -m benchmarks.limits [max depth]
+"""
+import sys
+import time
+import typing as t
+
+import openapydantic
+from openapydantic import limits
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def reference_bomb(
+    depth: int,
+) -> t.Dict[str, t.Any]:
+    schemas: t.Dict[str, t.Any] = {"S0": {"type": "string"}}
+    for index in range(1, depth + 1):
+        previous = {"$ref": f"#/components/schemas/S{index - 1}"}
+        schemas[f"S{index}"] = {"properties": {"a": previous, "b": previous}}
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "bomb", "version": "1"},
+        "paths": {},
+        "components": {"schemas": schemas},
+    }
+
+
+def timed(
+    function: t.Callable[[t.Dict[str, t.Any]], t.Any],
+    raw_api: t.Dict[str, t.Any],
+) -> t.Tuple[t.Any, float]:
+    start = time.perf_counter()
+    result = function(raw_api)
+    return result, time.perf_counter() - start
+
+
+def main(
+    max_depth: int,
+) -> None:
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+    print(f"{'depth':<8}{'nodes':>12}{'estimation':>14}{'models':>12}")
+    for depth in range(2, max_depth + 1, 2):
+        expansion, estimation = timed(
+            limits.estimate_expansion,
+            reference_bomb(depth),
+        )
+        _, models = timed(
+            lambda raw_api: version_module.load_api(raw_api=raw_api),
+            reference_bomb(depth),
+        )
+        print(
+            f"{depth:<8}{expansion.nodes:>12}{estimation * 1000:>12.1f}ms"
+            f"{models * 1000:>10.0f}ms",
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 12)
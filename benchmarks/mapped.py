@@ -0,0 +1,51 @@
+"""Single operation of a large json specification: load_spec and load_api of
+the whole document vs a mapped specification (first scan, then reopened
+with its saved index), on the expanded petstore scaled up.
+
+Usage: python -m benchmarks.mapped [factor]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import common
+from openapydantic import mapped
+from openapydantic import versions
+
+
+def main(
+    factor: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), factor)
+    raw_api["openapi"] = "3.0.2"
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "api.json")
+        index_path = os.path.join(directory, "api.index")
+        with open(file_path, "w") as file:
+            json.dump(raw_api, file, indent=2)
+        size = os.path.getsize(file_path)
+        print(f"{len(raw_api['paths'])} paths, {size / 2**20:.1f}MB")
+
+        start = time.perf_counter()
+        with open(file_path) as file:
+            json.load(file)
+        print(f"{'json.load':<24}{time.perf_counter() - start:>8.2f}s")
+        start = time.perf_counter()
+        asyncio.run(versions.load_spec(file_path=file_path))
+        print(f"{'load_spec':<24}{time.perf_counter() - start:>8.2f}s")
+
+        for name in ("first scan", "saved index"):
+            start = time.perf_counter()
+            with mapped.MappedSpec(file_path, index_path=index_path) as spec:
+                opened = time.perf_counter() - start
+                api = asyncio.run(spec.load_api(include_paths=["/pets/{id}_7"]))
+            assert api.paths["/pets/{id}_7"].get  # nosec
+            duration = time.perf_counter() - start
+            print(f"{name:<24}{opened:>8.3f}s, with load_api {duration:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,94 @@
+"""load_api with and without the normalization of repeated inline schemas,
+on a generated specification inlining the same object schemas in every
+operation: time and memory allocated by the loaded api.
+
+Usage: python -m benchmarks.normalize [paths]
+"""
+import copy
+import gc
+import sys
+import time
+import tracemalloc
+import typing as t
+
+import openapydantic
+from openapydantic import normalize
+from openapydantic import pool
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def generated_spec(
+    paths: int,
+) -> t.Dict[str, t.Any]:
+    address = {
+        "type": "object",
+        "properties": {
+            name: {"type": "string", "maxLength": 64}
+            for name in ("street", "city", "zip", "country")
+        },
+    }
+    customer = {
+        "type": "object",
+        "required": ["id", "name"],
+        "properties": {
+            "id": {"type": "integer", "format": "int64"},
+            "name": {"type": "string"},
+            "email": {"type": "string", "format": "email"},
+            "billing": address,
+            "shipping": address,
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+    }
+    content = {"application/json": {"schema": customer}}
+    operation = {
+        "requestBody": {"content": content},
+        "responses": {"200": {"description": "ok", "content": content}},
+    }
+    return copy.deepcopy(
+        {
+            "openapi": "3.0.2",
+            "info": {"title": "generated", "version": "1.0.0"},
+            "paths": {
+                f"/customers{index}": {"put": operation, "post": operation}
+                for index in range(paths)
+            },
+        },
+    )
+
+
+def measured_load(
+    raw_api: t.Dict[str, t.Any],
+    normalizer: t.Optional[normalize.SchemaNormalizer],
+) -> t.Tuple[float, int]:
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if normalizer is None:
+        api = version_module.load_api(raw_api=raw_api)
+    else:
+        with pool.SourceSharing().activate():
+            api = version_module.load_api(raw_api=normalizer.normalize(raw_api))
+    duration = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert api.paths  # nosec
+    return duration, size
+
+
+def main(
+    paths: int,
+) -> None:
+    normalizer = normalize.SchemaNormalizer()
+    print(f"{paths} paths, {4 * paths} inline customer schemas")
+    for name, option in (("load_api", None), ("normalized", normalizer)):
+        duration, size = measured_load(generated_spec(paths), option)
+        print(f"{name:<12}{duration:>8.2f}s{size / 2**20:>10.1f}MB")
+    print(normalizer.report.text())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 250)
@@ -0,0 +1,67 @@
+"""Payload validation throughput: NDJSON file of responses of the expanded
+petstore "findPets" operation (10 pets per payload, 1 payload out of 10
+invalid), in the calling process and in a pool of worker processes.
+
+Usage: python -m benchmarks.payloads [records]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import common
+from openapydantic import payloads
+
+
+def write_payloads(
+    records: int,
+) -> str:
+    file_descriptor, file_path = tempfile.mkstemp(suffix=".ndjson")
+    with os.fdopen(file_descriptor, "w") as file:
+        for index in range(records):
+            pets = [
+                {"id": index * 10 + pet, "name": f"pet {pet}", "tag": "dog"}
+                for pet in range(10)
+            ]
+            if index % 10 == 0:
+                pets[3]["id"] = str(pets[3]["id"])
+            file.write(json.dumps(pets) + "\n")
+    return file_path
+
+
+def main(
+    records: int,
+) -> None:
+    raw_api = common.load_fixture(common.PETSTORE_EXPANDED)
+    validator = payloads.SchemaValidator.from_spec(
+        raw_api,
+        operation="findPets",
+        status_code=200,
+    )
+    file_path = write_payloads(records)
+    cpus = os.cpu_count() or 1
+
+    print(f"{'workers':<10}{'time':>10}{'records/min':>14}{'per core':>12}")
+    for workers in sorted({1, cpus}):
+        statistics = payloads.PayloadStatistics()
+        start = time.perf_counter()
+        for _ in payloads.validate_ndjson(
+            validator,
+            file_path,
+            workers=workers,
+            statistics=statistics,
+        ):
+            pass
+        duration = time.perf_counter() - start
+        assert statistics.invalid == (records + 9) // 10  # nosec
+        rate = records / duration * 60
+        print(
+            f"{workers:<10}{duration * 1000:>8.0f}ms{rate:>14,.0f}"
+            f"{rate / workers:>12,.0f}",
+        )
+    os.remove(file_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,78 @@
+"""Memory benchmark for the shared component pool.
+
+Loads the same api for several tenants (each tenant has its own title and
+one changed component), with and without a pool.
+
+Usage: python -m benchmarks.pool [tenants]
+"""
+import asyncio
+import copy
+import gc
+import os
+import sys
+import tracemalloc
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import pool as pool_
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def write_tenants(
+    tenants: int,
+) -> t.List[str]:
+    raw_api = common.scale_spec(common.load_fixture(common.USPTO), 10)
+    schema_name = next(iter(raw_api["components"]["schemas"]))
+    file_paths = []
+    for tenant in range(tenants):
+        tenant_api = copy.deepcopy(raw_api)
+        tenant_api["info"]["title"] = f"tenant {tenant}"
+        tenant_api["components"]["schemas"][schema_name][
+            "description"
+        ] = f"tenant {tenant}"
+        file_paths.append(common.write_spec(tenant_api))
+    return file_paths
+
+
+def measure(
+    file_paths: t.List[str],
+    pool: t.Optional[pool_.ComponentPool],
+) -> int:
+    gc.collect()
+    tracemalloc.start()
+    apis = [
+        asyncio.run(
+            openapydantic.load_api(
+                file_path=file_path,
+                version=OpenApiVersion.v3_0_2,
+                pool=pool,
+            ),
+        )
+        for file_path in file_paths
+    ]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del apis
+    return size
+
+
+def main(
+    tenants: int,
+) -> None:
+    file_paths = write_tenants(tenants)
+    try:
+        print(f"tenants: {tenants}")
+        print(f"{'pool':<8}{'memory':>12}")
+        for pool in (None, pool_.ComponentPool()):
+            size = measure(file_paths, pool)
+            print(f"{str(pool is not None):<8}{size / 2**20:>10.1f}MB")
+    finally:
+        for file_path in file_paths:
+            os.remove(file_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
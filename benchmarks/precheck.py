@@ -0,0 +1,64 @@
+"""Time to reject a big specification with a structural error near its end:
+models validation (references resolution included) vs structural pre-check,
+complete or stopped at the first error. The pre-check of the valid
+specification gives its overhead on a successful load.
+
+Usage: python -m benchmarks.precheck [factor]
+"""
+import copy
+import sys
+import time
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import precheck
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def validate(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+    try:
+        version_module.load_api(raw_api=raw_api)
+    except Exception:  # nosec
+        pass
+
+
+def timed(
+    function: t.Callable[[], t.Any],
+) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(
+    factor: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), factor)
+    broken_api = copy.deepcopy(raw_api)
+    last_path = list(broken_api["paths"].values())[-1]
+    for response in last_path["get"]["responses"].values():
+        del response["description"]
+    copied_api = copy.deepcopy(broken_api)
+
+    print(f"scale factor: {factor}")
+    for name, function in (
+        # the resolution modifies the document: validated on a copy
+        ("models validation", lambda: validate(copied_api)),
+        ("pre-check", lambda: precheck.find_issues(broken_api)),
+        (
+            "pre-check fail fast",
+            lambda: precheck.find_issues(broken_api, fail_fast=True),
+        ),
+        ("pre-check (valid)", lambda: precheck.find_issues(raw_api)),
+    ):
+        print(f"{name:<24}{timed(function) * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,71 @@
+"""Query benchmark: api.query against jsonpath_ng (parsed for each query).
+
+Simple expressions (keys, wildcards, indexes) are evaluated by walking the
+document, other ones ("..") by a cached jsonpath_ng expression.
+
+Usage: python -m benchmarks.query [factor] [queries]
+"""
+import sys
+import time
+import typing as t
+
+import jsonpath_ng
+
+from benchmarks import common
+from openapydantic import versions
+
+OpenApiVersion = versions.common.OpenApiVersion
+
+EXPRESSIONS = [
+    "$.paths.*.*.responses",
+    "$.paths.*.*.responses['200'].description",
+    "$.paths.*.*.parameters[*].name",
+    "$.components.schemas.*.properties",
+    "$..operationId",
+]
+
+
+def measure(
+    run: t.Callable[[str], t.Any],
+    expression: str,
+    queries: int,
+) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        run(expression)
+    return time.perf_counter() - start
+
+
+def main(
+    factor: int,
+    queries: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.USPTO), factor)
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+    api = version_module.load_api(raw_api=raw_api)  # type: ignore
+    api.query("$")  # clean view
+    view = api._query_view
+
+    def jsonpath_ng_uncached(
+        expression: str,
+    ) -> t.Any:
+        return [match.value for match in jsonpath_ng.parse(expression).find(view)]
+
+    print(f"scale factor: {factor}, queries per expression: {queries}")
+    print(f"{'expression':<46}{'jsonpath_ng':>12}{'api.query':>12}")
+    for expression in EXPRESSIONS:
+        durations = [
+            measure(run, expression, queries)
+            for run in (jsonpath_ng_uncached, api.query)
+        ]
+        print(
+            f"{expression:<46}"
+            + "".join(f"{duration * 1000:>10.0f}ms" for duration in durations),
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
@@ -0,0 +1,86 @@
+"""Load time and memory of a selective load (a few operations of a big spec),
+and split of the spec in one shard per copy (single pass vs one selection
+per shard).
+
+The specification is parsed once, only the models building is measured
+(pruning included for the slice).
+
+Usage: python -m benchmarks.selection [factor]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import selection
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def build(
+    raw_api: t.Dict[str, t.Any],
+    include_paths: t.Optional[t.List[str]],
+) -> t.Any:
+    if include_paths is not None:
+        raw_api = selection.select_operations(raw_api, include_paths=include_paths)
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+    return version_module.load_api(raw_api=raw_api)  # type: ignore
+
+
+def measure(
+    raw_api: t.Dict[str, t.Any],
+    include_paths: t.Optional[t.List[str]],
+) -> t.Tuple[float, int, int]:
+    start = time.perf_counter()
+    api = build(raw_api, include_paths)
+    duration = time.perf_counter() - start
+    del api
+
+    # memory measured apart: tracemalloc slows the load down
+    gc.collect()
+    tracemalloc.start()
+    api = build(raw_api, include_paths)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, size, len(api.paths)
+
+
+def measure_split(
+    raw_api: t.Dict[str, t.Any],
+) -> t.Tuple[int, float, float]:
+    start = time.perf_counter()
+    shards = selection.split_spec(raw_api, key=selection.by_path_prefix)
+    split_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in shards:
+        selection.select_operations(raw_api, include_paths=[f"/{name}", f"/{name}/*"])
+    return len(shards), split_duration, time.perf_counter() - start
+
+
+def main(
+    factor: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), factor)
+    print(f"scale factor: {factor}")
+    print(f"{'load':<10}{'paths':>8}{'time':>12}{'memory':>12}")
+    for name, include_paths in (("full", None), ("slice", ["/pets", "/pets/{id}"])):
+        duration, size, paths = measure(raw_api, include_paths)
+        print(
+            f"{name:<10}{paths:>8}{duration * 1000:>10.0f}ms"
+            f"{size / 2**20:>10.1f}MB",
+        )
+
+    shards, split_duration, select_duration = measure_split(raw_api)
+    print(f"split in {shards} shards:")
+    print(f"{'single pass':<20}{split_duration * 1000:>10.0f}ms")
+    print(f"{'selection per shard':<20}{select_duration * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,74 @@
+"""Per worker cost of load_api vs attaching to an api shared in memory, on
+the expanded petstore scaled up: time, memory allocated by the worker, and
+attribute access time.
+
+Usage: python -m benchmarks.shared [factor]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+import typing as t
+
+import openapydantic
+from benchmarks import common
+from openapydantic import shared
+from openapydantic import versions
+
+OpenApiVersion = openapydantic.common.OpenApiVersion
+
+
+def measured(
+    function: t.Callable[[], t.Any],
+) -> t.Tuple[t.Any, float, int]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, size
+
+
+def operation_ids(
+    api: t.Any,
+) -> float:
+    start = time.perf_counter()
+    for path_item in api.paths.values():
+        assert path_item.get.operation_id  # nosec
+    return time.perf_counter() - start
+
+
+def main(
+    factor: int,
+) -> None:
+    raw_api = common.scale_spec(common.load_fixture(common.PETSTORE_EXPANDED), factor)
+    raw_api["openapi"] = "3.0.2"
+    version_module = versions.get_version_module(OpenApiVersion.v3_0_2)
+
+    api, load, api_size = measured(lambda: version_module.load_api(raw_api=raw_api))
+    start = time.perf_counter()
+    memory = shared.share(api)
+    dump = time.perf_counter() - start
+    view, attach, view_size = measured(lambda: shared.attach(memory.name))
+
+    print(f"{len(api.paths)} paths, encoded: {memory.size / 2**10:.0f}KB")
+    print(f"{'':<12}{'time':>10}{'memory':>12}{'operationIds':>16}")
+    print(
+        f"{'load_api':<12}{load * 1000:>8.0f}ms{api_size / 2**20:>10.1f}MB"
+        f"{operation_ids(api) * 1000:>14.1f}ms",
+    )
+    print(
+        f"{'attach':<12}{attach * 1000:>8.1f}ms{view_size / 2**10:>10.1f}KB"
+        f"{operation_ids(view) * 1000:>14.1f}ms",
+    )
+    print(f"(encoded once in {dump * 1000:.0f}ms)")
+    view.close()
+    memory.close()
+    memory.unlink()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -1,5 +1,54 @@
-from openapydantic import common  # noqa
-from openapydantic import resolver  # noqa
-from openapydantic import versions
+import importlib
+import typing as t
 
-load_api = versions.load_api
+# submodules and their dependencies (pydantic, yaml...) are imported on
+# first access, so that "import openapydantic" stays cheap (see
+# benchmarks/import_time.py)
+SUBMODULES = {
+    "asgi",
+    "bundler",
+    "common",
+    "construct",
+    "daemon",
+    "diff",
+    "export",
+    "fingerprint",
+    "hashing",
+    "interning",
+    "limits",
+    "loaders",
+    "mapped",
+    "memory",
+    "normalize",
+    "payloads",
+    "pointer",
+    "pool",
+    "precheck",
+    "query",
+    "resolver",
+    "selection",
+    "shared",
+    "validation",
+    "versions",
+}
+ATTRIBUTES = {
+    "load_api": ("versions", "load_api"),
+    "load_spec": ("versions", "load_spec"),
+    "OpenApiVersion": ("common", "OpenApiVersion"),
+    "ModelBackend": ("common", "ModelBackend"),
+}
+
+
+def __getattr__(
+    name: str,
+) -> t.Any:
+    if name in SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in ATTRIBUTES:
+        module_name, attribute = ATTRIBUTES[name]
+        return getattr(importlib.import_module(f"{__name__}.{module_name}"), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> t.List[str]:
+    return sorted(set(globals()) | SUBMODULES | set(ATTRIBUTES))
@@ -0,0 +1,5 @@
+import sys
+
+from openapydantic import cli
+
+sys.exit(cli.main())
@@ -0,0 +1,659 @@
+import asyncio
+import json
+import random
+import re
+import time
+import typing as t
+import urllib.parse
+
+from openapydantic import common
+from openapydantic import payloads
+from openapydantic.compat import pydantic
+
+# plain asgi, without web framework dependency: requests are matched to the
+# operations of the api and validated, then a sample of the responses is
+# validated once sent
+
+Scope = t.Dict[str, t.Any]
+Message = t.Dict[str, t.Any]
+Receive = t.Callable[[], t.Awaitable[Message]]
+Send = t.Callable[[Message], t.Awaitable[None]]
+App = t.Callable[[Scope, Receive, Send], t.Awaitable[None]]
+
+PATH_PARAMETER = re.compile(r"\{([^}/]+)\}")
+
+
+class Route(t.NamedTuple):
+    # path template and method of the operation
+    template: str
+    method: str
+    params: t.Dict[str, str]
+
+
+def _template_pattern(
+    template: str,
+) -> str:
+    # literal parts and parameter names alternate
+    parts = PATH_PARAMETER.split(template)
+    return "".join(
+        "([^/]+)" if index % 2 else re.escape(part) for index, part in enumerate(parts)
+    )
+
+
+class _TemplatedRoutes:
+    # templates of a method and a number of segments, in a single regular
+    # expression: an alternative (named after its index) per template
+
+    def __init__(
+        self,
+        templates: t.List[str],
+    ) -> None:
+        alternatives = []
+        # template, parameter names, group of the first parameter
+        self.routes: t.List[t.Tuple[str, t.List[str], int]] = []
+        group = 1
+        for index, template in enumerate(templates):
+            names = PATH_PARAMETER.findall(template)
+            alternatives.append(f"(?P<r{index}>{_template_pattern(template)})")
+            self.routes.append((template, names, group + 1))
+            group += len(names) + 1
+        self.pattern = re.compile("|".join(alternatives))
+
+    def match(
+        self,
+        path: str,
+    ) -> t.Optional[t.Tuple[str, t.Dict[str, str]]]:
+        found = self.pattern.fullmatch(path)
+        if found is None:
+            return None
+        template, names, first = self.routes[int(found.lastgroup[1:])]  # type: ignore
+        return template, {
+            name: found.group(first + offset) for offset, name in enumerate(names)
+        }
+
+
+class RouteIndex:
+    """Operations of an api by method and request path.
+
+    Paths without parameters are looked up in a dict. Templated paths are
+    compiled to a regular expression per method and number of segments,
+    most literal first: "/pets/mine" is matched before "/pets/{id}".
+    """
+
+    def __init__(
+        self,
+        raw_api: t.Dict[str, t.Any],
+        *,
+        base_path: str = "",
+    ) -> None:
+        self.base_path = base_path.rstrip("/")
+        self.static: t.Dict[str, t.Dict[str, t.Any]] = {}
+        templates: t.Dict[t.Tuple[str, int], t.List[str]] = {}
+        for template, path_item in (raw_api.get("paths") or {}).items():
+            if not PATH_PARAMETER.search(template):
+                self.static[template] = path_item or {}
+                continue
+            for method in common.HTTP_METHODS:
+                if method in (path_item or {}):
+                    key = (method, template.count("/"))
+                    templates.setdefault(key, []).append(template)
+        self.templated = {
+            key: _TemplatedRoutes(
+                sorted(values, key=lambda value: -len(PATH_PARAMETER.sub("", value))),
+            )
+            for key, values in templates.items()
+        }
+
+    def match(
+        self,
+        method: str,
+        path: str,
+    ) -> t.Optional[Route]:
+        if self.base_path:
+            if not path.startswith(self.base_path):
+                return None
+            start = len(self.base_path)
+            path = path[start:] or "/"
+        method = method.lower()
+        if method in self.static.get(path, ()):
+            return Route(path, method, {})
+        routes = self.templated.get((method, path.count("/")))
+        found = routes.match(path) if routes is not None else None
+        return Route(found[0], method, found[1]) if found else None
+
+
+def _media_type(
+    content_type: t.Optional[str],
+) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def _content_key(
+    content: t.Dict[str, t.Any],
+    media_type: str,
+) -> t.Optional[str]:
+    # exact media type, then ranges: "application/*", "*/*"
+    for key in (media_type, f"{media_type.split('/')[0]}/*", "*/*"):
+        if key in content:
+            return key
+    return None
+
+
+def _is_json(
+    media_type: str,
+) -> bool:
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+def _boolean(
+    value: str,
+) -> bool:
+    if value not in ("true", "false"):
+        raise ValueError(value)
+    return value == "true"
+
+
+SCALARS: t.Dict[str, t.Callable[[str], t.Any]] = {
+    "integer": int,
+    "number": float,
+    "boolean": _boolean,
+}
+
+
+def _scalar(
+    value: str,
+    schema_type: t.Any,
+) -> t.Any:
+    # invalid values are kept as strings and reported by the validator
+    try:
+        return SCALARS[schema_type](value) if schema_type in SCALARS else value
+    except ValueError:
+        return value
+
+
+class Parameter(t.NamedTuple):
+    location: str
+    name: str
+    required: bool
+    # dereferenced schema, None when the parameter value is not validated
+    schema: t.Optional[t.Dict[str, t.Any]]
+    items_type: t.Any
+    validator: t.Optional[payloads.SchemaValidator]
+
+    def coerce(
+        self,
+        values: t.List[str],
+    ) -> t.Any:
+        # values of the parameter are strings: query "?a=1&a=2", "?a=1,2"
+        schema_type = (self.schema or {}).get("type")
+        if schema_type != "array":
+            return _scalar(values[0], schema_type)
+        if len(values) == 1:
+            values = values[0].split(",")
+        return [_scalar(value, self.items_type) for value in values]
+
+
+def _parameter(
+    raw_api: t.Dict[str, t.Any],
+    parameter: t.Dict[str, t.Any],
+) -> Parameter:
+    schema = payloads.dereference(raw_api, parameter.get("schema"))
+    # object parameters (style deepObject...) are not validated
+    if not isinstance(schema, dict) or schema.get("type") == "object":
+        schema = None
+    return Parameter(
+        location=parameter["in"],
+        name=parameter["name"],
+        required=parameter["in"] == "path" or bool(parameter.get("required")),
+        schema=schema,
+        items_type=payloads.dereference(
+            raw_api,
+            (schema or {}).get("items") or {},
+        ).get("type"),
+        validator=(
+            None
+            if schema is None
+            else payloads.SchemaValidator(parameter["schema"], raw_api=raw_api)
+        ),
+    )
+
+
+def _prefixed(
+    part: str,
+    errors: t.List[payloads.PayloadError],
+) -> t.List[payloads.PayloadError]:
+    # e.g: "body#/id", "query:limit#"
+    return [
+        payloads.PayloadError(f"{part}{error.location}", error.message)
+        for error in errors
+    ]
+
+
+def _request_values(
+    scope: Scope,
+    params: t.Dict[str, str],
+    locations: t.Set[str],
+) -> t.Dict[str, t.Dict[str, t.List[str]]]:
+    # location -> parameter name (lowercase for headers) -> values, only
+    # the query and headers of operations with such parameters are parsed
+    values: t.Dict[str, t.Dict[str, t.List[str]]] = {
+        "path": {name: [value] for name, value in params.items()},
+        "query": {},
+        "header": {},
+    }
+    if "query" in locations:
+        values["query"] = urllib.parse.parse_qs(
+            scope.get("query_string", b"").decode("latin-1"),
+            keep_blank_values=True,
+        )
+    if "header" in locations:
+        values["header"] = {
+            name.decode("latin-1").lower(): [value.decode("latin-1")]
+            for name, value in scope.get("headers") or ()
+        }
+    return values
+
+
+class OperationContract:
+    """Validators of the parameters, request body and responses of an
+    operation, body validators compiled on first use."""
+
+    def __init__(
+        self,
+        raw_api: t.Dict[str, t.Any],
+        route: Route,
+    ) -> None:
+        self.raw_api = raw_api
+        path_item = raw_api["paths"][route.template]
+        self.operation = path_item[route.method]
+        parameters = {}
+        for parameter in [
+            *(path_item.get("parameters") or ()),
+            *(self.operation.get("parameters") or ()),
+        ]:
+            parameter = payloads.dereference(raw_api, parameter)
+            # operation parameters override the path item ones
+            parameters[(parameter["in"], parameter["name"])] = parameter
+        self.parameters = [
+            _parameter(raw_api, parameter)
+            for (location, _), parameter in parameters.items()
+            if location != "cookie"
+        ]
+        self.locations = {parameter.location for parameter in self.parameters}
+        self.request_body = payloads.dereference(
+            raw_api,
+            self.operation.get("requestBody"),
+        )
+        # (id of the body, media type) -> validator
+        self.validators: t.Dict[
+            t.Tuple[int, str],
+            t.Optional[payloads.SchemaValidator],
+        ] = {}
+
+    def _validator(
+        self,
+        body: t.Dict[str, t.Any],
+        key: str,
+    ) -> t.Optional[payloads.SchemaValidator]:
+        cache_key = (id(body), key)
+        if cache_key not in self.validators:
+            schema = (body["content"][key] or {}).get("schema")
+            self.validators[cache_key] = (
+                None
+                if schema is None
+                else payloads.SchemaValidator(schema, raw_api=self.raw_api)
+            )
+        return self.validators[cache_key]
+
+    def parameters_errors(
+        self,
+        scope: Scope,
+        params: t.Dict[str, str],
+    ) -> t.List[payloads.PayloadError]:
+        if not self.parameters:
+            return []
+        values = _request_values(scope, params, self.locations)
+        errors = []
+        for parameter in self.parameters:
+            part = f"{parameter.location}:{parameter.name}"
+            name = parameter.name
+            if parameter.location == "header":
+                name = name.lower()
+            raw_values = values[parameter.location].get(name)
+            if raw_values is None:
+                if parameter.required:
+                    errors.append(payloads.PayloadError(part, "missing parameter"))
+            elif parameter.validator is not None:
+                errors.extend(
+                    _prefixed(
+                        part,
+                        parameter.validator.errors(parameter.coerce(raw_values)),
+                    ),
+                )
+        return errors
+
+    def body_errors(
+        self,
+        part: str,
+        body_object: t.Dict[str, t.Any],
+        content_type: t.Optional[str],
+        body: bytes,
+    ) -> t.List[payloads.PayloadError]:
+        media_type = _media_type(content_type)
+        key = _content_key(body_object.get("content") or {}, media_type)
+        if key is None:
+            return [
+                payloads.PayloadError(part, f"undocumented media type:{media_type}"),
+            ]
+        validator = self._validator(body_object, key)
+        if validator is None or not _is_json(media_type):
+            return []
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return [payloads.PayloadError(part, "invalid json")]
+        return _prefixed(part, validator.errors(payload))
+
+    def request_errors(
+        self,
+        scope: Scope,
+        params: t.Dict[str, str],
+        body: bytes,
+    ) -> t.List[payloads.PayloadError]:
+        errors = self.parameters_errors(scope, params)
+        if not isinstance(self.request_body, dict):
+            return errors
+        if not body:
+            if self.request_body.get("required"):
+                errors.append(payloads.PayloadError("body", "missing request body"))
+            return errors
+        content_type = dict(scope.get("headers") or ()).get(b"content-type", b"")
+        return errors + self.body_errors(
+            "body",
+            self.request_body,
+            content_type.decode("latin-1"),
+            body,
+        )
+
+    def response_errors(
+        self,
+        status: int,
+        content_type: t.Optional[str],
+        body: bytes,
+    ) -> t.List[payloads.PayloadError]:
+        try:
+            response = payloads.find_body(self.raw_api, self.operation, str(status))
+        except ValueError:
+            return [payloads.PayloadError("response", f"undocumented status:{status}")]
+        # empty responses (e.g: HEAD) are not validated
+        if not body or not response.get("content"):
+            return []
+        return self.body_errors("response", response, content_type, body)
+
+
+class Violation(t.NamedTuple):
+    # "request" or "response"
+    kind: str
+    method: str
+    # path template of the operation
+    path: str
+    status: t.Optional[int]
+    errors: t.List[payloads.PayloadError]
+
+
+class ContractMetrics(pydantic.BaseModel):
+    requests: int = 0
+    # requests without operation in the api, passed through
+    unmatched: int = 0
+    invalid_requests: int = 0
+    sampled_responses: int = 0
+    invalid_responses: int = 0
+    # sampled responses validated in the background, budget exceeded
+    over_budget: int = 0
+    # seconds spent by the middleware on the request path
+    overhead: float = 0
+    max_overhead: float = 0
+
+    @property
+    def mean_overhead(self) -> float:
+        return self.overhead / self.requests if self.requests else 0.0
+
+    def add_overhead(
+        self,
+        duration: float,
+    ) -> None:
+        self.overhead += duration
+        self.max_overhead = max(self.max_overhead, duration)
+
+
+async def _read_body(
+    receive: Receive,
+) -> t.Tuple[bytes, Receive]:
+    # the body is read before the application, then replayed to it
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return body, replay
+
+
+async def _send_errors(
+    send: Send,
+    errors: t.List[payloads.PayloadError],
+) -> None:
+    body = json.dumps({"errors": [error._asdict() for error in errors]}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class ResponseCapture:
+    """Send wrapper keeping the status, content type and body of a
+    response. Messages are sent unchanged and immediately."""
+
+    def __init__(
+        self,
+        send: Send,
+    ) -> None:
+        self._send = send
+        self.status = 0
+        self.content_type: t.Optional[str] = None
+        self.chunks: t.List[bytes] = []
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    async def send(
+        self,
+        message: Message,
+    ) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            for name, value in message.get("headers") or ():
+                if name.lower() == b"content-type":
+                    self.content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+        await self._send(message)
+
+
+class ContractValidationMiddleware:
+    """ASGI middleware validating the requests and a sample of the
+    responses against a loaded api.
+
+    Invalid requests are answered with a 400 json error (or only reported
+    with reject_invalid_requests=False). Responses are validated once sent:
+    in the background with background=True, or when the middleware already
+    spent latency_budget seconds on the request. Violations are counted in
+    the metrics and passed to on_violation.
+    """
+
+    def __init__(
+        self,
+        app: App,
+        *,
+        api: t.Any,
+        base_path: str = "",
+        reject_invalid_requests: bool = True,
+        response_sample_rate: float = 0.0,
+        background: bool = False,
+        latency_budget: t.Optional[float] = None,
+        on_violation: t.Optional[t.Callable[[Violation], None]] = None,
+    ) -> None:
+        self.app = app
+        self.raw_api = api.raw_api
+        self.index = RouteIndex(self.raw_api, base_path=base_path)
+        self.reject_invalid_requests = reject_invalid_requests
+        self.response_sample_rate = response_sample_rate
+        self.background = background
+        self.latency_budget = latency_budget
+        self.on_violation = on_violation
+        self.metrics = ContractMetrics()
+        self.contracts: t.Dict[t.Tuple[str, str], OperationContract] = {}
+        self._tasks: t.Set[asyncio.Future] = set()
+
+    def _contract(
+        self,
+        route: Route,
+    ) -> OperationContract:
+        key = (route.template, route.method)
+        if key not in self.contracts:
+            self.contracts[key] = OperationContract(self.raw_api, route)
+        return self.contracts[key]
+
+    def _sampled(self) -> bool:
+        rate = self.response_sample_rate
+        return rate >= 1 or (rate > 0 and random.random() < rate)  # nosec
+
+    def _report(
+        self,
+        violation: Violation,
+    ) -> None:
+        if violation.kind == "request":
+            self.metrics.invalid_requests += 1
+        else:
+            self.metrics.invalid_responses += 1
+        if self.on_violation is not None:
+            self.on_violation(violation)
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        self.metrics.requests += 1
+        route = self.index.match(scope["method"], scope["path"])
+        if route is None:
+            self.metrics.unmatched += 1
+            self.metrics.add_overhead(time.perf_counter() - start)
+            await self.app(scope, receive, send)
+            return
+
+        contract = self._contract(route)
+        body, receive = await _read_body(receive)
+        errors = contract.request_errors(scope, route.params, body)
+        if errors:
+            self._report(
+                Violation("request", route.method, route.template, None, errors),
+            )
+            if self.reject_invalid_requests:
+                await _send_errors(send, errors)
+                self.metrics.add_overhead(time.perf_counter() - start)
+                return
+
+        overhead = time.perf_counter() - start
+        if not self._sampled():
+            self.metrics.add_overhead(overhead)
+            await self.app(scope, receive, send)
+            return
+        capture = ResponseCapture(send)
+        await self.app(scope, receive, capture.send)
+        start = time.perf_counter()
+        self._validate_response(route, contract, capture, overhead=overhead)
+        self.metrics.add_overhead(overhead + time.perf_counter() - start)
+
+    def _validate_response(
+        self,
+        route: Route,
+        contract: OperationContract,
+        capture: ResponseCapture,
+        *,
+        overhead: float,
+    ) -> None:
+        self.metrics.sampled_responses += 1
+        over_budget = self.latency_budget is not None and (
+            overhead >= self.latency_budget
+        )
+        self.metrics.over_budget += over_budget
+        if self.background or over_budget:
+            task = asyncio.ensure_future(self._validate_later(route, contract, capture))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return
+        self._record_response(
+            route,
+            capture.status,
+            contract.response_errors(
+                capture.status, capture.content_type, capture.body
+            ),
+        )
+
+    async def _validate_later(
+        self,
+        route: Route,
+        contract: OperationContract,
+        capture: ResponseCapture,
+    ) -> None:
+        # in a thread: the event loop keeps serving requests
+        errors = await asyncio.get_running_loop().run_in_executor(
+            None,
+            contract.response_errors,
+            capture.status,
+            capture.content_type,
+            capture.body,
+        )
+        self._record_response(route, capture.status, errors)
+
+    def _record_response(
+        self,
+        route: Route,
+        status: int,
+        errors: t.List[payloads.PayloadError],
+    ) -> None:
+        if errors:
+            self._report(
+                Violation("response", route.method, route.template, status, errors),
+            )
+
+    async def drain(self) -> None:
+        # wait for the responses validated in the background
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
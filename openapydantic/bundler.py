@@ -0,0 +1,122 @@
+import json
+import typing as t
+
+import yaml
+
+from openapydantic import loaders as loaders_
+from openapydantic import pointer
+from openapydantic import resolver
+from openapydantic import selection
+from openapydantic import versions
+
+KEPT_COMPONENTS = selection.KEPT_COMPONENTS
+prune_components = selection.prune_components
+
+
+def _canonical(
+    value: t.Any,
+) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def rewrite_references(
+    obj: t.Any,
+    mapping: t.Mapping[str, str],
+) -> t.Any:
+    if isinstance(obj, list):
+        return [rewrite_references(value, mapping) for value in obj]
+    if not isinstance(obj, dict):
+        return obj
+
+    result = {}
+    for key, value in obj.items():
+        if key == "$ref" and isinstance(value, str):
+            result[key] = mapping.get(value, value)
+        else:
+            result[key] = rewrite_references(value, mapping)
+    return result
+
+
+def _find_duplicates(
+    raw_api: t.Dict[str, t.Any],
+    lifted: t.Set[str],
+) -> t.Dict[str, str]:
+    mapping: t.Dict[str, str] = {}
+    for component_type, values in (raw_api.get("components") or {}).items():
+        canonical_refs: t.Dict[str, str] = {}
+        # root components first: they keep their name
+        refs = sorted(
+            (
+                pointer.build(("components", component_type, key))
+                for key in values or {}
+            ),
+            key=lambda ref: ref in lifted,
+        )
+        for ref in refs:
+            key = pointer.parse(ref)[-1]
+            content = _canonical(values[key])
+            if content in canonical_refs and ref in lifted:
+                mapping[ref] = canonical_refs[content]
+            else:
+                canonical_refs.setdefault(content, ref)
+    return mapping
+
+
+def deduplicate_components(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    lifted: t.Iterable[str],
+) -> t.Dict[str, t.Any]:
+    # components brought from external documents which are identical to
+    # another component are replaced by a reference to this component.
+    # Loop until no more duplicates, since merging components may make
+    # other ones identical.
+    lifted = set(lifted)
+    while True:
+        mapping = _find_duplicates(raw_api, lifted)
+        if not mapping:
+            return raw_api
+        raw_api = rewrite_references(raw_api, mapping)
+        for ref in mapping:
+            component_type, key = pointer.parse(ref)[1:3]
+            del raw_api["components"][component_type][key]
+        lifted.difference_update(mapping)
+
+
+async def bundle(
+    *,
+    file_path: str,
+    loaders: t.Optional[t.Mapping[str, loaders_.DocumentLoader]] = None,
+    deduplicate: bool = True,
+    prune: bool = True,
+) -> t.Dict[str, t.Any]:
+    raw_api = await versions.load_spec(file_path=file_path)
+    if not raw_api:
+        raise ValueError("Api specification looks empty")
+
+    external_resolver = resolver.ExternalReferencesResolver(
+        base_uri=loaders_.path_to_uri(file_path),
+        loaders=loaders,
+    )
+    bundled = await external_resolver.resolve(raw_api=raw_api)
+
+    if deduplicate:
+        bundled = deduplicate_components(
+            bundled,
+            lifted=external_resolver.lifted.values(),
+        )
+    if prune:
+        bundled = prune_components(bundled)
+    return bundled
+
+
+def dump(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    output_format: str = "yaml",
+) -> str:
+    if output_format == "json":
+        return json.dumps(raw_api, indent=2)
+    if output_format == "yaml":
+        return yaml.safe_dump(raw_api, sort_keys=False, allow_unicode=True)
+    raise ValueError(f"Unsupported output format:{output_format}")
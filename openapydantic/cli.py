@@ -0,0 +1,477 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import typing as t
+
+# commands modules are imported by their handler: the parser (and --help)
+# does not import pydantic and the openapi models
+
+
+def _bundle(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import bundler
+
+    bundled = asyncio.run(
+        bundler.bundle(
+            file_path=args.file_path,
+            deduplicate=args.deduplicate,
+            prune=args.prune,
+        ),
+    )
+    content = bundler.dump(bundled, output_format=args.format)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(content)
+    else:
+        sys.stdout.write(content)
+    return 0
+
+
+def _add_bundle_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "bundle",
+        help="bundle a multi-file specification into a single document",
+    )
+    parser.add_argument("file_path", help="root specification file")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("yaml", "json"),
+        default="yaml",
+    )
+    parser.add_argument(
+        "--no-deduplicate",
+        dest="deduplicate",
+        action="store_false",
+        help="keep identical components coming from different files",
+    )
+    parser.add_argument(
+        "--no-prune",
+        dest="prune",
+        action="store_false",
+        help="keep unreferenced components",
+    )
+    parser.set_defaults(handler=_bundle)
+
+
+def _split(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import bundler
+    from openapydantic import selection
+
+    raw_api = asyncio.run(
+        bundler.bundle(file_path=args.file_path, deduplicate=False, prune=False),
+    )
+    if args.by == "tag":
+        key = selection.by_tag
+    elif args.by == "path":
+        key = selection.by_path_prefix
+    else:
+        key = selection.by_extension(args.by)
+    shards = selection.split_spec(raw_api, key=key)
+
+    os.makedirs(args.output, exist_ok=True)
+    for name, shard in shards.items():
+        file_name = re.sub(r"[^A-Za-z0-9._-]+", "_", name)
+        file_path = os.path.join(args.output, f"{file_name}.{args.format}")
+        with open(file_path, "w") as file:
+            file.write(bundler.dump(shard, output_format=args.format))
+        sys.stdout.write(f"{file_path}\n")
+    return 0
+
+
+def _add_split_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "split",
+        help="split a specification into per tag or per service specifications",
+    )
+    parser.add_argument("file_path", help="specification file")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument(
+        "--by",
+        default="tag",
+        help="'tag', 'path' (first path segment) or the name of an operation "
+        "extension, e.g. 'x-service' (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("yaml", "json"),
+        default="yaml",
+    )
+    parser.set_defaults(handler=_split)
+
+
+def _diff(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import bundler
+    from openapydantic import diff
+
+    old, new = asyncio.run(
+        _gather(
+            bundler.bundle(file_path=args.old, deduplicate=False, prune=False),
+            bundler.bundle(file_path=args.new, deduplicate=False, prune=False),
+        ),
+    )
+    result = diff.diff_specs(old, new)
+
+    if args.format == "json":
+        sys.stdout.write(result.json(indent=2) + "\n")
+    else:
+        for change in result.changes:
+            flag = "BREAKING " if change.breaking else ""
+            detail = f" ({change.detail})" if change.detail else ""
+            sys.stdout.write(
+                f"{flag}{change.kind.value} {change.element.value} "
+                f"{change.pointer}{detail}\n",
+            )
+    return 1 if args.fail_on_breaking and result.is_breaking else 0
+
+
+async def _gather(
+    *coroutines: t.Awaitable[t.Any],
+) -> t.List[t.Any]:
+    return list(await asyncio.gather(*coroutines))
+
+
+def _add_diff_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "diff",
+        help="structural diff between two specification versions",
+    )
+    parser.add_argument("old", help="previous specification file")
+    parser.add_argument("new", help="new specification file")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("text", "json"),
+        default="text",
+    )
+    parser.add_argument(
+        "--fail-on-breaking",
+        action="store_true",
+        help="exit with status 1 when a breaking change is found",
+    )
+    parser.set_defaults(handler=_diff)
+
+
+def _format_report(
+    report: t.Any,
+    *,
+    output_format: str,
+) -> str:
+    if output_format == "json":
+        return report.json(indent=2)  # type: ignore
+    if output_format == "junit":
+        return report.junit()  # type: ignore
+    return report.text()  # type: ignore
+
+
+def _validate(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import common
+    from openapydantic import validation
+
+    file_paths = validation.expand_paths(args.paths)
+    if not file_paths:
+        sys.stderr.write("No specification file found\n")
+        return 2
+
+    version = (
+        common.OpenApiVersion(args.openapi_version) if args.openapi_version else None
+    )
+    backend = common.ModelBackend(args.backend)
+    state = None
+    if args.state:
+        state = validation.ValidationState(
+            file_path=args.state,
+            options=f"{args.openapi_version}:{backend.value}",
+        )
+
+    report = validation.validate_files(
+        file_paths,
+        version=version,
+        backend=backend,
+        workers=args.workers,
+        state=state,
+        fail_fast=args.fail_fast,
+        max_errors=args.max_errors,
+    )
+    if state is not None:
+        state.save()
+
+    content = _format_report(report, output_format=args.format) + "\n"
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(content)
+    else:
+        sys.stdout.write(content)
+    return 0 if report.ok else 1
+
+
+def _add_validate_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "validate",
+        help="validate specification files",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="files, directories or glob patterns ('**' supported)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: number of cpus)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("text", "json", "junit"),
+        default="text",
+    )
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument(
+        "--state",
+        default=".openapydantic-state.json",
+        help="state file of the successful validations, unchanged files "
+        "are skipped (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-state",
+        dest="state",
+        action="store_const",
+        const=None,
+        help="validate every file, without state file",
+    )
+    parser.add_argument(
+        "--openapi-version",
+        help="openapi version of the models (default: version of each file)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("pydantic_v1", "pydantic_v2"),
+        default="pydantic_v1",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="pre-check the structure, stop at the first error",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        help="pre-check the structure, stop after this number of errors",
+    )
+    parser.set_defaults(handler=_validate)
+
+
+def _payloads(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import bundler
+    from openapydantic import payloads
+
+    raw_api = asyncio.run(
+        bundler.bundle(file_path=args.file_path, deduplicate=False, prune=False),
+    )
+    validator = payloads.SchemaValidator.from_spec(
+        raw_api,
+        component=args.component,
+        operation=args.operation,
+        status_code=args.status_code,
+        media_type=args.media_type,
+    )
+    statistics = payloads.PayloadStatistics()
+    for result in payloads.validate_ndjson(
+        validator,
+        args.payloads,
+        workers=args.workers,
+        statistics=statistics,
+    ):
+        if args.format == "text":
+            for error in result.errors:
+                sys.stdout.write(
+                    f"line {result.index + 1}: {error.location}: {error.message}\n",
+                )
+    if args.format == "json":
+        sys.stdout.write(statistics.json(indent=2) + "\n")
+    else:
+        sys.stdout.write(statistics.text(limit=args.limit) + "\n")
+    return 1 if statistics.invalid else 0
+
+
+def _add_payloads_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "payloads",
+        help="validate the payloads of a NDJSON file against a schema",
+    )
+    parser.add_argument("file_path", help="specification file")
+    parser.add_argument("payloads", help="NDJSON file, one payload per line")
+    schema = parser.add_mutually_exclusive_group(required=True)
+    schema.add_argument("--component", help="name of a component schema")
+    schema.add_argument(
+        "--operation",
+        help="operationId or '<method> <path>', request body schema "
+        "without --status-code",
+    )
+    parser.add_argument("--status-code", help="response status code")
+    parser.add_argument(
+        "--media-type",
+        default="application/json",
+        help="(default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, 0 for the number of cpus (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="text: errors of each payload and statistics, json: statistics",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="most common errors of the text statistics (default: %(default)s)",
+    )
+    parser.set_defaults(handler=_payloads)
+
+
+def _daemon(
+    args: argparse.Namespace,
+) -> int:
+    from openapydantic import daemon
+
+    socket_path = args.socket or daemon.default_socket_path()
+    if args.daemon_command == "serve":
+        try:
+            asyncio.run(
+                _serve(
+                    socket_path,
+                    version=args.openapi_version,
+                    backend=args.backend,
+                ),
+            )
+        except OSError as error:
+            sys.stderr.write(f"{error}\n")
+            return 2
+        return 0
+
+    payload: t.Dict[str, t.Any] = {"command": args.daemon_command}
+    for name in ("file_path", "expression", "old", "new"):
+        if getattr(args, name, None) is not None:
+            payload[name] = getattr(args, name)
+    try:
+        result = daemon.request(payload, socket_path=socket_path)
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"{error}\n")
+        return 2
+
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+    if args.daemon_command == "validate" and not result["valid"]:
+        return 1
+    return 0
+
+
+async def _serve(
+    socket_path: str,
+    *,
+    version: t.Optional[str],
+    backend: str,
+) -> None:
+    from openapydantic import common
+    from openapydantic import daemon
+
+    # created in the event loop of the daemon
+    server = daemon.Daemon(
+        socket_path=socket_path,
+        cache=daemon.SpecCache(
+            version=common.OpenApiVersion(version) if version else None,
+            backend=common.ModelBackend(backend),
+        ),
+    )
+    await server.serve()
+
+
+def _add_daemon_parser(
+    subparsers: t.Any,
+) -> None:
+    parser = subparsers.add_parser(
+        "daemon",
+        help="validation daemon keeping loaded specifications in memory",
+    )
+    parser.add_argument(
+        "--socket",
+        help="unix socket path (default: $OPENAPYDANTIC_SOCKET or "
+        "openapydantic.sock in the per-user runtime directory)",
+    )
+    commands = parser.add_subparsers(dest="daemon_command", required=True)
+    serve = commands.add_parser("serve", help="run the daemon")
+    serve.add_argument(
+        "--openapi-version",
+        help="openapi version of the models (default: version of each file)",
+    )
+    serve.add_argument(
+        "--backend",
+        choices=("pydantic_v1", "pydantic_v2"),
+        default="pydantic_v1",
+    )
+    commands.add_parser("ping", help="daemon status")
+    commands.add_parser("shutdown", help="stop the daemon")
+    validate = commands.add_parser("validate", help="validate a specification")
+    validate.add_argument("file_path")
+    query = commands.add_parser("query", help="jsonpath query on a specification")
+    query.add_argument("file_path")
+    query.add_argument("expression")
+    diff = commands.add_parser("diff", help="structural diff")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    parser.set_defaults(handler=_daemon)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="openapydantic")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_bundle_parser(subparsers)
+    _add_diff_parser(subparsers)
+    _add_split_parser(subparsers)
+    _add_payloads_parser(subparsers)
+    _add_validate_parser(subparsers)
+    _add_daemon_parser(subparsers)
+    return parser
+
+
+def main(
+    argv: t.Optional[t.Sequence[str]] = None,
+) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)  # type: ignore
@@ -1,7 +1,10 @@
 import enum
 import typing as t
 
-import pydantic
+from openapydantic import export
+from openapydantic.compat import pydantic
+
+LIBRARY_VERSION = "0.2.3"
 
 
 class ComponentType(enum.Enum):
@@ -15,48 +18,86 @@ class ComponentType(enum.Enum):
     callbacks = "callbacks"
 
 
+class ModelBackend(enum.Enum):
+    pydantic_v1 = "pydantic_v1"
+    pydantic_v2 = "pydantic_v2"  # requires pydantic>=2 (pydantic-core)
+
+
 class OpenApiBaseModel(pydantic.BaseModel):
+    def _exclude(
+        self,
+        *,
+        exclude_components: bool,
+        exclude_raw_api: bool,
+        keep_references: bool,
+    ) -> t.Tuple[t.Dict[str, t.Any], export.References]:
+        exclude: t.Dict[str, t.Any] = {}
+        references: export.References = []
+
+        if keep_references:
+            raw_api = getattr(self, "raw_api", None)
+            if raw_api is None:
+                raise ValueError("References can only be kept in an api export")
+            # components are kept, the references point to them
+            exclude, references = export.reference_exclusions(raw_api, self)
+        elif exclude_components:
+            exclude["components"] = True
+
+        if exclude_raw_api:
+            exclude["raw_api"] = True
+
+        return exclude, references
+
     def as_clean_json(
         self,
         *,
         exclude_components: bool = True,
         exclude_raw_api: bool = True,
+        keep_references: bool = False,
     ) -> str:
-        exclude: t.Set[str] = set()
-
-        if exclude_components:
-            exclude.add("components")
-
-        if exclude_raw_api:
-            exclude.add("raw_api")
-
-        return self.json(
+        exclude, references = self._exclude(
+            exclude_components=exclude_components,
+            exclude_raw_api=exclude_raw_api,
+            keep_references=keep_references,
+        )
+        if not references:
+            return self.json(
+                by_alias=True,
+                exclude_unset=True,
+                exclude_none=True,
+                exclude=exclude,
+            )
+
+        document = self.dict(
             by_alias=True,
             exclude_unset=True,
             exclude_none=True,
             exclude=exclude,
         )
+        return self.__config__.json_dumps(
+            export.insert_references(document, references),
+            default=self.__json_encoder__,
+        )
 
     def as_clean_dict(
         self,
         *,
         exclude_components: bool = True,
         exclude_raw_api: bool = True,
+        keep_references: bool = False,
     ) -> t.Dict[str, t.Any]:
-        exclude: t.Set[str] = set()
-
-        if exclude_components:
-            exclude.add("components")
-
-        if exclude_raw_api:
-            exclude.add("raw_api")
-
-        return self.dict(
+        exclude, references = self._exclude(
+            exclude_components=exclude_components,
+            exclude_raw_api=exclude_raw_api,
+            keep_references=keep_references,
+        )
+        document = self.dict(
             by_alias=True,
             exclude_unset=True,
             exclude_none=True,
             exclude=exclude,
         )
+        return export.insert_references(document, references)  # type: ignore
 
 
 # could be:
@@ -140,6 +181,8 @@ HTTPMethod = t.Literal[
     "options",
 ]
 
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
 MediaType = t.Literal[
     "application/json",
     "application/xml",
@@ -0,0 +1,13 @@
+import pydantic as _pydantic
+
+# the models are written with the pydantic v1 api, which pydantic v2 still
+# provides as pydantic.v1. The pydantic v2 api is only used by the
+# pydantic v2 backend (versions.openapi_302_v2).
+PYDANTIC_V2 = _pydantic.VERSION.startswith("2.")
+
+if PYDANTIC_V2:  # pragma: no cover
+    from pydantic import v1 as pydantic
+    from pydantic.v1 import fields as pydantic_fields
+else:
+    import pydantic  # noqa: F401,F811
+    from pydantic import fields as pydantic_fields  # noqa: F401
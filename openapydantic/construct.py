@@ -0,0 +1,205 @@
+import enum
+import functools
+import re
+import typing as t
+
+from openapydantic.compat import pydantic
+from openapydantic.compat import pydantic_fields
+
+ModelField = pydantic_fields.ModelField
+Model = t.TypeVar("Model", bound=pydantic.BaseModel)
+ReferenceHook = t.Callable[
+    [t.Type[pydantic.BaseModel], t.Dict[str, t.Any]],
+    t.Optional[pydantic.BaseModel],
+]
+
+LIST_SHAPES = {
+    pydantic_fields.SHAPE_LIST,
+    pydantic_fields.SHAPE_SEQUENCE,
+    pydantic_fields.SHAPE_TUPLE_ELLIPSIS,
+    pydantic_fields.SHAPE_ITERABLE,
+}
+MAPPING_SHAPES = {
+    pydantic_fields.SHAPE_MAPPING,
+    pydantic_fields.SHAPE_DICT,
+    pydantic_fields.SHAPE_DEFAULTDICT,
+}
+SCALAR_TYPES = (str, int, float)
+
+
+def _is_model(
+    type_: t.Any,
+) -> bool:
+    return isinstance(type_, type) and issubclass(type_, pydantic.BaseModel)
+
+
+def _is_enum(
+    type_: t.Any,
+) -> bool:
+    return isinstance(type_, type) and issubclass(type_, enum.Enum)
+
+
+class ModelSignature(t.NamedTuple):
+    fields: t.Dict[str, t.Tuple[str, ModelField]]  # by alias
+    required: t.FrozenSet[str]
+    forbid_extra: bool
+
+
+@functools.lru_cache(maxsize=None)
+def get_model_signature(
+    model: t.Type[pydantic.BaseModel],
+) -> ModelSignature:
+    return ModelSignature(
+        fields={field.alias: (name, field) for name, field in model.__fields__.items()},
+        required=frozenset(
+            field.alias for field in model.__fields__.values() if field.required
+        ),
+        forbid_extra=model.__config__.extra == pydantic.Extra.forbid,
+    )
+
+
+def _model_accepts(
+    model: t.Type[pydantic.BaseModel],
+    value: t.Any,
+) -> bool:
+    if not isinstance(value, dict):
+        return False
+
+    signature = get_model_signature(model)
+    if not signature.required.issubset(value):
+        return False
+
+    if signature.forbid_extra:
+        return signature.fields.keys() >= value.keys()
+    return True
+
+
+def _type_accepts(
+    type_: t.Any,
+    value: t.Any,
+) -> bool:
+    if _is_model(type_):
+        return _model_accepts(type_, value)
+    if _is_enum(type_):
+        return value in {member.value for member in type_} or isinstance(value, type_)
+    if type_ in (t.Pattern, re.Pattern):
+        return isinstance(value, (str, re.Pattern))
+    if isinstance(type_, type) and type_ is not object:
+        return isinstance(value, type_)
+    return True
+
+
+class ModelConstructor:
+    """Build pydantic models from already validated data, without validation.
+
+    Aliases are converted to field names, nested models, enums and patterns
+    are built according to the fields declaration. Unions are resolved
+    structurally, in declaration order, like pydantic would.
+    """
+
+    def __init__(
+        self,
+        *,
+        resolve_reference: t.Optional[ReferenceHook] = None,
+    ) -> None:
+        self.resolve_reference = resolve_reference
+
+    def construct(
+        self,
+        model: t.Type[Model],
+        values: t.Dict[str, t.Any],
+    ) -> Model:
+        if self.resolve_reference:
+            instance = self.resolve_reference(model, values)
+            if instance is not None:
+                return instance  # type: ignore
+
+        fields = get_model_signature(model).fields
+        fields_values: t.Dict[str, t.Any] = {}
+        remaining: t.Dict[str, t.Any] = {}
+        for key, value in values.items():
+            if key in fields:
+                name, field = fields[key]
+                fields_values[name] = self.construct_field(field, value)
+            else:
+                remaining[key] = value
+
+        fields_set = set(fields_values) | set(remaining)
+        fields_values.update(remaining)  # extra attributes
+        return model.construct(
+            _fields_set=fields_set,
+            **fields_values,
+        )
+
+    def construct_field(
+        self,
+        field: ModelField,
+        value: t.Any,
+    ) -> t.Any:
+        if value is None:
+            return None
+
+        if field.shape in LIST_SHAPES and isinstance(value, list):
+            return [self.construct_field(field.sub_fields[0], v) for v in value]
+
+        if field.shape in MAPPING_SHAPES and isinstance(value, dict):
+            return {
+                key: self.construct_field(field.sub_fields[0], v)
+                for key, v in value.items()
+            }
+
+        if field.shape == pydantic_fields.SHAPE_SINGLETON and field.sub_fields:
+            return self._construct_union(field.sub_fields, value)
+
+        return self._construct_type(field, value)
+
+    def _construct_union(
+        self,
+        sub_fields: t.List[ModelField],
+        value: t.Any,
+    ) -> t.Any:
+        for sub_field in sub_fields:
+            if self.accepts(sub_field, value):
+                return self.construct_field(sub_field, value)
+        return value
+
+    def _construct_type(
+        self,
+        field: ModelField,
+        value: t.Any,
+    ) -> t.Any:
+        type_ = field.type_
+        if _is_model(type_) and isinstance(value, dict):
+            return self.construct(type_, value)
+        if _is_enum(type_):
+            return value if isinstance(value, type_) else type_(value)
+        if type_ in (t.Pattern, re.Pattern):
+            return re.compile(value) if isinstance(value, str) else value
+        if type_ in SCALAR_TYPES:
+            # same coercion than pydantic for yaml scalars (e.g: enum: [1, 0])
+            return value if type(value) is type_ else type_(value)
+        if not isinstance(type_, type) or type_ is object:
+            return value  # t.Any, t.Literal...
+        # remaining types (urls, emails...) are cheap to validate
+        result, error = field.validate(value, {}, loc=field.alias)
+        if error:
+            raise ValueError(f"Invalid value for {field.alias}: {value}")
+        return result
+
+    def accepts(
+        self,
+        field: ModelField,
+        value: t.Any,
+    ) -> bool:
+        if field.shape in LIST_SHAPES:
+            return isinstance(value, list)
+
+        if field.shape in MAPPING_SHAPES:
+            return isinstance(value, dict) and all(
+                self.accepts(field.sub_fields[0], v) for v in value.values()
+            )
+
+        if field.shape == pydantic_fields.SHAPE_SINGLETON and field.sub_fields:
+            return any(self.accepts(sub_field, value) for sub_field in field.sub_fields)
+
+        return _type_accepts(field.type_, value)
@@ -0,0 +1,342 @@
+import asyncio
+import importlib
+import json
+import os
+import socket
+import stat as stat_
+import tempfile
+import time
+import typing as t
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from openapydantic import common
+
+# protocol: one json object per line, in both directions.
+# request: {"command": "validate", "file_path": "api.yaml"}
+#          {"command": "query", "file_path": "api.yaml", "expression": "$.info"}
+#          {"command": "diff", "old": "old.yaml", "new": "api.yaml"}
+#          {"command": "ping"} / {"command": "shutdown"}
+# response: {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+
+# the client side (request) only needs the standard library
+ENCODING = "utf-8"
+
+
+def runtime_directory() -> str:
+    # private to the user: $XDG_RUNTIME_DIR, or a directory created with
+    # mode 0700 in the temporary directory
+    return os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+        tempfile.gettempdir(),
+        f"openapydantic-{os.getuid()}",
+    )
+
+
+def default_socket_path() -> str:
+    return os.environ.get("OPENAPYDANTIC_SOCKET") or os.path.join(
+        runtime_directory(),
+        "openapydantic.sock",
+    )
+
+
+def _check_directory(
+    directory: str,
+) -> None:
+    # nobody else may replace the socket: the directory is the user's and
+    # only writable by them, or sticky (like /tmp)
+    stat = os.stat(directory)
+    if stat.st_mode & stat_.S_ISVTX:
+        return
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+        raise PermissionError(f"Unsafe socket directory:{directory}")
+
+
+def _remove_stale_socket(
+    socket_path: str,
+) -> None:
+    try:
+        stat = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat_.S_ISSOCK(stat.st_mode):
+        raise FileExistsError(f"Not a socket:{socket_path}")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)  # left by a daemon which is gone
+            return
+    raise FileExistsError(f"A daemon is already listening on {socket_path}")
+
+
+def _stat(
+    file_path: str,
+) -> t.Optional[t.Tuple[int, int]]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CachedSpec:
+    def __init__(
+        self,
+        *,
+        api: t.Any = None,
+        error: t.Optional[str] = None,
+        dependencies: t.Dict[str, t.Optional[t.Tuple[int, int]]],
+        duration: float,
+    ) -> None:
+        self.api = api
+        self.error = error
+        # documents of the specification (root included) -> (mtime, size)
+        self.dependencies = dependencies
+        self.duration = duration
+
+    @property
+    def is_stale(self) -> bool:
+        return any(
+            _stat(file_path) != signature
+            for file_path, signature in self.dependencies.items()
+        )
+
+
+class SpecCache:
+    """Loaded (or invalid) specifications, reloaded when a file changed.
+
+    A specification is stale as soon as the modification time (or size) of
+    its file or of a document it references changed.
+    """
+
+    def __init__(
+        self,
+        *,
+        version: t.Optional["common.OpenApiVersion"] = None,
+        backend: t.Optional["common.ModelBackend"] = None,
+    ) -> None:
+        from openapydantic import common
+
+        self.version = version
+        self.backend = backend or common.ModelBackend.pydantic_v1
+        self.specs: t.Dict[str, CachedSpec] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _load(
+        self,
+        file_path: str,
+    ) -> CachedSpec:
+        from openapydantic import loaders
+        from openapydantic import versions
+
+        file_loader = loaders.TrackingFileLoader()
+        # signatures are taken before loading: a change during the load
+        # makes the entry stale
+        signature = _stat(file_path)
+        start = time.perf_counter()
+        api, error = None, None
+        try:
+            api = await versions.load_api(
+                file_path=file_path,
+                version=self.version,
+                backend=self.backend,
+                loaders={"file": file_loader},
+            )
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}"
+        dependencies = {file_path: signature}
+        for path in file_loader.paths:
+            dependencies[path] = _stat(path)
+        return CachedSpec(
+            api=api,
+            error=error,
+            dependencies=dependencies,
+            duration=time.perf_counter() - start,
+        )
+
+    async def get(
+        self,
+        file_path: str,
+    ) -> t.Tuple[CachedSpec, bool]:
+        file_path = os.path.abspath(file_path)
+        spec = self.specs.get(file_path)
+        if spec is not None and not spec.is_stale:
+            self.hits += 1
+            return spec, True
+
+        self.misses += 1
+        spec = await self._load(file_path)
+        self.specs[file_path] = spec
+        return spec, False
+
+    async def get_api(
+        self,
+        file_path: str,
+    ) -> CachedSpec:
+        spec, _ = await self.get(file_path)
+        if spec.error:
+            raise ValueError(f"Invalid specification {file_path}: {spec.error}")
+        return spec
+
+
+class Daemon:
+    def __init__(
+        self,
+        *,
+        socket_path: str,
+        cache: t.Optional[SpecCache] = None,
+    ) -> None:
+        self.socket_path = socket_path
+        self.cache = cache if cache is not None else SpecCache()
+        self.commands: t.Dict[
+            str,
+            t.Callable[[t.Dict[str, t.Any]], t.Awaitable[t.Any]],
+        ] = {
+            "ping": self._ping,
+            "validate": self._validate,
+            "query": self._query,
+            "diff": self._diff,
+            "shutdown": self._shutdown,
+        }
+        # must be created in the event loop running the daemon
+        self._lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+        self._connections: t.Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+
+    async def _ping(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        return {
+            "pid": os.getpid(),
+            "specs": len(self.cache.specs),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+        }
+
+    async def _validate(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        start = time.perf_counter()
+        spec, cached = await self.cache.get(request["file_path"])
+        return {
+            "valid": spec.error is None,
+            "error": spec.error,
+            "cached": cached,
+            "duration": time.perf_counter() - start,
+        }
+
+    async def _query(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> t.List[t.Any]:
+        spec = await self.cache.get_api(request["file_path"])
+        return spec.api.query(request["expression"])  # type: ignore
+
+    async def _diff(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        from openapydantic import diff
+
+        old = await self.cache.get_api(request["old"])
+        new = await self.cache.get_api(request["new"])
+        result = diff.diff_apis(old.api, new.api)
+        return json.loads(result.json())  # type: ignore
+
+    async def _shutdown(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> None:
+        self._stopped.set()
+
+    async def handle(
+        self,
+        request: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        command = self.commands.get(request.get("command"))  # type: ignore
+        if command is None:
+            return {"ok": False, "error": f"Unknown command:{request.get('command')}"}
+        try:
+            # requests share the cache: one at a time
+            async with self._lock:
+                return {"ok": True, "result": await command(request)}
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self._connections[asyncio.current_task()] = writer  # type: ignore
+        try:
+            while not reader.at_eof() and not self._stopped.is_set():
+                line = await reader.readline()
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "Invalid json request"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode(ENCODING) + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass  # client gone
+        finally:
+            writer.close()
+            self._connections.pop(asyncio.current_task(), None)  # type: ignore
+
+    async def serve(self) -> None:
+        from openapydantic import versions
+
+        # warm up: model classes are imported before the first request
+        for modules in versions.VERSION_MODULES.values():
+            module_name = modules.get(self.cache.backend)
+            if module_name:
+                importlib.import_module(module_name)
+
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        _check_directory(directory)
+        _remove_stale_socket(self.socket_path)
+        # only the user can connect
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                self._handle_connection,
+                path=self.socket_path,
+            )
+        finally:
+            os.umask(umask)
+        os.chmod(self.socket_path, 0o600)
+        try:
+            async with server:
+                await self._stopped.wait()
+                # idle connections are closed: their handlers end on eof
+                for writer in list(self._connections.values()):
+                    writer.close()
+                await asyncio.gather(*self._connections, return_exceptions=True)
+        finally:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def request(
+    payload: t.Dict[str, t.Any],
+    *,
+    socket_path: t.Optional[str] = None,
+    timeout: t.Optional[float] = None,
+) -> t.Any:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path or default_socket_path())
+        client.sendall(json.dumps(payload).encode(ENCODING) + b"\n")
+        with client.makefile("rb") as file:
+            response = json.loads(file.readline())
+    if not response["ok"]:
+        raise ValueError(response["error"])
+    return response["result"]
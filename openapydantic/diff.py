@@ -0,0 +1,500 @@
+import enum
+import typing as t
+
+from openapydantic import common
+from openapydantic import hashing
+from openapydantic.compat import pydantic
+
+HTTP_METHODS = common.HTTP_METHODS
+
+
+class ChangeKind(enum.Enum):
+    added = "added"
+    removed = "removed"
+    changed = "changed"
+
+
+class Element(enum.Enum):
+    path = "path"
+    operation = "operation"
+    parameter = "parameter"
+    request_body = "requestBody"
+    response = "response"
+    schema = "schema"
+
+
+class Direction(enum.Enum):
+    request = "request"
+    response = "response"
+
+
+class Change(pydantic.BaseModel):
+    kind: ChangeKind
+    element: Element
+    location: t.Tuple[str, ...]
+    breaking: bool = False
+    detail: t.Optional[str]
+
+    @property
+    def pointer(self) -> str:
+        return "#/" + "/".join(
+            token.replace("~", "~0").replace("/", "~1") for token in self.location
+        )
+
+
+class SpecDiff(pydantic.BaseModel):
+    changes: t.List[Change] = []
+
+    @property
+    def breaking_changes(self) -> t.List[Change]:
+        return [change for change in self.changes if change.breaking]
+
+    @property
+    def is_breaking(self) -> bool:
+        return any(change.breaking for change in self.changes)
+
+
+Location = t.Tuple[str, ...]
+
+
+class SpecDiffer:
+    """Structural diff between two raw api documents.
+
+    Every compared node is first checked with its merkle hash, identical
+    subtrees (including expanded references) are skipped in O(1).
+    """
+
+    def __init__(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+    ) -> None:
+        self.old = hashing.MerkleHasher(old)
+        self.new = hashing.MerkleHasher(new)
+        self.changes: t.List[Change] = []
+        self._schemas_in_progress: t.Set[t.Tuple[int, int]] = set()
+
+    def _same(
+        self,
+        old: t.Any,
+        new: t.Any,
+    ) -> bool:
+        return self.old.hash(old) == self.new.hash(new)
+
+    def _add(
+        self,
+        kind: ChangeKind,
+        element: Element,
+        location: Location,
+        *,
+        breaking: bool = False,
+        detail: t.Optional[str] = None,
+    ) -> None:
+        self.changes.append(
+            Change(
+                kind=kind,
+                element=element,
+                location=location,
+                breaking=breaking,
+                detail=detail,
+            ),
+        )
+
+    def _diff_keys(
+        self,
+        old: t.Mapping[str, t.Any],
+        new: t.Mapping[str, t.Any],
+        *,
+        element: Element,
+        location: Location,
+        removed_breaking: bool = True,
+    ) -> t.List[str]:
+        # report added / removed keys, return the changed common keys
+        for key in new:
+            if key not in old:
+                self._add(ChangeKind.added, element, location + (key,))
+        changed = []
+        for key in old:
+            if key not in new:
+                self._add(
+                    ChangeKind.removed,
+                    element,
+                    location + (key,),
+                    breaking=removed_breaking,
+                )
+            elif not self._same(old[key], new[key]):
+                changed.append(key)
+        return changed
+
+    # schemas
+
+    def _diff_type(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        if old.get("type") != new.get("type"):
+            self._add(
+                ChangeKind.changed,
+                Element.schema,
+                location + ("type",),
+                breaking=True,
+                detail=f"{old.get('type')} -> {new.get('type')}",
+            )
+
+    def _diff_required(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+        direction: Direction,
+    ) -> None:
+        old_required = set(old.get("required") or [])
+        new_required = set(new.get("required") or [])
+        for name in sorted(new_required - old_required):
+            self._add(
+                ChangeKind.added,
+                Element.schema,
+                location + ("required", name),
+                breaking=direction == Direction.request,
+            )
+        for name in sorted(old_required - new_required):
+            self._add(
+                ChangeKind.removed,
+                Element.schema,
+                location + ("required", name),
+                breaking=direction == Direction.response,
+            )
+
+    def _diff_enum(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+        direction: Direction,
+    ) -> None:
+        if "enum" not in old and "enum" not in new:
+            return
+        old_values = old.get("enum") or []
+        new_values = new.get("enum") or []
+        for value in new_values:
+            if value not in old_values:
+                self._add(
+                    ChangeKind.added,
+                    Element.schema,
+                    location + ("enum", str(value)),
+                    breaking=direction == Direction.response,
+                )
+        for value in old_values:
+            if value not in new_values:
+                self._add(
+                    ChangeKind.removed,
+                    Element.schema,
+                    location + ("enum", str(value)),
+                    breaking=direction == Direction.request,
+                )
+
+    def _diff_properties(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+        direction: Direction,
+    ) -> None:
+        old_properties = old.get("properties") or {}
+        new_properties = new.get("properties") or {}
+        new_required = set(new.get("required") or [])
+        location = location + ("properties",)
+
+        for name in new_properties:
+            if name not in old_properties:
+                self._add(
+                    ChangeKind.added,
+                    Element.schema,
+                    location + (name,),
+                    breaking=direction == Direction.request and name in new_required,
+                )
+        for name, value in old_properties.items():
+            if name not in new_properties:
+                self._add(
+                    ChangeKind.removed,
+                    Element.schema,
+                    location + (name,),
+                    breaking=True,
+                )
+            else:
+                self.diff_schema(
+                    value,
+                    new_properties[name],
+                    location=location + (name,),
+                    direction=direction,
+                )
+
+    def diff_schema(
+        self,
+        old: t.Any,
+        new: t.Any,
+        *,
+        location: Location,
+        direction: Direction,
+    ) -> None:
+        if self._same(old, new):
+            return
+
+        old = self.old.deref(old)
+        new = self.new.deref(new)
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            return
+
+        # recursive schemas
+        key = (id(old), id(new))
+        if key in self._schemas_in_progress:
+            return
+        self._schemas_in_progress.add(key)
+
+        changes_count = len(self.changes)
+        self._diff_type(old, new, location)
+        self._diff_required(old, new, location, direction)
+        self._diff_enum(old, new, location, direction)
+        self._diff_properties(old, new, location, direction)
+        if "items" in old and "items" in new:
+            self.diff_schema(
+                old["items"],
+                new["items"],
+                location=location + ("items",),
+                direction=direction,
+            )
+        if len(self.changes) == changes_count:
+            # any other keyword (description, format...)
+            self._add(ChangeKind.changed, Element.schema, location)
+
+        self._schemas_in_progress.discard(key)
+
+    # operations
+
+    def _diff_content(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        *,
+        element: Element,
+        location: Location,
+        direction: Direction,
+    ) -> None:
+        old_content = old.get("content") or {}
+        new_content = new.get("content") or {}
+        location = location + ("content",)
+        for media_type in self._diff_keys(
+            old_content,
+            new_content,
+            element=element,
+            location=location,
+        ):
+            self.diff_schema(
+                old_content[media_type].get("schema"),
+                new_content[media_type].get("schema"),
+                location=location + (media_type, "schema"),
+                direction=direction,
+            )
+
+    def _parameters(
+        self,
+        hasher: hashing.MerkleHasher,
+        parameters: t.Optional[t.List[t.Any]],
+    ) -> t.Dict[str, t.Dict[str, t.Any]]:
+        result = {}
+        for parameter in parameters or []:
+            parameter = hasher.deref(parameter)
+            if isinstance(parameter, dict):
+                result[f"{parameter.get('name')}({parameter.get('in')})"] = parameter
+        return result
+
+    def _diff_parameter(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        breaking = (bool(new.get("required")) and not old.get("required")) or old.get(
+            "in"
+        ) != new.get("in")
+        self._add(ChangeKind.changed, Element.parameter, location, breaking=breaking)
+        self.diff_schema(
+            old.get("schema"),
+            new.get("schema"),
+            location=location + ("schema",),
+            direction=Direction.request,
+        )
+
+    def _diff_parameters(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        old_parameters = self._parameters(self.old, old.get("parameters"))
+        new_parameters = self._parameters(self.new, new.get("parameters"))
+        location = location + ("parameters",)
+
+        for key, parameter in new_parameters.items():
+            if key not in old_parameters:
+                self._add(
+                    ChangeKind.added,
+                    Element.parameter,
+                    location + (key,),
+                    breaking=bool(parameter.get("required")),
+                )
+        for key, parameter in old_parameters.items():
+            if key not in new_parameters:
+                self._add(
+                    ChangeKind.removed,
+                    Element.parameter,
+                    location + (key,),
+                    breaking=True,
+                )
+            elif not self._same(parameter, new_parameters[key]):
+                self._diff_parameter(parameter, new_parameters[key], location + (key,))
+
+    def _diff_request_body(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        old_body = self.old.deref(old.get("requestBody"))
+        new_body = self.new.deref(new.get("requestBody"))
+        location = location + ("requestBody",)
+
+        if self._same(old_body, new_body):
+            return
+        if not old_body:
+            self._add(
+                ChangeKind.added,
+                Element.request_body,
+                location,
+                breaking=bool(new_body.get("required")),
+            )
+        elif not new_body:
+            self._add(ChangeKind.removed, Element.request_body, location, breaking=True)
+        else:
+            self._add(
+                ChangeKind.changed,
+                Element.request_body,
+                location,
+                breaking=bool(new_body.get("required"))
+                and not old_body.get("required"),
+            )
+            self._diff_content(
+                old_body,
+                new_body,
+                element=Element.request_body,
+                location=location,
+                direction=Direction.request,
+            )
+
+    def _diff_responses(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        old_responses = old.get("responses") or {}
+        new_responses = new.get("responses") or {}
+        location = location + ("responses",)
+        for status_code in self._diff_keys(
+            old_responses,
+            new_responses,
+            element=Element.response,
+            location=location,
+        ):
+            self._add(ChangeKind.changed, Element.response, location + (status_code,))
+            self._diff_content(
+                self.old.deref(old_responses[status_code]),
+                self.new.deref(new_responses[status_code]),
+                element=Element.response,
+                location=location + (status_code,),
+                direction=Direction.response,
+            )
+
+    def diff_operation(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        self._add(ChangeKind.changed, Element.operation, location)
+        self._diff_parameters(old, new, location)
+        self._diff_request_body(old, new, location)
+        self._diff_responses(old, new, location)
+
+    def diff_path(
+        self,
+        old: t.Dict[str, t.Any],
+        new: t.Dict[str, t.Any],
+        location: Location,
+    ) -> None:
+        old = self.old.deref(old)
+        new = self.new.deref(new)
+        self._add(ChangeKind.changed, Element.path, location)
+        self._diff_parameters(old, new, location)
+
+        old_operations = {key: old[key] for key in HTTP_METHODS if key in old}
+        new_operations = {key: new[key] for key in HTTP_METHODS if key in new}
+        for method in self._diff_keys(
+            old_operations,
+            new_operations,
+            element=Element.operation,
+            location=location,
+        ):
+            self.diff_operation(
+                old_operations[method],
+                new_operations[method],
+                location + (method,),
+            )
+
+    def diff_schemas(self) -> None:
+        old_schemas = (self.old.raw_api.get("components") or {}).get("schemas") or {}
+        new_schemas = (self.new.raw_api.get("components") or {}).get("schemas") or {}
+        location = ("components", "schemas")
+        for name in self._diff_keys(
+            old_schemas,
+            new_schemas,
+            element=Element.schema,
+            location=location,
+        ):
+            self.diff_schema(
+                old_schemas[name],
+                new_schemas[name],
+                location=location + (name,),
+                direction=Direction.response,
+            )
+
+    def diff(self) -> SpecDiff:
+        old_paths = self.old.raw_api.get("paths") or {}
+        new_paths = self.new.raw_api.get("paths") or {}
+        for path in self._diff_keys(
+            old_paths,
+            new_paths,
+            element=Element.path,
+            location=("paths",),
+        ):
+            self.diff_path(old_paths[path], new_paths[path], ("paths", path))
+
+        self.diff_schemas()
+        return SpecDiff(changes=self.changes)
+
+
+def diff_specs(
+    old: t.Dict[str, t.Any],
+    new: t.Dict[str, t.Any],
+) -> SpecDiff:
+    return SpecDiffer(old, new).diff()
+
+
+def diff_apis(
+    old: t.Any,
+    new: t.Any,
+) -> SpecDiff:
+    # works with any loaded api (OpenApi302...), based on the raw documents
+    return diff_specs(old.raw_api, new.raw_api)
@@ -0,0 +1,106 @@
+import functools
+import typing as t
+
+# export keeping the references to components: the places of raw_api
+# holding a "#/components/..." reference are excluded from the models
+# export (so the interpolated values are never exported), then the
+# references are put back. Components are exported once, in components.
+
+Location = t.Tuple[t.Union[str, int], ...]
+Exclude = t.Dict[t.Union[str, int], t.Any]
+References = t.List[t.Tuple[Location, str]]
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(
+    model: type,
+) -> t.Optional[t.Dict[str, str]]:
+    # alias -> field name, None for values which are not models
+    fields = getattr(model, "model_fields", None)  # pydantic v2
+    if isinstance(fields, dict):
+        return {field.alias or name: name for name, field in fields.items()}
+    fields = getattr(model, "__fields__", None)
+    if isinstance(fields, dict):
+        return {field.alias: name for name, field in fields.items()}
+    return None
+
+
+def _members(
+    raw: t.Any,
+    value: t.Any,
+) -> t.Iterator[t.Tuple[t.Any, t.Any, t.Any, t.Any]]:
+    # (raw key, raw value, exclude key, validated value)
+    if isinstance(raw, list) and isinstance(value, (list, tuple)):
+        for index, (item, item_value) in enumerate(zip(raw, value)):
+            yield index, item, index, item_value
+        return
+    if not isinstance(raw, dict):
+        return
+    names = _field_names(type(value))
+    if names is not None:
+        for key, item in raw.items():
+            name = names.get(key, key)  # extra fields by their name
+            yield key, item, name, getattr(value, name, None)
+    elif isinstance(value, t.Mapping):
+        for key, item in raw.items():
+            yield key, item, key, value.get(key)
+
+
+def is_component_reference(
+    raw: t.Any,
+) -> bool:
+    return (
+        isinstance(raw, dict)
+        and isinstance(raw.get("$ref"), str)
+        and raw["$ref"].startswith("#/components/")
+    )
+
+
+def reference_exclusions(
+    raw: t.Any,
+    value: t.Any,
+    *,
+    location: Location = (),
+    references: t.Optional[References] = None,
+) -> t.Tuple[Exclude, References]:
+    """Exclusions (pydantic exclude argument) of the places of value
+    holding a component reference in raw, and these references (location
+    in the export, reference).
+    """
+    if references is None:
+        references = []
+    exclude: Exclude = {}
+    for key, item, exclude_key, item_value in _members(raw, value):
+        if item_value is None:
+            continue
+        if is_component_reference(item):
+            exclude[exclude_key] = True
+            references.append((location + (key,), item["$ref"]))
+        elif isinstance(item, (dict, list)):
+            nested, _ = reference_exclusions(
+                item,
+                item_value,
+                location=location + (key,),
+                references=references,
+            )
+            if nested:
+                exclude[exclude_key] = nested
+    return exclude, references
+
+
+def insert_references(
+    document: t.Any,
+    references: References,
+) -> t.Any:
+    # in the order of the exclusions: excluded items of a list are inserted
+    # back before the locations inside the next items are followed
+    for location, ref in references:
+        *parents, key = location
+        node = document
+        for parent in parents:
+            node = node[parent]
+        if isinstance(node, list):
+            node.insert(key, {"$ref": ref})  # type: ignore
+        else:
+            node[key] = {"$ref": ref}
+    return document
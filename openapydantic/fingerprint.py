@@ -0,0 +1,40 @@
+import hashlib
+import json
+import typing as t
+
+from openapydantic import common
+from openapydantic.compat import pydantic
+
+
+def compute_fingerprint(
+    *,
+    raw_api: t.Dict[str, t.Any],
+) -> str:
+    # the fingerprint is bound to the library (and pydantic) version:
+    # a document validated by another version must be validated again
+    content = json.dumps(
+        raw_api,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha256()
+    digest.update(f"openapydantic:{common.LIBRARY_VERSION}".encode())
+    digest.update(f"pydantic:{pydantic.VERSION}".encode())
+    digest.update(content.encode())
+    return digest.hexdigest()
+
+
+def check_fingerprint(
+    *,
+    raw_api: t.Dict[str, t.Any],
+    fingerprint: t.Optional[str],
+) -> None:
+    if not fingerprint:
+        raise ValueError("A validation fingerprint is required in trusted mode")
+
+    if compute_fingerprint(raw_api=raw_api) != fingerprint:
+        raise ValueError(
+            "Api specification was not validated with openapydantic "
+            f"{common.LIBRARY_VERSION}: fingerprint mismatch"
+        )
@@ -0,0 +1,168 @@
+import enum
+import hashlib
+import json
+import typing as t
+
+from openapydantic import pointer
+from openapydantic import resolver
+
+DIGEST_SIZE = 16
+
+
+def _digest(
+    *parts: bytes,
+) -> bytes:
+    result = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for part in parts:
+        result.update(part)
+    return result.digest()
+
+
+class MerkleHasher:
+    """Content hash of every node of a raw api document.
+
+    The hash of a node only depends on its content: local references are
+    followed, so a reference and the equivalent inline object have the
+    same hash. Hashes are memoized per node (by identity) and per
+    component, so a component referenced in many places is hashed once.
+    Members of a reference cycle are hashed together: a reference to one
+    of them is hashed as its name and the hash of the whole cycle.
+    """
+
+    def __init__(
+        self,
+        raw_api: t.Dict[str, t.Any],
+    ) -> None:
+        self.raw_api = raw_api
+        self._nodes: t.Dict[int, t.Tuple[t.Any, bytes]] = {}
+        self._components: t.Dict[t.Tuple[str, t.Tuple[str, ...]], bytes] = {}
+        self._in_progress: t.Set[str] = set()
+        self._cycles: t.Dict[str, t.Tuple[str, ...]] = {}
+        self._cycles_hashes: t.Dict[t.Tuple[str, ...], bytes] = {}
+        self._current_cycle: t.Tuple[str, ...] = ()
+
+        graph = resolver.build_reference_graph(raw_api)
+        for scc in resolver.strongly_connected_components(graph):
+            if len(scc) > 1 or scc[0] in graph.get(scc[0], ()):
+                for ref in scc:
+                    self._cycles[ref] = tuple(sorted(scc))
+
+    def deref(
+        self,
+        node: t.Any,
+    ) -> t.Any:
+        # follow local references, stop on cycles or unknown targets
+        seen: t.Set[str] = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in seen or resolver.is_external_ref(ref):
+                return node
+            seen.add(ref)
+            try:
+                node = pointer.resolve(self.raw_api, ref)
+            except ValueError:
+                return node
+        return node
+
+    def _component(
+        self,
+        component_ref: str,
+    ) -> t.Any:
+        return pointer.resolve(self.raw_api, component_ref)
+
+    def _hash_cycle(
+        self,
+        cycle: t.Tuple[str, ...],
+    ) -> bytes:
+        if cycle not in self._cycles_hashes:
+            # members content, with references inside the cycle hashed as
+            # names: nodes hashes depend on the cycle being hashed.
+            state = self._nodes, self._current_cycle
+            self._nodes = {}
+            self._current_cycle = cycle
+            try:
+                self._cycles_hashes[cycle] = _digest(
+                    b"cycle:",
+                    *(
+                        _digest(ref.encode(), self.hash(self._component(ref)))
+                        for ref in cycle
+                    ),
+                )
+            finally:
+                self._nodes, self._current_cycle = state
+        return self._cycles_hashes[cycle]
+
+    def _hash_ref(
+        self,
+        ref: str,
+    ) -> bytes:
+        component = resolver.split_component_ref(ref)
+        component_ref = pointer.build(("components",) + component) if component else ""
+        if component_ref and len(pointer.parse(ref)) == 3:  # whole component
+            if component_ref in self._current_cycle:
+                return _digest(b"ref:", component_ref.encode())
+            if component_ref in self._cycles:
+                return _digest(
+                    b"ref:",
+                    component_ref.encode(),
+                    self._hash_cycle(self._cycles[component_ref]),
+                )
+
+        key = (ref, self._current_cycle if component_ref in self._current_cycle else ())
+        if key in self._components:
+            return self._components[key]
+        if ref in self._in_progress or resolver.is_external_ref(ref):
+            return _digest(b"ref:", ref.encode())
+
+        try:
+            target = pointer.resolve(self.raw_api, ref)
+        except ValueError:
+            return _digest(b"ref:", ref.encode())
+
+        self._in_progress.add(ref)
+        try:
+            result = self.hash(target)
+        finally:
+            self._in_progress.discard(ref)
+        self._components[key] = result
+        return result
+
+    def _hash_dict(
+        self,
+        node: t.Dict[t.Any, t.Any],
+    ) -> bytes:
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            return self._hash_ref(ref)
+        parts = [b"dict:"]
+        for key in sorted(node, key=str):
+            parts.append(_digest(str(key).encode(), self.hash(node[key])))
+        return _digest(*parts)
+
+    def hash(
+        self,
+        node: t.Any,
+    ) -> bytes:
+        if isinstance(node, (dict, list)):
+            # nodes are kept with their hash so that their id is not reused
+            memo = self._nodes.get(id(node))
+            if memo is None:
+                if isinstance(node, dict):
+                    result = self._hash_dict(node)
+                else:
+                    result = _digest(b"list:", *(self.hash(value) for value in node))
+                memo = self._nodes[id(node)] = (node, result)
+            return memo[1]
+
+        if isinstance(node, enum.Enum):  # validated values
+            node = node.value
+        return _digest(
+            b"scalar:",
+            json.dumps(node, default=str).encode(),
+        )
+
+    def hexdigest(
+        self,
+        node: t.Any,
+    ) -> str:
+        return self.hash(node).hex()
@@ -0,0 +1,74 @@
+import sys
+import typing as t
+
+# strings up to this length go through sys.intern, so they are shared with
+# every other interned string of the process (pydantic field names, aliases...)
+MAX_INTERNED_LENGTH = 128
+
+
+class Interner:
+    def __init__(
+        self,
+        *,
+        max_length: int = MAX_INTERNED_LENGTH,
+    ) -> None:
+        self.max_length = max_length
+        self._scalars: t.Dict[t.Tuple[type, t.Any], t.Any] = {}
+        # containers already interned, keyed by the id of the source object
+        # so that yaml aliases keep pointing to a single object
+        self._containers: t.Dict[int, t.Any] = {}
+
+    def _intern_scalar(
+        self,
+        value: t.Any,
+    ) -> t.Any:
+        if value is None or isinstance(value, bool):
+            return value
+
+        if type(value) is str and len(value) <= self.max_length:
+            return sys.intern(value)
+
+        try:
+            return self._scalars.setdefault((type(value), value), value)
+        except TypeError:  # unhashable scalar (should not happen with yaml/json)
+            return value
+
+    def _intern_dict(
+        self,
+        value: t.Dict[t.Any, t.Any],
+    ) -> t.Dict[t.Any, t.Any]:
+        result: t.Dict[t.Any, t.Any] = {}
+        self._containers[id(value)] = result
+        for key, item in value.items():
+            result[self._intern_scalar(key)] = self.intern(item)
+        return result
+
+    def _intern_list(
+        self,
+        value: t.List[t.Any],
+    ) -> t.List[t.Any]:
+        result: t.List[t.Any] = []
+        self._containers[id(value)] = result
+        result.extend(self.intern(item) for item in value)
+        return result
+
+    def intern(
+        self,
+        value: t.Any,
+    ) -> t.Any:
+        if isinstance(value, (dict, list)):
+            interned = self._containers.get(id(value))
+            if interned is not None:
+                return interned
+            if isinstance(value, dict):
+                return self._intern_dict(value)
+            return self._intern_list(value)
+        return self._intern_scalar(value)
+
+
+def intern_spec(
+    spec: t.Any,
+    *,
+    max_length: int = MAX_INTERNED_LENGTH,
+) -> t.Any:
+    return Interner(max_length=max_length).intern(spec)
@@ -0,0 +1,244 @@
+import asyncio
+import os
+import time
+import typing as t
+
+from openapydantic import pointer
+from openapydantic import resolver
+from openapydantic.compat import pydantic
+
+# a small document can expand into a huge object graph: yaml aliases are
+# shared when loaded but copied by the references interpolation and the
+# models, and so are the components referenced many times.
+
+T = t.TypeVar("T")
+
+
+class LimitExceeded(ValueError):
+    pass
+
+
+class Limits(pydantic.BaseModel):
+    """Resource limits of load_api, None for no limit."""
+
+    # bytes of the root document
+    max_document_size: t.Optional[int] = None
+    # yaml aliases of the root document
+    max_aliases: t.Optional[int] = None
+    # references followed to interpolate a value
+    max_reference_depth: t.Optional[int] = None
+    # nodes (objects, arrays and scalars) once aliases and references expanded
+    max_expanded_nodes: t.Optional[int] = None
+    # seconds, checked between the phases of the load
+    timeout: t.Optional[float] = None
+
+    @classmethod
+    def untrusted(cls) -> "Limits":
+        # specifications uploaded by third parties
+        return cls(
+            max_document_size=16 * 2**20,
+            max_aliases=1000,
+            max_reference_depth=64,
+            max_expanded_nodes=5_000_000,
+            timeout=60,
+        )
+
+
+class Expansion(pydantic.BaseModel):
+    nodes: int
+    reference_depth: int
+
+
+class _ExpansionCounter:
+    def __init__(
+        self,
+        raw_api: t.Dict[str, t.Any],
+        *,
+        max_nodes: t.Optional[int],
+        max_depth: t.Optional[int],
+    ) -> None:
+        self.raw_api = raw_api
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        # mutually recursive components are kept as references
+        self.cyclic = resolver.cyclic_components(
+            resolver.build_reference_graph(raw_api),
+        )
+        self.targets: t.Dict[str, t.Any] = {}
+        # id of a value -> (nodes, depth), values are shared by aliases
+        self.results: t.Dict[int, t.Tuple[int, int]] = {}
+
+    def _target(
+        self,
+        ref: str,
+    ) -> t.Any:
+        # value replacing a reference, None if it is not interpolated
+        if ref not in self.targets:
+            component = resolver.split_component_ref(ref)
+            target = None
+            if component and pointer.build(("components",) + component) not in (
+                self.cyclic
+            ):
+                try:
+                    target = pointer.resolve(self.raw_api, ref)
+                except pointer.JsonPointerError:
+                    pass  # reported by the validation
+            self.targets[ref] = target
+        return self.targets[ref]
+
+    def _children(
+        self,
+        value: t.Any,
+    ) -> t.Tuple[t.List[t.Any], bool]:
+        # (children, is an interpolated reference)
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str):
+                target = self._target(ref)
+                if target is not None:
+                    return [target], True
+            return list(value.values()), False
+        if isinstance(value, list):
+            return value, False
+        return [], False
+
+    def _finish(
+        self,
+        value: t.Any,
+    ) -> t.Tuple[int, int]:
+        children, is_reference = self._children(value)
+        nodes, depth = 0 if is_reference else 1, 0
+        for child in children:
+            child_nodes, child_depth = self.results.get(id(child), (1, 0))
+            nodes += child_nodes
+            depth = max(depth, child_depth)
+        if is_reference:
+            depth += 1
+        if self.max_nodes is not None and nodes > self.max_nodes:
+            raise LimitExceeded(
+                f"Expanded document exceeds {self.max_nodes} nodes",
+            )
+        if self.max_depth is not None and depth > self.max_depth:
+            raise LimitExceeded(
+                f"Reference depth exceeds {self.max_depth}",
+            )
+        return nodes, depth
+
+    def run(self) -> Expansion:
+        # depth first, iterative: values are finished after their children
+        in_progress: t.Set[int] = set()
+        stack = [(self.raw_api, False)]
+        while stack:
+            value, children_done = stack.pop()
+            if children_done:
+                self.results[id(value)] = self._finish(value)
+                continue
+            if id(value) in self.results:
+                continue
+            in_progress.add(id(value))
+            stack.append((value, True))
+            for child in self._children(value)[0]:
+                if not isinstance(child, (dict, list)) or id(child) in self.results:
+                    continue
+                if id(child) in in_progress:
+                    raise ValueError("Recursive document (yaml alias cycle)")
+                stack.append((child, False))
+        nodes, depth = self.results[id(self.raw_api)]
+        return Expansion(nodes=nodes, reference_depth=depth)
+
+
+def estimate_expansion(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    max_nodes: t.Optional[int] = None,
+    max_depth: t.Optional[int] = None,
+) -> Expansion:
+    """Size of a document once its aliases and references are expanded.
+
+    Nodes are counted on the reference graph, without expanding anything:
+    shared values are counted once and multiplied by their occurrences.
+    LimitExceeded is raised as soon as a limit is exceeded.
+    """
+    return _ExpansionCounter(raw_api, max_nodes=max_nodes, max_depth=max_depth).run()
+
+
+def alias_limited_loader(
+    max_aliases: int,
+) -> t.Any:
+    # yaml safe loader rejecting documents with too many aliases
+    import yaml
+
+    class AliasLimitedLoader(yaml.SafeLoader):  # type: ignore
+        aliases = 0
+
+        def compose_node(
+            self,
+            parent: t.Any,
+            index: t.Any,
+        ) -> t.Any:
+            if self.check_event(yaml.AliasEvent):
+                self.aliases += 1
+                if self.aliases > max_aliases:
+                    raise LimitExceeded(f"Document exceeds {max_aliases} yaml aliases")
+            return super().compose_node(parent, index)
+
+    return AliasLimitedLoader
+
+
+class LoadGuard:
+    """Limits checks of a load. Checks of unset limits do nothing."""
+
+    def __init__(
+        self,
+        limits: t.Optional[Limits] = None,
+    ) -> None:
+        self.limits = limits or Limits()
+        self.deadline = (
+            time.monotonic() + self.limits.timeout
+            if self.limits.timeout is not None
+            else None
+        )
+
+    def check_document(
+        self,
+        file_path: str,
+    ) -> None:
+        max_size = self.limits.max_document_size
+        if max_size is not None and os.path.getsize(file_path) > max_size:
+            raise LimitExceeded(f"Document {file_path} exceeds {max_size} bytes")
+
+    def check_time(
+        self,
+        phase: str,
+    ) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise LimitExceeded(
+                f"Load exceeds {self.limits.timeout}s (before {phase})",
+            )
+
+    async def within_time(
+        self,
+        awaitable: t.Awaitable[T],
+        phase: str,
+    ) -> T:
+        self.check_time(phase)
+        if self.deadline is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(
+                awaitable,
+                timeout=max(self.deadline - time.monotonic(), 0),
+            )
+        except asyncio.TimeoutError:
+            raise LimitExceeded(
+                f"Load exceeds {self.limits.timeout}s (during {phase})",
+            ) from None
+
+    def check_expansion(
+        self,
+        raw_api: t.Dict[str, t.Any],
+    ) -> None:
+        max_nodes = self.limits.max_expanded_nodes
+        max_depth = self.limits.max_reference_depth
+        if max_nodes is not None or max_depth is not None:
+            estimate_expansion(raw_api, max_nodes=max_nodes, max_depth=max_depth)
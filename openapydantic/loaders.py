@@ -0,0 +1,180 @@
+import abc
+import asyncio
+import pathlib
+import posixpath
+import typing as t
+import urllib.parse
+import urllib.request
+
+
+def path_to_uri(
+    file_path: str,
+) -> str:
+    return pathlib.Path(file_path).resolve().as_uri()
+
+
+def uri_to_path(
+    uri: str,
+) -> str:
+    parsed = urllib.parse.urlparse(uri)
+    return urllib.request.url2pathname(parsed.path)
+
+
+def join_uri(
+    base_uri: str,
+    ref: str,
+) -> str:
+    # like urllib.parse.urljoin, but for any scheme (custom loaders)
+    parsed = urllib.parse.urlparse(ref)
+    if parsed.scheme:
+        return ref
+
+    base = urllib.parse.urlparse(base_uri)
+    if not parsed.path:
+        return urllib.parse.urlunparse(base._replace(fragment=parsed.fragment))
+
+    path = parsed.path
+    if not path.startswith("/"):
+        path = posixpath.normpath(
+            posixpath.join(posixpath.dirname(base.path), path),
+        )
+    return urllib.parse.urlunparse(
+        base._replace(
+            path=path,
+            query=parsed.query,
+            fragment=parsed.fragment,
+        ),
+    )
+
+
+def parse_document(
+    content: t.Union[str, bytes],
+) -> t.Any:
+    import yaml
+
+    # json is a subset of yaml
+    return yaml.safe_load(content)
+
+
+class DocumentLoader(abc.ABC):
+    @abc.abstractmethod
+    async def load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        """Return the parsed document located at uri."""
+
+
+class FileLoader(DocumentLoader):
+    @staticmethod
+    def _load(
+        uri: str,
+    ) -> t.Any:
+        with open(uri_to_path(uri), "r") as file:
+            return parse_document(file.read())
+
+    async def load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._load, uri)
+
+
+class TrackingFileLoader(FileLoader):
+    # records the paths of the loaded documents (dependencies of a spec)
+    def __init__(self) -> None:
+        self.paths: t.List[str] = []
+
+    async def load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        self.paths.append(uri_to_path(uri))
+        return await super().load(uri)
+
+
+class HttpLoader(DocumentLoader):
+    # not enabled by default: loading remote documents must be an explicit
+    # choice of the caller
+    def __init__(
+        self,
+        *,
+        timeout: float = 10,
+    ) -> None:
+        self.timeout = timeout
+
+    def _load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        with urllib.request.urlopen(uri, timeout=self.timeout) as response:  # nosec
+            return parse_document(response.read())
+
+    async def load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._load, uri)
+
+
+def default_loaders() -> t.Dict[str, DocumentLoader]:
+    return {"file": FileLoader()}
+
+
+class DocumentCache:
+    """Documents loaded during a load_api call, parsed only once.
+
+    Concurrent requests for the same document share the same task.
+    """
+
+    def __init__(
+        self,
+        *,
+        loaders: t.Optional[t.Mapping[str, DocumentLoader]] = None,
+    ) -> None:
+        self.loaders = loaders if loaders is not None else default_loaders()
+        self.documents: t.Dict[str, t.Any] = {}
+        self._tasks: t.Dict[str, "asyncio.Future[t.Any]"] = {}
+
+    def add(
+        self,
+        uri: str,
+        document: t.Any,
+    ) -> None:
+        self.documents[uri] = document
+
+    def _get_loader(
+        self,
+        uri: str,
+    ) -> DocumentLoader:
+        scheme = urllib.parse.urlparse(uri).scheme
+        loader = self.loaders.get(scheme)
+        if not loader:
+            raise ValueError(f"No document loader available for {uri}")
+        return loader
+
+    async def _load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        document = await self._get_loader(uri).load(uri)
+        self.documents[uri] = document
+        return document
+
+    async def get(
+        self,
+        uri: str,
+    ) -> t.Any:
+        if uri in self.documents:
+            return self.documents[uri]
+        if uri not in self._tasks:
+            self._tasks[uri] = asyncio.ensure_future(self._load(uri))
+        return await self._tasks[uri]
+
+    async def get_many(
+        self,
+        uris: t.Iterable[str],
+    ) -> t.List[t.Any]:
+        return await asyncio.gather(*(self.get(uri) for uri in uris))
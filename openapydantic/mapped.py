@@ -0,0 +1,336 @@
+import json
+import mmap
+import os
+import re
+import typing as t
+
+from openapydantic import common
+from openapydantic import pointer
+from openapydantic import resolver
+from openapydantic import selection
+
+# a json specification is scanned once for the byte ranges of its top level
+# values, path items and components: strings are skipped by regular
+# expressions and nested values by counting brackets, nothing is decoded but
+# the keys. Values are parsed from their range when accessed.
+
+INDEX_VERSION = 1
+WHITESPACE = re.compile(rb"[ \t\n\r]*")
+STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+TEXT = rb'[^"\[\]{}]*'
+# everything up to the next bracket outside of strings
+NEXT_BRACKET = re.compile(TEXT + rb"(?:" + STRING.pattern + TEXT + rb")*[\[\]{}]")
+SCALAR = re.compile(rb"[^,\]}\s]*")
+OPENING = b"[{"
+NESTING = 16
+
+
+def _container_pattern(
+    nesting: int,
+) -> t.Pattern[bytes]:
+    # an array or object nested at most nesting times, matched in one call
+    # (no recursion in re, each level embeds the previous one)
+    content = TEXT + rb"(?:" + STRING.pattern + TEXT + rb")*"
+    for _ in range(nesting):
+        value = rb"(?:" + STRING.pattern + rb"|[\[{]" + content + rb"[\]}])"
+        content = TEXT + rb"(?:" + value + TEXT + rb")*"
+    return re.compile(rb"[\[{]" + content + rb"[\]}]")
+
+
+CONTAINER = _container_pattern(NESTING)
+QUOTE, COMMA, CLOSE = b'"', b",", b"}"
+
+Span = t.Tuple[int, int]
+Members = t.Dict[str, Span]
+
+
+class _Scanner:
+    def __init__(
+        self,
+        data: t.Any,
+    ) -> None:
+        self.data = data
+
+    def byte(
+        self,
+        position: int,
+    ) -> bytes:
+        end = position + 1
+        return self.data[position:end]  # type: ignore
+
+    def skip(
+        self,
+        position: int,
+        token: t.Optional[bytes] = None,
+    ) -> int:
+        # whitespace, then the expected token
+        position = WHITESPACE.match(self.data, position).end()  # type: ignore
+        if token is None:
+            return position
+        if self.byte(position) != token:
+            raise ValueError(f"Invalid json: expected {token.decode()} at {position}")
+        return position + 1
+
+    def value_end(
+        self,
+        position: int,
+    ) -> int:
+        first = self.byte(position)
+        if first == QUOTE:
+            match = STRING.match(self.data, position)
+        elif first and first in OPENING:
+            match = CONTAINER.match(self.data, position)
+            if match is not None:
+                return match.end()
+            # nested deeper
+            depth = 0
+            while True:
+                match = NEXT_BRACKET.match(self.data, position)
+                if match is None:
+                    break
+                position = match.end()
+                depth += 1 if self.data[position - 1] in OPENING else -1
+                if not depth:
+                    return position
+        else:
+            match = SCALAR.match(self.data, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid json: unterminated value at {position}")
+        return match.end()
+
+    def members(
+        self,
+        span: Span,
+    ) -> Members:
+        # keys of the object at span -> ranges of their values (null: empty)
+        start, _ = span
+        if self.byte(start) != b"{":
+            return {}
+        result: Members = {}
+        position = self.skip(start + 1)
+        while self.byte(position) != CLOSE:
+            match = STRING.match(self.data, position)
+            if match is None:
+                raise ValueError(f"Invalid json: expected a key at {position}")
+            value_start = self.skip(self.skip(match.end(), b":"))
+            value_end = self.value_end(value_start)
+            result[json.loads(match.group())] = (value_start, value_end)
+            position = self.skip(value_end)
+            if self.byte(position) == COMMA:
+                position = self.skip(position + 1)
+            elif self.byte(position) != CLOSE:
+                raise ValueError(f"Invalid json: expected , or }} at {position}")
+        return result
+
+
+def build_index(
+    data: t.Any,
+) -> t.Dict[str, t.Any]:
+    scanner = _Scanner(data)
+    start = scanner.skip(0)
+    if scanner.byte(start) != b"{":
+        raise ValueError("Not a json object")
+    top = scanner.members((start, len(data)))
+    components = scanner.members(top["components"]) if "components" in top else {}
+    return {
+        "top": top,
+        "paths": scanner.members(top["paths"]) if "paths" in top else {},
+        "components": {
+            component_type: scanner.members(span)
+            for component_type, span in components.items()
+        },
+    }
+
+
+class MappedSpec:
+    """Json specification mapped in memory and parsed on demand.
+
+    The file is scanned once for the byte ranges of the top level values,
+    the path items and the components. With index_path, the index is saved
+    there and reused while the file size and modification time are the
+    same. Values are parsed from their range on each access.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        *,
+        index_path: t.Optional[str] = None,
+    ) -> None:
+        self.file_path = file_path
+        with open(file_path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        stat = os.stat(file_path)
+        key = [INDEX_VERSION, stat.st_size, stat.st_mtime_ns]
+        index = _read_index(index_path, key) if index_path else None
+        if index is None:
+            index = build_index(self._data)
+            if index_path:
+                _write_index(index_path, {"key": key, **index})
+        self._top: Members = index["top"]
+        self._paths: Members = index["paths"]
+        self._components: t.Dict[str, Members] = index["components"]
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> "MappedSpec":
+        return self
+
+    def __exit__(
+        self,
+        *args: t.Any,
+    ) -> None:
+        self.close()
+
+    def _parse(
+        self,
+        span: Span,
+    ) -> t.Any:
+        start, end = span
+        return json.loads(self._data[start:end])
+
+    @property
+    def paths(self) -> t.List[str]:
+        return list(self._paths)
+
+    @property
+    def components(self) -> t.Dict[str, t.List[str]]:
+        return {
+            component_type: list(names)
+            for component_type, names in self._components.items()
+        }
+
+    def get(
+        self,
+        key: str,
+        default: t.Any = None,
+    ) -> t.Any:
+        span = self._top.get(key)
+        return default if span is None else self._parse(span)
+
+    def path_item(
+        self,
+        path: str,
+    ) -> t.Dict[str, t.Any]:
+        return self._parse(self._paths[path])  # type: ignore
+
+    def component(
+        self,
+        component_type: str,
+        name: str,
+    ) -> t.Any:
+        return self._parse(self._components[component_type][name])
+
+    def resolve(
+        self,
+        ref: str,
+    ) -> t.Any:
+        # local reference, only the indexed value containing it is parsed
+        tokens = pointer.parse(ref)
+        if tokens[:1] == ("paths",) and tokens[1:2]:
+            spans, key, rest = self._paths, tokens[1], tokens[2:]
+        elif tokens[:1] == ("components",) and tokens[2:3]:
+            spans = self._components.get(tokens[1]) or {}
+            key, rest = tokens[2], tokens[3:]
+        elif tokens:
+            spans, key, rest = self._top, tokens[0], tokens[1:]
+        else:
+            return self.get_raw_api()
+        if key not in spans:
+            raise pointer.JsonPointerError(f"Pointer not found:{ref}")
+        return pointer.resolve(self._parse(spans[key]), rest)
+
+    def referenced_components(
+        self,
+        obj: t.Any,
+    ) -> t.Dict[str, t.Dict[str, t.Any]]:
+        # components referenced by obj, directly or not, parsed once
+        result: t.Dict[str, t.Dict[str, t.Any]] = {}
+        stack = list(resolver.iter_references(obj))
+        while stack:
+            target = resolver.split_component_ref(stack.pop())
+            if not target:
+                continue
+            component_type, name = target
+            values = result.setdefault(component_type, {})
+            if name in values or name not in self._components.get(component_type, {}):
+                continue
+            values[name] = self.component(component_type, name)
+            stack.extend(resolver.iter_references(values[name]))
+        return {key: values for key, values in result.items() if values}
+
+    def get_raw_api(
+        self,
+        *,
+        include_paths: t.Optional[t.Iterable[str]] = None,
+    ) -> t.Dict[str, t.Any]:
+        """Specification with the path items matching include_paths (glob
+        patterns, all by default) and the components they reference.
+        """
+        operation_filter = selection.OperationFilter(paths=include_paths)
+        raw_api = {
+            key: self._parse(span)
+            for key, span in self._top.items()
+            if key not in ("paths", "components")
+        }
+        raw_api["paths"] = {
+            path: self._parse(span)
+            for path, span in self._paths.items()
+            if include_paths is None or operation_filter.match_path(path)
+        }
+        components = self.referenced_components(raw_api)
+        for component_type in selection.KEPT_COMPONENTS:
+            if component_type in self._components:
+                components[component_type] = {
+                    name: self._parse(span)
+                    for name, span in self._components[component_type].items()
+                }
+        if components or "components" in self._top:
+            raw_api["components"] = components
+        return raw_api
+
+    async def load_api(
+        self,
+        *,
+        include_paths: t.Optional[t.Iterable[str]] = None,
+        version: t.Optional[common.OpenApiVersion] = None,
+        backend: common.ModelBackend = common.ModelBackend.pydantic_v1,
+    ) -> t.Any:
+        from openapydantic import loaders
+        from openapydantic import versions
+
+        raw_api = await resolver.resolve_external_references(
+            raw_api=self.get_raw_api(include_paths=include_paths),
+            base_uri=loaders.path_to_uri(self.file_path),
+        )
+        spec_version = raw_api.get("openapi")
+        if not spec_version:
+            raise ValueError("openapi version not specified")
+        version_module = versions.get_version_module(
+            versions._get_api_version(spec_version=spec_version, version=version),
+            backend,
+        )
+        return version_module.load_api(raw_api=raw_api)
+
+
+def _read_index(
+    index_path: str,
+    key: t.List[int],
+) -> t.Optional[t.Dict[str, t.Any]]:
+    try:
+        with open(index_path) as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("key") == key else None  # type: ignore
+
+
+def _write_index(
+    index_path: str,
+    index: t.Dict[str, t.Any],
+) -> None:
+    temporary_path = f"{index_path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(index, file, separators=(",", ":"))
+    os.replace(temporary_path, index_path)
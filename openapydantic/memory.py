@@ -0,0 +1,386 @@
+import contextlib
+import enum
+import os
+import sys
+import time
+import tracemalloc
+import types
+import typing as t
+
+from openapydantic import common
+from openapydantic import pointer
+from openapydantic import resolver
+from openapydantic.compat import pydantic
+
+# sizes are shallow sizes (sys.getsizeof) summed over the objects reachable
+# from a section. An object shared between sections is attributed to the
+# first section walked: components, paths, other api sections, raw_api.
+
+EXAMPLE_KEYS = frozenset(("example", "examples"))
+# api sections other than components, paths and raw_api
+SECTIONS = ("openapi", "info", "tags", "servers", "security", "external_docs")
+# attributes holding the content of pydantic v1 and v2 models
+MODEL_SLOTS = (
+    "__dict__",
+    "__fields_set__",
+    "__pydantic_fields_set__",
+    "__pydantic_extra__",
+    "__pydantic_private__",
+)
+# shared by every api: not attributed
+_SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, enum.Enum)
+# modules imported during a phase and the tracing itself
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+class Size(pydantic.BaseModel):
+    name: str
+    size: int
+
+
+class ComponentSize(pydantic.BaseModel):
+    component_type: str
+    name: str
+    size: int
+    # copies of the component interpolated in paths and other components
+    expansions: int
+
+    @property
+    def retained_size(self) -> int:
+        # estimation: the component and its expanded copies
+        return self.size * (1 + self.expansions)
+
+
+class MemoryReport(pydantic.BaseModel):
+    total: int
+    sections: t.List[Size]
+    components: t.List[ComponentSize]
+    paths: t.List[Size]
+    # example and examples values, wherever they are (sections included)
+    examples: int
+
+    def text(
+        self,
+        *,
+        limit: int = 10,
+    ) -> str:
+        lines = [f"total {_format_size(self.total)}", "sections:"]
+        lines.extend(_format_sizes(self.sections, limit=limit))
+        lines.append(f"examples: {_format_size(self.examples)}")
+        lines.append("components (size x (1 + expansions)):")
+        for component in self.components[:limit]:
+            lines.append(
+                f"  {_format_size(component.retained_size):>10}  "
+                f"{component.component_type}/{component.name} "
+                f"{_format_size(component.size)} x {1 + component.expansions}",
+            )
+        lines.append("paths:")
+        lines.extend(_format_sizes(self.paths, limit=limit))
+        return "\n".join(lines)
+
+
+class PhaseMemory(pydantic.BaseModel):
+    name: str
+    duration: float
+    # memory allocated by the phase and still allocated at its end
+    allocated: int
+    # highest traced memory during the phase, above its start (imports included)
+    peak: int
+    # files allocating the memory of the phase, by allocated size
+    files: t.List[Size]
+
+
+class LoadProfile(pydantic.BaseModel):
+    phases: t.List[PhaseMemory]
+    report: MemoryReport
+
+    def text(
+        self,
+        *,
+        limit: int = 10,
+    ) -> str:
+        lines = []
+        for phase in self.phases:
+            lines.append(
+                f"{phase.name}: {_format_size(phase.allocated)} allocated, "
+                f"peak {_format_size(phase.peak)}, {phase.duration:.3f}s",
+            )
+            lines.extend(_format_sizes(phase.files, limit=limit))
+        lines.append(self.report.text(limit=limit))
+        return "\n".join(lines)
+
+
+def _format_size(
+    size: int,
+) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024  # type: ignore
+    return f"{size:.1f}GB"
+
+
+def _format_sizes(
+    sizes: t.List[Size],
+    *,
+    limit: int,
+) -> t.List[str]:
+    return [f"  {_format_size(size.size):>10}  {size.name}" for size in sizes[:limit]]
+
+
+def _children(
+    obj: t.Any,
+) -> t.Iterator[t.Tuple[t.Any, t.Any]]:
+    # (key, child) pairs, the key is the dict key or field name if any
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield None, key
+            yield key, value
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            yield None, value
+    elif isinstance(obj, pydantic.BaseModel) or hasattr(obj, "__pydantic_fields__"):
+        for slot in MODEL_SLOTS:
+            value = getattr(obj, slot, None)
+            if value is not None:
+                yield None, value
+
+
+class SizeCounter:
+    """Sizes of object graphs, each object counted once across calls.
+
+    Objects are identified by their id: they must stay alive between calls.
+    """
+
+    def __init__(self) -> None:
+        self.seen: t.Set[int] = set()
+        self.examples = 0
+
+    def size(
+        self,
+        obj: t.Any,
+    ) -> int:
+        total = 0
+        stack = [(obj, False)]
+        while stack:
+            current, in_example = stack.pop()
+            if id(current) in self.seen or isinstance(current, _SKIPPED_TYPES):
+                continue
+            self.seen.add(id(current))
+            size = sys.getsizeof(current)
+            total += size
+            if in_example:
+                self.examples += size
+            for key, child in _children(current):
+                stack.append((child, in_example or key in EXAMPLE_KEYS))
+        return total
+
+
+def _iter_components(
+    components: t.Any,
+) -> t.Iterator[t.Tuple[str, str, t.Any]]:
+    if components is None:
+        return
+    for component_type in common.ComponentType:
+        values = getattr(components, component_type.name, None)
+        for key, value in (values or {}).items():
+            yield component_type.value, key, value
+
+
+def _reference_counts(
+    raw_api: t.Dict[str, t.Any],
+) -> t.Tuple[t.Dict[str, int], t.Dict[str, t.Dict[str, int]]]:
+    # component -> references outside of the components,
+    # component -> component -> references from the first to the second
+    outside: t.Dict[str, int] = {}
+    inside: t.Dict[str, t.Dict[str, int]] = {}
+    components = raw_api.get("components") or {}
+    for key, value in raw_api.items():
+        if key == "components":
+            continue
+        for ref in resolver.iter_references(value):
+            target = resolver.split_component_ref(ref)
+            if target:
+                ref = pointer.build(("components",) + target)
+                outside[ref] = outside.get(ref, 0) + 1
+    for component_type, values in components.items():
+        for key, value in (values or {}).items():
+            source = pointer.build(("components", component_type, key))
+            for ref in resolver.iter_references(value):
+                target = resolver.split_component_ref(ref)
+                if target:
+                    counts = inside.setdefault(source, {})
+                    ref = pointer.build(("components",) + target)
+                    counts[ref] = counts.get(ref, 0) + 1
+    return outside, inside
+
+
+def count_expansions(
+    raw_api: t.Dict[str, t.Any],
+) -> t.Dict[str, int]:
+    """Copies of each component made by the reference interpolation.
+
+    A component is copied for each reference to it in the paths (and
+    other sections), and for each reference in another component, once in
+    that component and once in each of its copies. Mutually recursive
+    components are kept as references: they are not copied.
+    """
+    outside, inside = _reference_counts(raw_api)
+    graph = {source: set(counts) for source, counts in inside.items()}
+    cyclic = resolver.cyclic_components(graph)
+    referrers: t.Dict[str, t.Dict[str, int]] = {}
+    for source, counts in inside.items():
+        for target, count in counts.items():
+            referrers.setdefault(target, {})[source] = count
+
+    expansions: t.Dict[str, int] = {}
+
+    def expand(ref: str) -> int:
+        if ref in cyclic:
+            return 0
+        if ref not in expansions:
+            expansions[ref] = outside.get(ref, 0) + sum(
+                count * (1 + expand(source))
+                for source, count in referrers.get(ref, {}).items()
+            )
+        return expansions[ref]
+
+    return {ref: expand(ref) for ref in set(outside) | set(referrers)}
+
+
+def memory_report(
+    api: t.Any,
+) -> MemoryReport:
+    """Memory retained by a loaded api, by section, component and path."""
+    counter = SizeCounter()
+    expansions = count_expansions(api.raw_api)
+
+    components = []
+    for component_type, key, value in _iter_components(api.components):
+        ref = pointer.build(("components", component_type, key))
+        components.append(
+            ComponentSize(
+                component_type=component_type,
+                name=key,
+                size=counter.size(value),
+                expansions=expansions.get(ref, 0),
+            ),
+        )
+    components.sort(key=lambda component: -component.retained_size)
+    # containers of the components
+    sections = [
+        Size(
+            name="components",
+            size=sum(component.size for component in components)
+            + counter.size(api.components),
+        ),
+    ]
+
+    paths = [
+        Size(name=path, size=counter.size(path_item))
+        for path, path_item in (api.paths or {}).items()
+    ]
+    paths.sort(key=lambda path: -path.size)
+    sections.append(
+        Size(
+            name="paths",
+            size=sum(path.size for path in paths) + counter.size(api.paths),
+        ),
+    )
+
+    for name in SECTIONS:
+        sections.append(Size(name=name, size=counter.size(getattr(api, name))))
+    sections.append(Size(name="raw_api", size=counter.size(api.raw_api)))
+    # the model itself
+    sections.append(Size(name="api", size=counter.size(api)))
+    sections.sort(key=lambda section: -section.size)
+
+    return MemoryReport(
+        total=sum(section.size for section in sections),
+        sections=sections,
+        components=components,
+        paths=paths,
+        examples=counter.examples,
+    )
+
+
+class _PhaseTracer:
+    def __init__(self) -> None:
+        self.phases: t.List[PhaseMemory] = []
+
+    @contextlib.contextmanager
+    def phase(
+        self,
+        name: str,
+    ) -> t.Iterator[None]:
+        if hasattr(tracemalloc, "reset_peak"):  # python>=3.9
+            tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        start_size, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        yield
+        duration = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        statistics = after.compare_to(before, "filename")
+        self.phases.append(
+            PhaseMemory(
+                name=name,
+                duration=duration,
+                allocated=sum(statistic.size_diff for statistic in statistics),
+                peak=peak - start_size,
+                files=[
+                    Size(
+                        name=os.path.relpath(statistic.traceback[0].filename),
+                        size=statistic.size_diff,
+                    )
+                    for statistic in statistics
+                    if statistic.size_diff > 0
+                ],
+            ),
+        )
+
+
+async def profile_load(
+    *,
+    file_path: str,
+    version: t.Optional[common.OpenApiVersion] = None,
+) -> LoadProfile:
+    """Load an api phase by phase under tracemalloc.
+
+    The phases are the document reading, the external references
+    resolution and the models building (components resolution included).
+    Timings are those of a traced load. The memory report of the loaded api
+    is attached.
+    """
+    from openapydantic import loaders
+    from openapydantic import versions
+
+    tracer = _PhaseTracer()
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        with tracer.phase("read"):
+            raw_api = await versions.load_spec(file_path=file_path)
+        with tracer.phase("external references"):
+            raw_api = await resolver.resolve_external_references(
+                raw_api=raw_api,
+                base_uri=loaders.path_to_uri(file_path),
+            )
+        version_module = versions.get_version_module(
+            versions._get_api_version(
+                spec_version=raw_api.get("openapi"),
+                version=version,
+            ),
+        )
+        with tracer.phase("models"):
+            api = version_module.load_api(raw_api=raw_api)
+    finally:
+        if not started:
+            tracemalloc.stop()
+    return LoadProfile(phases=tracer.phases, report=memory_report(api))
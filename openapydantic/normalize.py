@@ -0,0 +1,291 @@
+import typing as t
+
+from openapydantic import hashing
+from openapydantic import pointer
+from openapydantic import resolver
+from openapydantic.compat import pydantic
+
+# schema keywords whose values are schemas, or maps and lists of schemas
+SCHEMA_VALUES = {"items", "additionalProperties", "not"}
+SCHEMA_MAPS = {"properties"}
+SCHEMA_LISTS = {"allOf", "anyOf", "oneOf"}
+# free-form values: not searched for schemas
+SKIPPED_KEYS = {"example", "examples"}
+
+Location = t.Tuple[str, ...]
+
+
+class LiftedSchema(pydantic.BaseModel):
+    name: str
+    # places of the schema (copies nested in other copies not counted)
+    occurrences: int
+    # nodes of the schema, validated once instead of once per occurrence
+    nodes: int
+
+    @property
+    def saved_nodes(self) -> int:
+        return self.nodes * (self.occurrences - 1)
+
+
+class NormalizationReport(pydantic.BaseModel):
+    lifted: t.List[LiftedSchema]
+    # inline copies of schema components, replaced by references
+    reused: int
+    reused_nodes: int
+
+    @property
+    def saved_nodes(self) -> int:
+        return self.reused_nodes + sum(schema.saved_nodes for schema in self.lifted)
+
+    def text(
+        self,
+        *,
+        limit: int = 10,
+    ) -> str:
+        lines = [
+            f"{len(self.lifted)} lifted schemas, {self.reused} copies of"
+            f" components, {self.saved_nodes} schema nodes saved",
+        ]
+        lifted = sorted(self.lifted, key=lambda schema: -schema.saved_nodes)
+        for schema in lifted[:limit]:
+            lines.append(
+                f"  {schema.saved_nodes:>8}  {schema.name}"
+                f" {schema.nodes} nodes x {schema.occurrences}",
+            )
+        return "\n".join(lines)
+
+
+def _replace_items(
+    node: t.Any,
+    function: t.Callable[[t.Any, t.Any], t.Any],
+) -> t.Any:
+    # node with its values replaced by function(key, value), copied only
+    # when a value changed
+    items = node.items() if isinstance(node, dict) else enumerate(node)
+    changed = {}
+    for key, value in items:
+        result = function(key, value)
+        if result is not value:
+            changed[key] = result
+    if not changed:
+        return node
+    if isinstance(node, dict):
+        return {**node, **changed}
+    return [changed.get(index, value) for index, value in enumerate(node)]
+
+
+class SchemaNormalizer:
+    """Inline schemas repeated in a specification, lifted into components.
+
+    Inline schemas (of at least min_nodes nodes) are hashed by content:
+    copies of a schema component are replaced by references to it, and
+    schemas found at several places are lifted into synthetic components
+    (prefix and content hash as name). Schema references to a same
+    component share one source object, so that with source sharing (see
+    pool.SourceSharing) each schema is validated once. Components members
+    of a reference cycle are left as they are.
+
+    The report of the last normalization is kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_nodes: int = 8,
+        prefix: str = "Inline",
+    ) -> None:
+        self.min_nodes = min_nodes
+        self.prefix = prefix
+        self.report = NormalizationReport(lifted=[], reused=0, reused_nodes=0)
+
+    def normalize(
+        self,
+        raw_api: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        lifter = _Lifter(raw_api, min_nodes=self.min_nodes, prefix=self.prefix)
+        result = lifter.lift()
+        self.report = lifter.report()
+        return result
+
+
+class _Lifter:
+    def __init__(
+        self,
+        raw_api: t.Dict[str, t.Any],
+        *,
+        min_nodes: int,
+        prefix: str,
+    ) -> None:
+        self.raw_api = raw_api
+        self.min_nodes = min_nodes
+        self.prefix = prefix
+        self.hasher = hashing.MerkleHasher(raw_api)
+        self.cyclic = resolver.cyclic_components(
+            resolver.build_reference_graph(raw_api),
+        )
+        self.schemas: t.Dict[str, t.Any] = dict(
+            (raw_api.get("components") or {}).get("schemas") or {},
+        )
+        # content hash -> reference of the component with this content
+        self.targets: t.Dict[bytes, str] = {}
+        for name, schema in self.schemas.items():
+            ref = pointer.build(("components", "schemas", name))
+            if isinstance(schema, dict) and "$ref" not in schema:
+                if ref not in self.cyclic:
+                    self.targets.setdefault(self.hasher.hash(schema), ref)
+        self.nodes: t.Dict[int, t.Tuple[t.Any, int]] = {}
+        self.occurrences: t.Dict[bytes, int] = {}
+        self.reused: t.List[int] = []
+        # reference -> source object shared by every reference
+        self.references: t.Dict[str, t.Dict[str, str]] = {}
+        # content hash -> name of the synthetic component
+        self.lifted: t.Dict[bytes, str] = {}
+        self.counting = True
+
+    def lift(self) -> t.Dict[str, t.Any]:
+        # the first walk counts the occurrences, the second one replaces
+        # them (in the same order: the first occurrence is lifted)
+        self.document(self.raw_api, ())
+        self.counting = False
+        self.reused = []
+        result = self.document(self.raw_api, ())
+        if not self.schemas:
+            return result
+        components = result.get("components") or {}
+        return {**result, "components": {**components, "schemas": self.schemas}}
+
+    def report(self) -> NormalizationReport:
+        return NormalizationReport(
+            lifted=[
+                LiftedSchema(
+                    name=name,
+                    occurrences=self.occurrences[digest],
+                    nodes=self.nodes_count(self.schemas[name]),
+                )
+                for digest, name in self.lifted.items()
+            ],
+            reused=len(self.reused),
+            reused_nodes=sum(self.reused),
+        )
+
+    def nodes_count(
+        self,
+        node: t.Any,
+    ) -> int:
+        if not isinstance(node, (dict, list)):
+            return 1
+        # nodes are kept with their count so that their id is not reused
+        memo = self.nodes.get(id(node))
+        if memo is None:
+            values = node.values() if isinstance(node, dict) else node
+            count = 1 + sum(self.nodes_count(value) for value in values)
+            memo = self.nodes[id(node)] = (node, count)
+        return memo[1]
+
+    def reference(
+        self,
+        ref: str,
+    ) -> t.Dict[str, str]:
+        return self.references.setdefault(ref, {"$ref": ref})
+
+    def document(
+        self,
+        node: t.Any,
+        location: Location,
+    ) -> t.Any:
+        if location[:1] == ("components",) and len(location) == 3:
+            if pointer.build(location) in self.cyclic:
+                return node
+        if location == ("components", "schemas"):
+            # rewritten in self.schemas, with the lifted schemas
+            for key, value in node.items():
+                if pointer.build(location + (key,)) not in self.cyclic:
+                    self.schemas[key] = self.schema(value, location + (key,), root=True)
+            return node
+        if not isinstance(node, (dict, list)):
+            return node
+        return _replace_items(
+            node, lambda key, value: self.member(key, value, location)
+        )
+
+    def member(
+        self,
+        key: t.Any,
+        value: t.Any,
+        location: Location,
+    ) -> t.Any:
+        if key == "schema":
+            return self.schema(value, location + (key,))
+        if key in SKIPPED_KEYS or str(key).startswith("x-"):
+            return value
+        return self.document(value, location + (str(key),))
+
+    def schema(
+        self,
+        node: t.Any,
+        location: Location,
+        *,
+        root: bool = False,
+    ) -> t.Any:
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            # a schema and its copies share the same source object
+            return node if self.counting or len(node) > 1 else self.reference(ref)
+        if root or self.nodes_count(node) < self.min_nodes:
+            return self.children(node, location)
+        return self.candidate(node, location)
+
+    def candidate(
+        self,
+        node: t.Dict[str, t.Any],
+        location: Location,
+    ) -> t.Any:
+        digest = self.hasher.hash(node)
+        target = self.targets.get(digest)
+        if target is not None:
+            self.reused.append(self.nodes_count(node))
+            return self.reference(target)
+        if self.counting:
+            self.occurrences[digest] = self.occurrences.get(digest, 0) + 1
+            if self.occurrences[digest] == 1:
+                self.children(node, location)
+            return node
+        if self.occurrences[digest] < 2:
+            return self.children(node, location)
+        if digest not in self.lifted:
+            name = f"{self.prefix}_{digest.hex()[:12]}"
+            while name in self.schemas:
+                name += "_"
+            self.lifted[digest] = name
+            self.schemas[name] = self.children(node, location)
+        return self.reference(
+            pointer.build(("components", "schemas", self.lifted[digest]))
+        )
+
+    def children(
+        self,
+        node: t.Dict[str, t.Any],
+        location: Location,
+    ) -> t.Dict[str, t.Any]:
+        def child(key: str, value: t.Any) -> t.Any:
+            child_location = location + (key,)
+            if key in SCHEMA_VALUES:
+                return self.schema(value, child_location)
+            if key in SCHEMA_MAPS and isinstance(value, dict):
+                return _replace_items(
+                    value,
+                    lambda name, schema: self.schema(schema, child_location + (name,)),
+                )
+            if key in SCHEMA_LISTS and isinstance(value, list):
+                return _replace_items(
+                    value,
+                    lambda index, schema: self.schema(
+                        schema,
+                        child_location + (str(index),),
+                    ),
+                )
+            return value
+
+        return _replace_items(node, child)  # type: ignore
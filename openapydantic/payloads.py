@@ -0,0 +1,898 @@
+import collections
+import concurrent.futures
+import datetime
+import itertools
+import json
+import math
+import operator
+import os
+import re
+import typing as t
+import uuid
+
+from openapydantic import common
+from openapydantic import pointer
+from openapydantic.compat import pydantic
+
+# payloads are validated by closures compiled once per schema: walking the
+# schema (or building models) for each payload is orders of magnitude slower
+
+DEFAULT_MEDIA_TYPE = "application/json"
+CHUNK_SIZE = 1000
+
+# location of a value in the payload, linked to its parent: (parent, key)
+Path = t.Optional[t.Tuple[t.Any, t.Union[str, int]]]
+Errors = t.List[t.Tuple[Path, str]]
+Check = t.Callable[[t.Any, Path, Errors], None]
+KeywordCompiler = t.Callable[["SchemaCompiler", t.Dict[str, t.Any]], t.Optional[Check]]
+
+
+class PayloadError(t.NamedTuple):
+    # json pointer (uri fragment) of the invalid value in the payload
+    location: str
+    message: str
+
+
+class PayloadResult(t.NamedTuple):
+    # position of the payload (line index for NDJSON files)
+    index: int
+    errors: t.List[PayloadError]
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+def _accept(
+    value: t.Any,
+    path: Path,
+    errors: Errors,
+) -> None:
+    pass
+
+
+def _json_type(
+    value: t.Any,
+) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def _location(
+    path: Path,
+) -> str:
+    tokens = []
+    while path is not None:
+        path, key = path
+        tokens.append(key)
+    return pointer.build(reversed(tokens))
+
+
+TYPES: t.Dict[str, t.Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+def _type(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    name = schema.get("type")
+    if name is None:
+        return None
+    if name not in TYPES:
+        raise ValueError(f"Invalid schema type:{name}")
+    types = TYPES[name]
+    # bool is a subclass of int
+    rejects_bool = name != "boolean"
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if not isinstance(value, types) or (rejects_bool and isinstance(value, bool)):
+            errors.append((path, f"expected {name}, got {_json_type(value)}"))
+
+    return check
+
+
+def _enum(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "enum" not in schema:
+        return None
+    # true and 1 are different json values
+    allowed = [(isinstance(value, bool), value) for value in schema["enum"]]
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if (isinstance(value, bool), value) not in allowed:
+            errors.append((path, "not one of the enum values"))
+
+    return check
+
+
+def _properties(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    properties = {
+        name: compiler.compile(property_schema)
+        for name, property_schema in (schema.get("properties") or {}).items()
+    }
+    additional = schema.get("additionalProperties", True)
+    if additional is True:
+        if not properties:
+            return None
+
+        def check(value: t.Any, path: Path, errors: Errors) -> None:
+            if isinstance(value, dict):
+                for name, property_check in properties.items():
+                    if name in value:
+                        property_check(value[name], (path, name), errors)
+
+        return check
+
+    return _additional_properties(
+        properties,
+        None if additional is False else compiler.compile(additional),
+    )
+
+
+def _additional_properties(
+    properties: t.Dict[str, Check],
+    additional_check: t.Optional[Check],
+) -> Check:
+    # additional properties are rejected without additional check
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if not isinstance(value, dict):
+            return
+        for name, item in value.items():
+            property_check = properties.get(name, additional_check)
+            if property_check is None:
+                errors.append(((path, name), "additional property not allowed"))
+            else:
+                property_check(item, (path, name), errors)
+
+    return check
+
+
+def _required(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    required = list(schema.get("required") or ())
+    if not required:
+        return None
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if isinstance(value, dict):
+            for name in required:
+                if name not in value:
+                    errors.append((path, f"missing required property:{name}"))
+
+    return check
+
+
+def _items(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "items" not in schema:
+        return None
+    item_check = compiler.compile(schema["items"])
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                item_check(item, (path, index), errors)
+
+    return check
+
+
+def _unique_items(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if schema.get("uniqueItems") is not True:
+        return None
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if isinstance(value, list):
+            keys = [json.dumps(item, sort_keys=True) for item in value]
+            if len(set(keys)) != len(keys):
+                errors.append((path, "items are not unique"))
+
+    return check
+
+
+def _size(
+    minimum_keyword: str,
+    maximum_keyword: str,
+    types: t.Tuple[type, ...],
+    unit: str,
+) -> KeywordCompiler:
+    # minLength, minItems, minProperties and their maximum
+    def compile_size(
+        compiler: "SchemaCompiler",
+        schema: t.Dict[str, t.Any],
+    ) -> t.Optional[Check]:
+        minimum = schema.get(minimum_keyword) or 0
+        maximum = schema.get(maximum_keyword, math.inf)
+        if not minimum and maximum == math.inf:
+            return None
+
+        def check(value: t.Any, path: Path, errors: Errors) -> None:
+            if isinstance(value, types):
+                size = len(value)
+                if size < minimum:
+                    errors.append((path, f"fewer than {minimum} {unit}"))
+                elif size > maximum:
+                    errors.append((path, f"more than {maximum} {unit}"))
+
+        return check
+
+    return compile_size
+
+
+def _bound(
+    keyword: str,
+    exclusive_keyword: str,
+    out_of_bound: t.Callable[[t.Any, t.Any], bool],
+    out_of_exclusive_bound: t.Callable[[t.Any, t.Any], bool],
+) -> KeywordCompiler:
+    # minimum, maximum (exclusive when exclusiveMinimum/Maximum is true)
+    def compile_bound(
+        compiler: "SchemaCompiler",
+        schema: t.Dict[str, t.Any],
+    ) -> t.Optional[Check]:
+        bound = schema.get(keyword)
+        if bound is None:
+            return None
+        exclusive = schema.get(exclusive_keyword) is True
+        fails = out_of_exclusive_bound if exclusive else out_of_bound
+        message = f"out of {'exclusive ' if exclusive else ''}{keyword} {bound}"
+
+        def check(value: t.Any, path: Path, errors: Errors) -> None:
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and fails(value, bound)
+            ):
+                errors.append((path, message))
+
+        return check
+
+    return compile_bound
+
+
+def _multiple_of(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    divisor = schema.get("multipleOf")
+    if divisor is None:
+        return None
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            quotient = value / divisor
+            if math.isfinite(quotient) and quotient != int(quotient):
+                errors.append((path, f"not a multiple of {divisor}"))
+
+    return check
+
+
+def _pattern(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "pattern" not in schema:
+        return None
+    search = re.compile(schema["pattern"]).search
+    message = f"does not match pattern {schema['pattern']}"
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if isinstance(value, str) and search(value) is None:
+            errors.append((path, message))
+
+    return check
+
+
+def _is_date(
+    value: str,
+) -> bool:
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return len(value) == 10
+
+
+DATE_TIME = re.compile(
+    r"\d{4}-\d\d-\d\d[Tt ]\d\d:\d\d:\d\d(\.\d+)?([Zz]|[+-]\d\d:\d\d)$",
+)
+
+
+def _is_date_time(
+    value: str,
+) -> bool:
+    return DATE_TIME.match(value) is not None and _is_date(value[:10])
+
+
+def _is_uuid(
+    value: str,
+) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _int_range(
+    bits: int,
+) -> t.Callable[[int], bool]:
+    return lambda value: -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
+
+
+# formats checked (others are annotations): format -> (types, predicate)
+FORMATS: t.Dict[str, t.Tuple[t.Tuple[type, ...], t.Callable[[t.Any], bool]]] = {
+    "date": ((str,), _is_date),
+    "date-time": ((str,), _is_date_time),
+    "uuid": ((str,), _is_uuid),
+    "int32": ((int,), _int_range(32)),
+    "int64": ((int,), _int_range(64)),
+}
+
+
+def _format(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if schema.get("format") not in FORMATS:
+        return None
+    types, predicate = FORMATS[schema["format"]]
+    message = f"invalid {schema['format']}"
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if (
+            isinstance(value, types)
+            and not isinstance(value, bool)
+            and not predicate(value)
+        ):
+            errors.append((path, message))
+
+    return check
+
+
+def _all_of(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "allOf" not in schema:
+        return None
+    checks = [compiler.compile(sub_schema) for sub_schema in schema["allOf"]]
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        for sub_check in checks:
+            sub_check(value, path, errors)
+
+    return check
+
+
+def _matches(
+    checks: t.List[Check],
+    value: t.Any,
+) -> int:
+    matches = 0
+    for sub_check in checks:
+        errors: Errors = []
+        sub_check(value, None, errors)
+        matches += not errors
+    return matches
+
+
+def _any_of(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "anyOf" not in schema:
+        return None
+    checks = [compiler.compile(sub_schema) for sub_schema in schema["anyOf"]]
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        for sub_check in checks:
+            sub_errors: Errors = []
+            sub_check(value, None, sub_errors)
+            if not sub_errors:
+                return
+        errors.append((path, "does not match any schema of anyOf"))
+
+    return check
+
+
+def _one_of(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "oneOf" not in schema:
+        return None
+    checks = [compiler.compile(sub_schema) for sub_schema in schema["oneOf"]]
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        matches = _matches(checks, value)
+        if matches != 1:
+            errors.append((path, f"matches {matches} schemas of oneOf"))
+
+    return check
+
+
+def _not(
+    compiler: "SchemaCompiler",
+    schema: t.Dict[str, t.Any],
+) -> t.Optional[Check]:
+    if "not" not in schema:
+        return None
+    checks = [compiler.compile(schema["not"])]
+
+    def check(value: t.Any, path: Path, errors: Errors) -> None:
+        if _matches(checks, value):
+            errors.append((path, "matches the schema of not"))
+
+    return check
+
+
+# type first: other keywords only apply to some types
+KEYWORDS: t.List[KeywordCompiler] = [
+    _type,
+    _enum,
+    _required,
+    _properties,
+    _size("minProperties", "maxProperties", (dict,), "properties"),
+    _items,
+    _size("minItems", "maxItems", (list,), "items"),
+    _unique_items,
+    _size("minLength", "maxLength", (str,), "characters"),
+    _pattern,
+    _format,
+    _bound("minimum", "exclusiveMinimum", operator.lt, operator.le),
+    _bound("maximum", "exclusiveMaximum", operator.gt, operator.ge),
+    _multiple_of,
+    _all_of,
+    _any_of,
+    _one_of,
+    _not,
+]
+
+
+class SchemaCompiler:
+    """Compile openapi 3.0 schemas into validation functions.
+
+    Local references are compiled once, recursive schemas included.
+    """
+
+    def __init__(
+        self,
+        raw_api: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        self.raw_api = raw_api or {}
+        # reference -> check, None while compiling (recursive schemas)
+        self.references: t.Dict[str, t.Optional[Check]] = {}
+
+    def _reference(
+        self,
+        ref: str,
+    ) -> Check:
+        references = self.references
+        if ref not in references:
+            if not ref.startswith("#"):
+                raise ValueError(f"Unresolved external reference:{ref}")
+            references[ref] = None
+            references[ref] = self.compile(pointer.resolve(self.raw_api, ref))
+        compiled = references[ref]
+        if compiled is not None:
+            return compiled
+
+        def check(value: t.Any, path: Path, errors: Errors) -> None:
+            references[ref](value, path, errors)  # type: ignore
+
+        return check
+
+    def compile(
+        self,
+        schema: t.Any,
+    ) -> Check:
+        if not isinstance(schema, dict):
+            raise ValueError(f"Invalid schema:{schema!r}")
+        if isinstance(schema.get("$ref"), str):
+            return self._reference(schema["$ref"])
+
+        checks = [
+            check
+            for check in (compile_keyword(self, schema) for compile_keyword in KEYWORDS)
+            if check is not None
+        ]
+        nullable = schema.get("nullable") is True
+        if not checks:
+            return _accept
+        if len(checks) == 1 and not nullable:
+            return checks[0]
+
+        def check_schema(value: t.Any, path: Path, errors: Errors) -> None:
+            if value is None and nullable:
+                return
+            for check in checks:
+                check(value, path, errors)
+
+        return check_schema
+
+
+def find_operation(
+    raw_api: t.Dict[str, t.Any],
+    operation: str,
+) -> t.Dict[str, t.Any]:
+    # operationId or "<method> <path>", e.g: "get /pets/{id}"
+    method, _, path = operation.partition(" ")
+    path_item = (raw_api.get("paths") or {}).get(path) or {}
+    if method.lower() in common.HTTP_METHODS and method.lower() in path_item:
+        return path_item[method.lower()]  # type: ignore
+    for path_item in (raw_api.get("paths") or {}).values():
+        for method in common.HTTP_METHODS:
+            candidate = (path_item or {}).get(method)
+            if (
+                isinstance(candidate, dict)
+                and candidate.get("operationId") == operation
+            ):
+                return candidate
+    raise ValueError(f"Operation not found:{operation}")
+
+
+def dereference(
+    raw_api: t.Dict[str, t.Any],
+    value: t.Any,
+) -> t.Any:
+    while isinstance(value, dict) and isinstance(value.get("$ref"), str):
+        value = pointer.resolve(raw_api, value["$ref"])
+    return value
+
+
+def find_body(
+    raw_api: t.Dict[str, t.Any],
+    operation: t.Dict[str, t.Any],
+    status_code: t.Optional[str],
+) -> t.Dict[str, t.Any]:
+    if status_code is None:
+        body = operation.get("requestBody")
+        description = "Request body"
+    else:
+        responses = operation.get("responses") or {}
+        body = next(
+            (
+                responses[key]
+                for key in (status_code, f"{status_code[:1]}XX", "default")
+                if key in responses
+            ),
+            None,
+        )
+        description = f"Response {status_code}"
+    body = dereference(raw_api, body)
+    if not isinstance(body, dict):
+        raise ValueError(f"{description} not found")
+    return body
+
+
+def body_schema(
+    body: t.Dict[str, t.Any],
+    media_type: str = DEFAULT_MEDIA_TYPE,
+) -> t.Dict[str, t.Any]:
+    # schema of a request body or response media type
+    content = body.get("content") or {}
+    if media_type not in content or "schema" not in (content[media_type] or {}):
+        raise ValueError(
+            f"No {media_type} schema, media types:{', '.join(content) or 'none'}",
+        )
+    return content[media_type]["schema"]  # type: ignore
+
+
+def payload_schema(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    component: t.Optional[str] = None,
+    operation: t.Optional[str] = None,
+    status_code: t.Optional[t.Union[int, str]] = None,
+    media_type: str = DEFAULT_MEDIA_TYPE,
+) -> t.Dict[str, t.Any]:
+    """Schema of a component, or of an operation request or response body.
+
+    The operation is an operationId or "<method> <path>". Its request body
+    schema is selected without status code, else the schema of the response
+    (then of the "2XX" and "default" responses).
+    """
+    if component is not None:
+        schema = {"$ref": pointer.build(("components", "schemas", component))}
+        pointer.resolve(raw_api, schema["$ref"])
+        return schema
+    if operation is None:
+        raise ValueError("A component or an operation is required")
+
+    body = find_body(
+        raw_api,
+        find_operation(raw_api, operation),
+        None if status_code is None else str(status_code),
+    )
+    return body_schema(body, media_type)
+
+
+class SchemaValidator:
+    """Compiled validator of json payloads against a specification schema.
+
+    Picklable: the schema is compiled again when unpickled (in the worker
+    processes of validate_payloads).
+    """
+
+    def __init__(
+        self,
+        schema: t.Dict[str, t.Any],
+        *,
+        raw_api: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        self.schema = schema
+        self.raw_api = raw_api or {}
+        self._check = SchemaCompiler(self.raw_api).compile(schema)
+
+    @classmethod
+    def from_spec(
+        cls,
+        raw_api: t.Dict[str, t.Any],
+        *,
+        component: t.Optional[str] = None,
+        operation: t.Optional[str] = None,
+        status_code: t.Optional[t.Union[int, str]] = None,
+        media_type: str = DEFAULT_MEDIA_TYPE,
+    ) -> "SchemaValidator":
+        schema = payload_schema(
+            raw_api,
+            component=component,
+            operation=operation,
+            status_code=status_code,
+            media_type=media_type,
+        )
+        return cls(schema, raw_api=raw_api)
+
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        return {"schema": self.schema, "raw_api": self.raw_api}
+
+    def __setstate__(
+        self,
+        state: t.Dict[str, t.Any],
+    ) -> None:
+        self.__init__(state["schema"], raw_api=state["raw_api"])  # type: ignore
+
+    def errors(
+        self,
+        payload: t.Any,
+    ) -> t.List[PayloadError]:
+        errors: Errors = []
+        self._check(payload, None, errors)
+        return [PayloadError(_location(path), message) for path, message in errors]
+
+    def is_valid(
+        self,
+        payload: t.Any,
+    ) -> bool:
+        errors: Errors = []
+        self._check(payload, None, errors)
+        return not errors
+
+
+ARRAY_INDEX = re.compile(r"/\d+(?=/|$)")
+
+
+class PayloadStatistics(pydantic.BaseModel):
+    records: int = 0
+    invalid: int = 0
+    # "<location>: <message>" -> occurrences, array indexes replaced by "*"
+    errors: t.Dict[str, int] = {}
+
+    @property
+    def valid(self) -> int:
+        return self.records - self.invalid
+
+    def add(
+        self,
+        result: PayloadResult,
+    ) -> None:
+        self.records += 1
+        if result.errors:
+            self.invalid += 1
+        for error in result.errors:
+            key = f"{ARRAY_INDEX.sub('/*', error.location)}: {error.message}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def most_common(
+        self,
+        limit: t.Optional[int] = None,
+    ) -> t.List[t.Tuple[str, int]]:
+        return collections.Counter(self.errors).most_common(limit)
+
+    def text(
+        self,
+        *,
+        limit: int = 20,
+    ) -> str:
+        lines = [f"{self.records} records, {self.valid} valid, {self.invalid} invalid"]
+        lines.extend(f"{count:>8} {error}" for error, count in self.most_common(limit))
+        return "\n".join(lines)
+
+
+def _validate_record(
+    validator: SchemaValidator,
+    index: int,
+    record: t.Any,
+    parse: bool,
+) -> PayloadResult:
+    if parse:
+        try:
+            record = json.loads(record)
+        except ValueError as error:
+            message = f"invalid json: {getattr(error, 'msg', error)}"
+            return PayloadResult(index, [PayloadError("#", message)])
+    return PayloadResult(index, validator.errors(record))
+
+
+# validator of the worker processes, set by their initializer
+_worker_validator: t.Optional[SchemaValidator] = None
+
+
+def _init_worker(
+    validator: SchemaValidator,
+) -> None:
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _validate_chunk(
+    chunk: t.List[t.Tuple[int, t.Any]],
+    parse: bool,
+) -> t.List[PayloadResult]:
+    assert _worker_validator is not None  # nosec
+    return [
+        _validate_record(_worker_validator, index, record, parse)
+        for index, record in chunk
+    ]
+
+
+def _chunks(
+    records: t.Iterable[t.Tuple[int, t.Any]],
+    size: int,
+) -> t.Iterator[t.List[t.Tuple[int, t.Any]]]:
+    iterator = iter(records)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+def _pool_results(
+    validator: SchemaValidator,
+    records: t.Iterable[t.Tuple[int, t.Any]],
+    *,
+    parse: bool,
+    workers: int,
+    chunk_size: int,
+) -> t.Iterator[PayloadResult]:
+    # chunks in flight are bounded: the input is consumed as results are
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(validator,),
+    ) as executor:
+        pending: t.Deque[concurrent.futures.Future] = collections.deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(_validate_chunk, chunk, parse))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _validate(
+    validator: SchemaValidator,
+    records: t.Iterable[t.Tuple[int, t.Any]],
+    *,
+    parse: bool,
+    workers: t.Optional[int],
+    chunk_size: int,
+    statistics: t.Optional[PayloadStatistics],
+) -> t.Iterator[PayloadResult]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results: t.Iterable[PayloadResult] = (
+            _validate_record(validator, index, record, parse)
+            for index, record in records
+        )
+    else:
+        results = _pool_results(
+            validator,
+            records,
+            parse=parse,
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+    for result in results:
+        if statistics is not None:
+            statistics.add(result)
+        yield result
+
+
+def validate_payloads(
+    validator: SchemaValidator,
+    payloads: t.Iterable[t.Any],
+    *,
+    workers: t.Optional[int] = 1,
+    chunk_size: int = CHUNK_SIZE,
+    statistics: t.Optional[PayloadStatistics] = None,
+) -> t.Iterator[PayloadResult]:
+    """Results of the payloads, in order, as they are validated.
+
+    With several workers (None: number of cpus), chunks of payloads are
+    validated in a pool of processes. The statistics are updated with the
+    results.
+    """
+    return _validate(
+        validator,
+        enumerate(payloads),
+        parse=False,
+        workers=workers,
+        chunk_size=chunk_size,
+        statistics=statistics,
+    )
+
+
+def read_ndjson(
+    file_path: str,
+) -> t.Iterator[t.Tuple[int, bytes]]:
+    # (line index, line), blank lines skipped
+    with open(file_path, "rb") as file:
+        for index, line in enumerate(file):
+            if line.strip():
+                yield index, line
+
+
+def validate_ndjson(
+    validator: SchemaValidator,
+    file_path: str,
+    *,
+    workers: t.Optional[int] = 1,
+    chunk_size: int = CHUNK_SIZE,
+    statistics: t.Optional[PayloadStatistics] = None,
+) -> t.Iterator[PayloadResult]:
+    """Results of the payloads of a NDJSON file (see validate_payloads).
+
+    Lines are parsed by the workers, invalid json is reported as a result
+    error.
+    """
+    return _validate(
+        validator,
+        read_ndjson(file_path),
+        parse=True,
+        workers=workers,
+        chunk_size=chunk_size,
+        statistics=statistics,
+    )
@@ -0,0 +1,84 @@
+import functools
+import typing as t
+import urllib.parse
+
+# https://datatracker.ietf.org/doc/html/rfc6901
+
+CACHE_SIZE = 16384
+Tokens = t.Tuple[str, ...]
+
+
+class JsonPointerError(ValueError):
+    pass
+
+
+def escape(
+    token: str,
+) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape(
+    token: str,
+) -> str:
+    if "~" in token and any(
+        part[:1] not in ("0", "1") for part in token.split("~")[1:]
+    ):
+        raise JsonPointerError(f"Invalid escape sequence in token:{token}")
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse(
+    pointer: str,
+) -> Tokens:
+    """Reference tokens of a json pointer.
+
+    Both representations are supported: string ("/a/b") and uri fragment
+    ("#/a/b", percent-encoded). Results are cached.
+    """
+    if pointer.startswith("#"):
+        pointer = urllib.parse.unquote(pointer[1:])
+    if not pointer:
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPointerError(f"Invalid json pointer:{pointer}")
+    return tuple(unescape(token) for token in pointer.split("/")[1:])
+
+
+def build(
+    tokens: t.Iterable[str],
+) -> str:
+    # uri fragment representation, e.g: ("components", "schemas", "Pet")
+    return "#" + "".join(
+        "/" + urllib.parse.quote(escape(str(token)), safe="~!$&'()*+,;=:@")
+        for token in tokens
+    )
+
+
+def _array_index(
+    token: str,
+    array: t.List[t.Any],
+) -> int:
+    if not token.isdigit() or (token.startswith("0") and token != "0"):
+        raise JsonPointerError(f"Invalid array index:{token}")
+    index = int(token)
+    if index >= len(array):
+        raise JsonPointerError(f"Array index out of range:{token}")
+    return index
+
+
+def resolve(
+    document: t.Any,
+    pointer: t.Union[str, Tokens],
+) -> t.Any:
+    tokens = parse(pointer) if isinstance(pointer, str) else pointer
+    target = document
+    for token in tokens:
+        if isinstance(target, list):
+            target = target[_array_index(token, target)]
+        elif isinstance(target, dict) and token in target:
+            target = target[token]
+        else:
+            raise JsonPointerError(f"Pointer not found:{build(tokens)}")
+    return target
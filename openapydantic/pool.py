@@ -0,0 +1,140 @@
+import contextlib
+import typing as t
+import weakref
+
+from openapydantic import hashing
+from openapydantic.compat import pydantic
+
+Model = t.TypeVar("Model", bound=pydantic.BaseModel)
+PoolKey = t.Tuple[type, bytes]
+
+
+class ComponentPool:
+    """Models instances shared between every api loaded with the pool.
+
+    Instances are keyed by model and content hash: a component (or any
+    object) with the same content in several apis is validated once and
+    shared. The pool only keeps weak references, an instance is released
+    as soon as no loaded api uses it anymore.
+
+    Shared instances must be considered read only.
+    """
+
+    # pool used by the current load, see activate
+    active: t.ClassVar[
+        t.Optional[t.Tuple["ComponentPool", hashing.MerkleHasher]]
+    ] = None
+
+    def __init__(self) -> None:
+        self.instances: "weakref.WeakValueDictionary[PoolKey, pydantic.BaseModel]"
+        self.instances = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    @contextlib.contextmanager
+    def activate(
+        self,
+        *,
+        raw_api: t.Dict[str, t.Any],
+    ) -> t.Iterator["ComponentPool"]:
+        previous = ComponentPool.active
+        ComponentPool.active = (self, hashing.MerkleHasher(raw_api))
+        try:
+            yield self
+        finally:
+            ComponentPool.active = previous
+
+    def get_or_create(
+        self,
+        model: t.Type[Model],
+        key: bytes,
+        values: t.Dict[str, t.Any],
+        factory: t.Callable[[t.Dict[str, t.Any]], Model],
+    ) -> Model:
+        instance = self.instances.get((model, key))
+        if instance is not None:
+            self.hits += 1
+            return instance  # type: ignore
+
+        instance = factory(values)
+        self.misses += 1
+        self.instances[(model, key)] = instance
+        return instance  # type: ignore
+
+
+class SourceSharing:
+    """Models instances shared by the places of a same source object.
+
+    yaml aliases are loaded as a single object used at several places of
+    the document: it is validated once (for a given model) and the
+    instance is used at every place. Only active during a load.
+
+    Shared instances must be considered read only.
+    """
+
+    # sharing used by the current load, see activate
+    active: t.ClassVar[t.Optional["SourceSharing"]] = None
+
+    def __init__(self) -> None:
+        # (model, id of the source) -> (source, instance): sources are kept
+        # alive, their ids can not be reused during the load
+        self.instances: t.Dict[t.Tuple[type, int], t.Tuple[t.Any, t.Any]] = {}
+        self.hits = 0
+
+    @contextlib.contextmanager
+    def activate(self) -> t.Iterator["SourceSharing"]:
+        previous = SourceSharing.active
+        SourceSharing.active = self
+        try:
+            yield self
+        finally:
+            SourceSharing.active = previous
+
+    def get_or_create(
+        self,
+        model: t.Type[Model],
+        values: t.Any,
+        factory: t.Callable[[t.Any], Model],
+    ) -> Model:
+        shared = self.instances.get((model, id(values)))
+        if shared is not None:
+            self.hits += 1
+            return shared[1]  # type: ignore
+
+        instance = factory(values)
+        self.instances[(model, id(values))] = (values, instance)
+        return instance
+
+
+def _pooled(
+    model: t.Type[Model],
+    values: t.Dict[str, t.Any],
+    factory: t.Callable[[t.Any], Model],
+) -> Model:
+    active = ComponentPool.active
+    if active is None:
+        return factory(values)
+
+    pool, hasher = active
+    return pool.get_or_create(model, hasher.hash(values), values, factory)
+
+
+def pooled(
+    model: t.Type[Model],
+    values: t.Any,
+    factory: t.Callable[[t.Any], Model],
+) -> Model:
+    if not isinstance(values, dict):
+        return factory(values)
+
+    sharing = SourceSharing.active
+    if sharing is None:
+        return _pooled(model, values, factory)
+    return sharing.get_or_create(
+        model,
+        values,
+        lambda values_: _pooled(model, values_, factory),
+    )
@@ -0,0 +1,259 @@
+import typing as t
+
+from openapydantic import common
+from openapydantic import pointer
+from openapydantic.compat import pydantic
+
+# structural checks run on the raw document before the references
+# resolution and the models validation: they only look at what the models
+# require (top-level keys, shape of paths and components, local references)
+
+REQUIRED_KEYS = ("openapi", "info", "paths")
+INFO_REQUIRED_KEYS = ("title", "version")
+COMPONENT_TYPES = tuple(component_type.value for component_type in common.ComponentType)
+Location = t.Tuple[t.Union[str, int], ...]
+
+_JSON_TYPES = (
+    (bool, "boolean"),
+    (dict, "object"),
+    (list, "array"),
+    (str, "string"),
+    ((int, float), "number"),
+    (type(None), "null"),
+)
+
+
+class Issue(pydantic.BaseModel):
+    location: str  # json pointer, e.g: "#/paths/~1pets/get/responses"
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}"
+
+
+class PrecheckError(ValueError):
+    def __init__(
+        self,
+        issues: t.List[Issue],
+    ) -> None:
+        self.issues = issues
+        super().__init__(
+            "\n".join(
+                [f"{len(issues)} structural error(s)", *map(str, issues)],
+            ),
+        )
+
+
+class _ErrorBudgetExhausted(Exception):
+    pass
+
+
+def _json_type(
+    value: t.Any,
+) -> str:
+    for types, name in _JSON_TYPES:
+        if isinstance(value, types):  # type: ignore
+            return name
+    return type(value).__name__
+
+
+class _Checker:
+    def __init__(
+        self,
+        raw_api: t.Any,
+        *,
+        max_errors: t.Optional[int],
+    ) -> None:
+        self.raw_api = raw_api
+        self.max_errors = max_errors
+        self.issues: t.List[Issue] = []
+        self.targets: t.Dict[str, t.Optional[str]] = {}
+
+    def add(
+        self,
+        location: Location,
+        message: str,
+    ) -> None:
+        self.issues.append(Issue(location=pointer.build(location), message=message))
+        if self.max_errors is not None and len(self.issues) >= self.max_errors:
+            raise _ErrorBudgetExhausted()
+
+    def expect(
+        self,
+        value: t.Any,
+        location: Location,
+        expected: t.Type[t.Any],
+    ) -> bool:
+        if isinstance(value, expected):
+            return True
+        self.add(
+            location,
+            f"expected {_json_type(expected())}, got {_json_type(value)}",
+        )
+        return False
+
+    def require(
+        self,
+        value: t.Dict[str, t.Any],
+        location: Location,
+        keys: t.Iterable[str],
+    ) -> None:
+        for key in keys:
+            if key not in value:
+                self.add(location, f"missing required key:{key}")
+
+    def check_parameters(
+        self,
+        parameters: t.Any,
+        location: Location,
+    ) -> None:
+        if not self.expect(parameters, location, list):
+            return
+        for index, parameter in enumerate(parameters):
+            if self.expect(parameter, (*location, index), dict):
+                if "$ref" not in parameter:
+                    self.require(parameter, (*location, index), ("name", "in"))
+
+    def check_responses(
+        self,
+        responses: t.Any,
+        location: Location,
+    ) -> None:
+        if not self.expect(responses, location, dict):
+            return
+        for status, response in responses.items():
+            if self.expect(response, (*location, status), dict):
+                if "$ref" not in response:
+                    self.require(response, (*location, status), ("description",))
+
+    def check_operation(
+        self,
+        operation: t.Any,
+        location: Location,
+    ) -> None:
+        if not self.expect(operation, location, dict):
+            return
+        self.require(operation, location, ("responses",))
+        if "responses" in operation:
+            self.check_responses(operation["responses"], (*location, "responses"))
+        if operation.get("parameters") is not None:
+            self.check_parameters(operation["parameters"], (*location, "parameters"))
+
+    def check_path_item(
+        self,
+        path_item: t.Any,
+        location: Location,
+    ) -> None:
+        if not self.expect(path_item, location, dict) or "$ref" in path_item:
+            return
+        for method in common.HTTP_METHODS:
+            if method in path_item:
+                self.check_operation(path_item[method], (*location, method))
+        if path_item.get("parameters") is not None:
+            self.check_parameters(path_item["parameters"], (*location, "parameters"))
+
+    def check_root(self) -> None:
+        if not self.expect(self.raw_api, (), dict):
+            return
+        self.require(self.raw_api, (), REQUIRED_KEYS)
+        info = self.raw_api.get("info")
+        if info is not None and self.expect(info, ("info",), dict):
+            self.require(info, ("info",), INFO_REQUIRED_KEYS)
+
+        paths = self.raw_api.get("paths")
+        if paths is not None and self.expect(paths, ("paths",), dict):
+            for path, path_item in paths.items():
+                self.check_path_item(path_item, ("paths", path))
+
+        components = self.raw_api.get("components")
+        if components is not None and self.expect(components, ("components",), dict):
+            for component_type in COMPONENT_TYPES:
+                values = components.get(component_type)
+                location = ("components", component_type)
+                if values is not None and self.expect(values, location, dict):
+                    for key, value in values.items():
+                        self.expect(value, (*location, key), dict)
+
+    def check_reference(
+        self,
+        ref: t.Any,
+        location: Location,
+    ) -> None:
+        if not isinstance(ref, str):
+            self.add(location, f"$ref must be a string, got {_json_type(ref)}")
+            return
+        if not ref.startswith("#"):
+            return  # external references are checked when they are loaded
+        if ref not in self.targets:
+            try:
+                pointer.resolve(self.raw_api, ref)
+                self.targets[ref] = None
+            except pointer.JsonPointerError as error:
+                self.targets[ref] = f"unresolvable reference {ref} ({error})"
+        error = self.targets[ref]
+        if error is not None:
+            self.add(location, error)
+
+    def check_references(self) -> None:
+        # depth first, in document order, containers shared by yaml aliases
+        # once
+        visited: t.Set[int] = set()
+        stack: t.List[t.Tuple[t.Any, Location]] = [(self.raw_api, ())]
+        while stack:
+            node, location = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            if isinstance(node, dict):
+                if "$ref" in node:
+                    self.check_reference(node["$ref"], (*location, "$ref"))
+                children = node.items()
+            elif isinstance(node, list):
+                children = enumerate(node)  # type: ignore
+            else:
+                continue
+            stack.extend(
+                reversed(
+                    [
+                        (value, (*location, key))
+                        for key, value in children
+                        if isinstance(value, (dict, list))
+                    ],
+                ),
+            )
+
+    def run(self) -> t.List[Issue]:
+        try:
+            self.check_root()
+            if isinstance(self.raw_api, dict):
+                self.check_references()
+        except _ErrorBudgetExhausted:
+            pass
+        return self.issues
+
+
+def find_issues(
+    raw_api: t.Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: t.Optional[int] = None,
+) -> t.List[Issue]:
+    """Structural errors of a raw specification, with their json location.
+
+    The check stops at the first error with fail_fast, at the max_errors-th
+    one with max_errors.
+    """
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("max_errors must be positive")
+    return _Checker(raw_api, max_errors=1 if fail_fast else max_errors).run()
+
+
+def check(
+    raw_api: t.Any,
+    *,
+    fail_fast: bool = False,
+    max_errors: t.Optional[int] = None,
+) -> None:
+    issues = find_issues(raw_api, fail_fast=fail_fast, max_errors=max_errors)
+    if issues:
+        raise PrecheckError(issues)
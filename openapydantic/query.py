@@ -0,0 +1,176 @@
+import functools
+import re
+import typing as t
+
+CACHE_SIZE = 4096
+
+# simple expressions ($ followed by keys, wildcards, indexes and descendants,
+# e.g. "$.paths.*.*.responses['200']" or "$..operationId") are evaluated by
+# walking the document, other ones by jsonpath_ng. Both give the same results.
+_ROOT = "$"
+_STEP = re.compile(
+    r"""
+    \.(?P<name>[A-Za-z0-9_@-]+)
+    | \.(?P<quote>['"])(?P<quoted>[^'"\\]*)(?P=quote)
+    | \[(?P<bracket_quote>['"])(?P<bracket_quoted>[^'"\\]*)(?P=bracket_quote)\]
+    | (?P<values>\.\*)
+    | (?P<items>\[\*\])
+    | \[(?P<index>-?\d+)\]
+    """,
+    re.VERBOSE,
+)
+
+Step = t.Tuple[str, t.Any]
+
+
+def _key(
+    node: t.Any,
+    key: str,
+) -> t.List[t.Any]:
+    if isinstance(node, dict) and key in node:
+        return [node[key]]
+    return []
+
+
+def _values(
+    node: t.Any,
+    _: t.Any,
+) -> t.List[t.Any]:
+    return list(node.values()) if isinstance(node, dict) else []
+
+
+def _items(
+    node: t.Any,
+    _: t.Any,
+) -> t.List[t.Any]:
+    # like jsonpath_ng: other values than lists are a list of one element
+    if isinstance(node, list):
+        return node
+    return [] if node is None else [node]
+
+
+def _index(
+    node: t.Any,
+    index: int,
+) -> t.List[t.Any]:
+    if isinstance(node, (list, str)) and -len(node) <= index < len(node):
+        return [node[index]]
+    return []
+
+
+def _descendants(
+    node: t.Any,
+    step: Step,
+) -> t.List[t.Any]:
+    # like jsonpath_ng: the step is applied to the node, then to its children
+    # (depth first, in document order)
+    kind, argument = step
+    evaluate = _EVALUATORS[kind]
+    found: t.List[t.Any] = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        found.extend(evaluate(node, argument))
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return found
+
+
+_EVALUATORS: t.Dict[str, t.Callable[[t.Any, t.Any], t.List[t.Any]]] = {
+    "key": _key,
+    "values": _values,
+    "items": _items,
+    "index": _index,
+    "descendants": _descendants,
+}
+
+
+def _parse_step(
+    match: t.Match[str],
+) -> Step:
+    groups = match.groupdict()
+    if groups["name"] is not None:
+        return "key", groups["name"]
+    if groups["quoted"] is not None:
+        return "key", groups["quoted"]
+    if groups["bracket_quoted"] is not None:
+        return "key", groups["bracket_quoted"]
+    if groups["index"] is not None:
+        return "index", int(groups["index"])
+    if groups["values"] is not None:
+        return "values", None
+    return "items", None
+
+
+def parse_simple(
+    expression: str,
+) -> t.Optional[t.Tuple[Step, ...]]:
+    # steps of a simple expression, None for other expressions
+    expression = expression.strip()
+    if not expression.startswith(_ROOT):
+        return None
+    steps = []
+    position = len(_ROOT)
+    while position < len(expression):
+        descendants = expression.startswith("..", position)
+        if descendants:
+            # "..name" / "..*" / "..['name']" / "..[*]" / "..[0]"
+            position += 2 if expression.startswith("[", position + 2) else 1
+        match = _STEP.match(expression, position)
+        if match is None:
+            return None
+        step = _parse_step(match)
+        steps.append(("descendants", step) if descendants else step)
+        position = match.end()
+    return tuple(steps)
+
+
+class Query:
+    def __init__(
+        self,
+        expression: str,
+    ) -> None:
+        self.expression = expression
+        self.steps = parse_simple(expression)
+        self._jsonpath: t.Any = None
+        if self.steps is None:
+            import jsonpath_ng  # type:ignore
+
+            self._jsonpath = jsonpath_ng.parse(expression)
+
+    @property
+    def is_simple(self) -> bool:
+        return self.steps is not None
+
+    def find(
+        self,
+        document: t.Any,
+    ) -> t.List[t.Any]:
+        if self.steps is None:
+            return [match.value for match in self._jsonpath.find(document)]
+
+        nodes = [document]
+        for kind, argument in self.steps:
+            evaluate = _EVALUATORS[kind]
+            found: t.List[t.Any] = []
+            for node in nodes:
+                found.extend(evaluate(node, argument))
+            nodes = found
+        return nodes
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_query(
+    expression: str,
+) -> Query:
+    return Query(expression)
+
+
+def query(
+    document: t.Any,
+    expression: str,
+) -> t.List[t.Any]:
+    """Values matching a jsonpath expression. Compiled expressions are cached."""
+    return compile_query(expression).find(document)
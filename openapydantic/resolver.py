@@ -1,45 +1,161 @@
-import copy
+import functools
+import pathlib
+import re
 import typing as t
-
-import jsonpath_ng  # type:ignore
+import urllib.parse
 
 from openapydantic import common
-from openapydantic import versions
+from openapydantic import loaders as loaders_
+from openapydantic import pointer
 
 ComponentType = common.ComponentType
 OpenApiVersion = common.OpenApiVersion
-get_component_object_proxy = versions.get_component_object_proxy
+
+
+@functools.lru_cache(maxsize=pointer.CACHE_SIZE)
+def parse_ref(
+    ref: str,
+) -> t.Tuple[ComponentType, str, pointer.Tokens]:
+    # "#/components/schemas/Pet/properties/id"
+    # -> (ComponentType.schemas, "Pet", ("properties", "id"))
+    try:
+        tokens = pointer.parse(ref)
+        if len(tokens) < 3 or tokens[0] != "components":
+            raise ValueError(ref)
+        return ComponentType(tokens[1]), tokens[2], tokens[3:]
+    except ValueError as exc:
+        raise ValueError("Invalid reference format") from exc
+
+
+def is_document_ref(
+    ref: str,
+) -> bool:
+    # local reference to a location outside of the components
+    # ("#/paths/~1pets/get/parameters/0"), resolved against the raw api
+    return ref.startswith("#/") and not ref.startswith("#/components/")
 
 
 def get_ref_data(
     *,
     ref: str,
 ) -> t.Tuple[ComponentType, str]:
-    ref_type = None
-    ref_key = None
-    try:
-        ref_split = ref.split("/")  # format #/components/schemas/Pet
-        ref_type = ComponentType(ref_split[2])
-        ref_key = ref_split[-1]
-    except Exception as exc:
-        raise ValueError("Invalid reference format") from exc
+    ref_type, ref_key, _ = parse_ref(ref)
     return ref_type, ref_key
 
 
+def get_ref_component(
+    *,
+    ref: str,
+) -> str:
+    # reference of the component containing the target of a reference
+    ref_type, ref_key, _ = parse_ref(ref)
+    return get_component_ref(component_type=ref_type, key=ref_key)
+
+
 def validate_references_format(
     references: t.List[str],
 ) -> None:
     for ref in references:
         if ".yaml" in ref or ".json" in ref:
-            raise NotImplementedError("File reference not implemented")
+            # external references are brought into the document by the
+            # ExternalReferencesResolver before the components resolution
+            raise NotImplementedError("File reference not resolved")
         if not ref.startswith("#/"):
             raise ValueError(f"reference {ref} has invalid format")
 
 
+def get_component_ref(
+    *,
+    component_type: ComponentType,
+    key: str,
+) -> str:
+    return pointer.build(("components", component_type.value, key))
+
+
+class _Tarjan:
+    def __init__(
+        self,
+        graph: t.Mapping[str, t.Iterable[str]],
+    ) -> None:
+        self.graph = graph
+        self.index: t.Dict[str, int] = {}
+        self.lowlink: t.Dict[str, int] = {}
+        self.stack: t.List[str] = []
+        self.on_stack: t.Set[str] = set()
+        self.result: t.List[t.List[str]] = []
+
+    def _visit(
+        self,
+        node: str,
+    ) -> t.Tuple[str, t.Iterator[str]]:
+        self.index[node] = self.lowlink[node] = len(self.index)
+        self.stack.append(node)
+        self.on_stack.add(node)
+        return node, iter(self.graph.get(node, ()))
+
+    def _pop_component(
+        self,
+        node: str,
+    ) -> None:
+        component: t.List[str] = []
+        while True:
+            member = self.stack.pop()
+            self.on_stack.discard(member)
+            component.append(member)
+            if member == node:
+                break
+        self.result.append(component)
+
+    def _finish(
+        self,
+        work: t.List[t.Tuple[str, t.Iterator[str]]],
+    ) -> None:
+        node, _ = work.pop()
+        if work:
+            parent = work[-1][0]
+            self.lowlink[parent] = min(self.lowlink[parent], self.lowlink[node])
+        if self.lowlink[node] == self.index[node]:
+            self._pop_component(node)
+
+    def _walk(
+        self,
+        root: str,
+    ) -> None:
+        # iterative depth first search, specs can be deeper than the
+        # recursion limit
+        work = [self._visit(root)]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in self.index:
+                    work.append(self._visit(child))
+                    break
+                if child in self.on_stack:
+                    self.lowlink[node] = min(self.lowlink[node], self.index[child])
+            else:
+                self._finish(work)
+
+    def run(self) -> t.List[t.List[str]]:
+        for root in self.graph:
+            if root not in self.index:
+                self._walk(root)
+        return self.result
+
+
+def strongly_connected_components(
+    graph: t.Mapping[str, t.Iterable[str]],
+) -> t.List[t.List[str]]:
+    # tarjan algorithm: components are returned in reverse topological
+    # order, i.e dependencies first
+    return _Tarjan(graph).run()
+
+
 def find_ref(
     *,
     obj: t.Any,
 ) -> t.List[str]:
+    import jsonpath_ng  # type:ignore
+
     jsonpath_expr = jsonpath_ng.parse(  # type:ignore
         "$..'$ref'",
     )
@@ -53,7 +169,13 @@ class ComponentsResolver:
     without_ref: t.Dict[str, t.Any] = {}
     ref_find = False
     consolidate_count = 0
-    self_ref: t.List[str] = []
+    # references which are not interpolated: every component member of a
+    # reference cycle (self reference or mutual references)
+    self_ref: t.Set[str] = set()
+    # component reference -> references found in the component
+    reference_graph: t.Dict[str, t.List[str]] = {}
+    components_order: t.List[str] = []
+    raw_api: t.Dict[str, t.Any] = {}
 
     @classmethod
     def init(cls):
@@ -61,11 +183,13 @@ class ComponentsResolver:
         cls.without_ref = {}
         cls.ref_find = False
         cls.consolidate_count = 0
+        cls.reference_graph = {}
+        cls.components_order = []
 
         for elt in ComponentType:
             cls.with_ref[elt.name] = {}
             cls.without_ref[elt.name] = {}
-            cls.self_ref = []
+            cls.self_ref = set()
 
     @classmethod
     def _list_self_references(
@@ -76,13 +200,15 @@ class ComponentsResolver:
         references: t.List[str],
     ) -> None:
         for ref in references:
+            if is_document_ref(ref):
+                continue
 
             ref_type, ref_key = get_ref_data(
                 ref=ref,
             )
 
             if ref_type == component_type and ref_key == key:
-                cls.self_ref.append(ref)
+                cls.self_ref.add(get_component_ref(component_type=ref_type, key=key))
 
     @classmethod
     def _search_component_for_ref(
@@ -135,85 +261,131 @@ class ComponentsResolver:
         values: t.Dict[str, t.Any],
         version: OpenApiVersion,
     ) -> t.Dict[str, t.Any]:
-        if version == OpenApiVersion.v3_0_2:
-            return get_component_object_proxy(
-                component_type=component_type,
-                values=values,
-                version=version,
-            )
-        raise NotImplementedError()
+        from openapydantic import versions  # versions imports the resolver
+
+        return versions.get_component_object_proxy(
+            component_type=component_type,
+            values=values,
+            version=version,
+        )
 
     @classmethod
     def _check_references_availables(
         cls,
         *,
         references: t.List[str],
-        component_type: ComponentType,
-        key: str,
-    ) -> bool:
-
+    ) -> None:
         for ref in references:
+            if cls.is_self_reference(ref):
+                continue
+            if is_document_ref(ref):
+                pointer.resolve(cls.raw_api, ref)
+                continue
+
             ref_type, ref_key = get_ref_data(
                 ref=ref,
             )
 
-            if ref_type == component_type and key == ref_key:
-                continue
+            if ref_key not in cls.without_ref[ref_type.name]:
+                raise ValueError(f"Reference not found:{ref_type}/{ref_key}")
 
-            if not cls.without_ref[ref_type.name].get(ref_key):
-                # print(f"ref unavailable: {ref}")
-                return False
-            # print(f"ref available: {ref}")
-        return True
+    @classmethod
+    def is_self_reference(
+        cls,
+        ref: str,
+    ) -> bool:
+        # reference to (or inside) a component member of a reference cycle
+        if is_document_ref(ref):
+            return False
+        return get_ref_component(ref=ref) in cls.self_ref
 
     @classmethod
-    def _consolidate_components(
+    def _ref_components(
+        cls,
+        ref: str,
+    ) -> t.Set[str]:
+        # components a reference depends on: the components referenced by
+        # the target of a reference outside of the components
+        if not is_document_ref(ref):
+            return {get_ref_component(ref=ref)}
+        return {
+            get_ref_component(ref=target)
+            for target in iter_references(pointer.resolve(cls.raw_api, ref))
+            if split_component_ref(target)
+        }
+
+    @classmethod
+    def _build_reference_graph(cls) -> t.Dict[str, t.List[str]]:
+        graph: t.Dict[str, t.List[str]] = {}
+        for elt in ComponentType:
+            for key, values in cls.with_ref[elt.name].items():
+                graph[get_component_ref(component_type=elt, key=key)] = sorted(
+                    set().union(
+                        *(cls._ref_components(ref) for ref in values["references"]),
+                    ),
+                )
+        return graph
+
+    @classmethod
+    def _order_components(cls) -> None:
+        # components are consolidated in dependency order, so that every
+        # reference is available when a component is validated. Members of a
+        # reference cycle are kept as references (shared back-references)
+        # instead of being expanded endlessly.
+        cls.reference_graph = cls._build_reference_graph()
+        cls.components_order = []
+
+        for scc in strongly_connected_components(cls.reference_graph):
+            if len(scc) > 1 or scc[0] in cls.reference_graph.get(scc[0], ()):
+                cls.self_ref.update(scc)
+            cls.components_order.extend(scc)
+
+    @classmethod
+    def _consolidate_component(
         cls,
         *,
-        component_type: ComponentType,
+        ref: str,
         version: OpenApiVersion,
     ) -> None:
-        cls.consolidate_count = cls.consolidate_count + 1
-        component_dict = {}
-        with_ref_copy = copy.deepcopy(cls.with_ref[component_type.name])
-
-        for key, values in with_ref_copy.items():
-            references = values["references"]
-
-            # print(f"Trying to create {component_type.name}:{key}")
-            # if not all references are availables
-            if not cls._check_references_availables(
-                references=references,
-                key=key,
-                component_type=component_type,
-            ):
-                # print(f"Not all references ready for:{component_type.name}:{key}")
-                # print("next...")
-                continue
+        component_type, key = get_ref_data(
+            ref=ref,
+        )
+        values = cls.with_ref[component_type.name].get(key)
+        if values is None:  # missing or without reference
+            return
 
-            component_dict = cls._get_component_object(
-                component_type=component_type,
-                values=values["values"],
-                version=version,
-            )
+        cls._check_references_availables(
+            references=values["references"],
+        )
 
-            cls.without_ref[component_type.name][key] = component_dict
-            del cls.with_ref[component_type.name][key]
+        cls.without_ref[component_type.name][key] = cls._get_component_object(
+            component_type=component_type,
+            values=values["values"],
+            version=version,
+        )
+        del cls.with_ref[component_type.name][key]
+        cls.consolidate_count = cls.consolidate_count + 1
 
-        if len(cls.with_ref[component_type.name]):
-            cls._consolidate_components(
-                component_type=component_type,
+    @classmethod
+    def _consolidate_components(
+        cls,
+        *,
+        version: OpenApiVersion,
+    ) -> None:
+        for ref in cls.components_order:
+            cls._consolidate_component(
+                ref=ref,
                 version=version,
             )
 
     @classmethod
-    def resolve(
+    def index(
         cls,
         *,
         raw_api: t.Dict[str, t.Any],
-        version: OpenApiVersion,
     ) -> None:
         cls.init()
+        cls.raw_api = raw_api
 
         components = raw_api.get("components")
         if not components:
@@ -228,14 +400,567 @@ class ComponentsResolver:
                     component_type=elt,
                 )
 
-        for elt in ComponentType:
-            component = components.get(elt.value)
-            if component:
-                cls._consolidate_components(
-                    component_type=elt,
-                    version=version,
+        cls._order_components()
+
+    @classmethod
+    def resolve(
+        cls,
+        *,
+        raw_api: t.Dict[str, t.Any],
+        version: OpenApiVersion,
+    ) -> None:
+        cls.index(
+            raw_api=raw_api,
+        )
+
+        cls._consolidate_components(
+            version=version,
+        )
+
+
+COMPONENT_NAME_FORBIDDEN_CHARS = re.compile(r"[^a-zA-Z0-9\.\-_]")
+SCHEMA_KEYS = {"schema", "items", "additionalProperties", "not"}
+SCHEMA_CONTAINERS = {"properties", "allOf", "anyOf", "oneOf"}
+COMPONENT_CONTAINERS = {
+    "responses": ComponentType.responses,
+    "parameters": ComponentType.parameters,
+    "headers": ComponentType.headers,
+    "examples": ComponentType.examples,
+    "links": ComponentType.links,
+    "callbacks": ComponentType.callbacks,
+}
+Location = t.Tuple[t.Union[str, int], ...]
+
+
+def is_external_ref(
+    ref: str,
+) -> bool:
+    return not ref.startswith("#")
+
+
+def iter_references(
+    obj: t.Any,
+) -> t.Iterator[str]:
+    # containers shared by yaml aliases are walked once
+    visited: t.Set[int] = set()
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, (dict, list)):
+            if id(current) in visited:
+                continue
+            visited.add(id(current))
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def infer_component_type(
+    location: Location,
+) -> t.Optional[ComponentType]:
+    # component type expected at a location of the document, used to lift
+    # external references which do not point to a component. None where
+    # there is no component slot (e.g. a path item)
+    if len(location) >= 3 and location[-3] == "components":
+        try:
+            return ComponentType(location[-2])
+        except ValueError:
+            pass
+
+    last = location[-1] if location else None
+    parent = location[-2] if len(location) >= 2 else None
+
+    if last in SCHEMA_KEYS or parent in SCHEMA_CONTAINERS:
+        return ComponentType.schemas
+    if last == "requestBody":
+        return ComponentType.request_bodies
+    if isinstance(parent, str) and parent in COMPONENT_CONTAINERS:
+        return COMPONENT_CONTAINERS[parent]
+    return None
+
+
+def split_component_ref(
+    ref: str,
+) -> t.Optional[t.Tuple[str, str]]:
+    # "#/components/schemas/Pet/properties/id" -> ("schemas", "Pet")
+    if not ref.startswith("#/components/"):
+        return None
+    try:
+        tokens = pointer.parse(ref)
+    except pointer.JsonPointerError:
+        return None
+    if len(tokens) < 3:
+        return None
+    return tokens[1], tokens[2]
+
+
+def build_reference_graph(
+    raw_api: t.Dict[str, t.Any],
+) -> t.Dict[str, t.Set[str]]:
+    # component reference -> components references it depends on
+    graph: t.Dict[str, t.Set[str]] = {}
+    for component_type, values in (raw_api.get("components") or {}).items():
+        for key, value in (values or {}).items():
+            dependencies = set()
+            for ref in iter_references(value):
+                target = split_component_ref(ref)
+                if target:
+                    dependencies.add(pointer.build(("components",) + target))
+            graph[pointer.build(("components", component_type, key))] = dependencies
+    return graph
+
+
+def reachable_components(
+    *,
+    graph: t.Mapping[str, t.Iterable[str]],
+    roots: t.Iterable[str],
+) -> t.Set[str]:
+    result: t.Set[str] = set()
+    stack = list(roots)
+    while stack:
+        ref = stack.pop()
+        if ref in result:
+            continue
+        result.add(ref)
+        stack.extend(graph.get(ref, ()))
+    return result
+
+
+def referenced_components(
+    *,
+    raw_api: t.Dict[str, t.Any],
+    obj: t.Any,
+) -> t.Set[str]:
+    # components referenced by obj, directly or not: only the reached
+    # components are walked
+    components = raw_api.get("components") or {}
+    result: t.Set[str] = set()
+    stack = list(iter_references(obj))
+    while stack:
+        target = split_component_ref(stack.pop())
+        if not target:
+            continue
+        ref = pointer.build(("components",) + target)
+        if ref in result:
+            continue
+        result.add(ref)
+        component_type, key = target
+        value = (components.get(component_type) or {}).get(key)
+        stack.extend(iter_references(value))
+    return result
+
+
+def cyclic_components(
+    graph: t.Mapping[str, t.Iterable[str]],
+) -> t.Set[str]:
+    result: t.Set[str] = set()
+    for scc in strongly_connected_components(graph):
+        if len(scc) > 1 or scc[0] in graph.get(scc[0], ()):
+            result.update(scc)
+    return result
+
+
+class ReferenceTargets:
+    """Targets of the local references of a raw api.
+
+    Used for the reference interpolation of the pydantic v2 backend: a
+    reference is replaced by its raw target (nested references are
+    interpolated when the target is validated). Like the ComponentsResolver,
+    references to members of a reference cycle are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        raw_api: t.Dict[str, t.Any],
+    ) -> None:
+        self.raw_api = raw_api
+        self.components: t.Dict[str, t.Any] = raw_api.get("components") or {}
+        self.kept = cyclic_components(build_reference_graph(raw_api))
+        # reference -> target
+        self.targets: t.Dict[str, t.Any] = {}
+
+    def resolve(
+        self,
+        node: t.Dict[str, t.Any],
+    ) -> t.Any:
+        ref = node["$ref"]
+        if not isinstance(ref, str):
+            return node
+        if ref not in self.targets:
+            self.targets[ref] = self._resolve_ref(node)
+        return self.targets[ref]
+
+    def _resolve_ref(
+        self,
+        node: t.Dict[str, t.Any],
+    ) -> t.Any:
+        # follow references to references
+        followed: t.Set[str] = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in followed:
+                raise ValueError(f"Reference cycle:{ref}")
+            followed.add(ref)
+            if is_document_ref(ref):
+                node = pointer.resolve(self.raw_api, ref)
+                continue
+            ref_type, ref_key, ref_path = parse_ref(ref)
+            if get_component_ref(component_type=ref_type, key=ref_key) in self.kept:
+                return node
+
+            component = self.components.get(ref_type.value) or {}
+            if not component.get(ref_key):
+                raise ValueError(f"Reference not found:{ref_type}/{ref_key}")
+            node = pointer.resolve(component[ref_key], ref_path)
+        return node
+
+
+def resolve_fragment(
+    document: t.Any,
+    fragment: str,
+) -> t.Any:
+    return pointer.resolve(document, f"#{fragment}")
+
+
+class ExternalReferencesResolver:
+    """Bring external references ("other.yaml#/Pet") into the document.
+
+    Referenced documents are loaded concurrently (once per load) through
+    the document loaders. Every external target is lifted into the
+    components of the root document and its references rewritten to
+    "#/components/<type>/<name>": from there, the ComponentsResolver
+    handles them like any other component (including reference cycles
+    between documents). Targets referenced where there is no component
+    slot (e.g. split path items) are inlined instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_uri: str,
+        loaders: t.Optional[t.Mapping[str, loaders_.DocumentLoader]] = None,
+    ) -> None:
+        self.base_uri = base_uri
+        self.cache = loaders_.DocumentCache(loaders=loaders)
+        self.lifted: t.Dict[t.Tuple[str, str], str] = {}
+        self.components: t.Dict[str, t.Dict[str, t.Any]] = {}
+        self.cycles: t.List[t.List[str]] = []
+        self._names: t.Set[t.Tuple[str, str]] = set()
+        self._in_progress: t.List[t.Tuple[str, str]] = []
+        self._inlining: t.List[t.Tuple[str, str]] = []
+        # (id of a source object, document) -> rewritten object
+        self._rewritten: t.Dict[t.Tuple[int, str], t.Any] = {}
+
+    def _split(
+        self,
+        *,
+        document_uri: str,
+        ref: str,
+    ) -> t.Tuple[str, str]:
+        target_uri, fragment = urllib.parse.urldefrag(
+            loaders_.join_uri(document_uri, ref),
+        )
+        return target_uri, fragment
+
+    def _external_documents(
+        self,
+        document_uri: str,
+    ) -> t.Set[str]:
+        result = set()
+        for ref in iter_references(self.cache.documents[document_uri]):
+            if is_external_ref(ref):
+                target_uri, _ = self._split(document_uri=document_uri, ref=ref)
+                result.add(target_uri)
+        return result
+
+    async def _load_documents(self) -> None:
+        frontier = {self.base_uri}
+        while frontier:
+            new_documents: t.Set[str] = set()
+            for document_uri in frontier:
+                new_documents.update(self._external_documents(document_uri))
+            new_documents.difference_update(self.cache.documents)
+            await self.cache.get_many(new_documents)
+            frontier = new_documents
+
+    def _reserve_name(
+        self,
+        *,
+        component_type: ComponentType,
+        target_uri: str,
+        fragment: str,
+    ) -> str:
+        tokens = pointer.parse(f"#{fragment}")
+        if tokens:
+            base_name = tokens[-1]
+        else:
+            base_name = pathlib.PurePosixPath(
+                urllib.parse.urlparse(target_uri).path,
+            ).stem
+        base_name = COMPONENT_NAME_FORBIDDEN_CHARS.sub("_", base_name)
+
+        name = base_name
+        index = 1
+        while (component_type.value, name) in self._names:
+            index = index + 1
+            name = f"{base_name}_{index}"
+        self._names.add((component_type.value, name))
+        return name
+
+    def _target(
+        self,
+        *,
+        target_uri: str,
+        fragment: str,
+    ) -> t.Any:
+        try:
+            return resolve_fragment(self.cache.documents[target_uri], fragment)
+        except (KeyError, IndexError, ValueError, TypeError) as exc:
+            raise ValueError(f"Reference not found:{target_uri}#{fragment}") from exc
+
+    def _component_type(
+        self,
+        *,
+        fragment: str,
+        location: Location,
+    ) -> t.Optional[ComponentType]:
+        tokens = pointer.parse(f"#{fragment}")
+        if len(tokens) == 3 and tokens[0] == "components":
+            return ComponentType(tokens[1])
+        return infer_component_type(location)
+
+    def _lift(
+        self,
+        *,
+        target_uri: str,
+        fragment: str,
+        location: Location,
+    ) -> str:
+        key = (target_uri, fragment)
+        if key in self.lifted:
+            if key in self._in_progress:
+                start = self._in_progress.index(key)
+                self.cycles.append(
+                    [self.lifted[elt] for elt in self._in_progress[start:]],
                 )
-            # print(
-            #     f"Recursive consolidate count for component {elt.name}:"
-            #     f"{cls.consolidate_count}"
-            # )
+            return self.lifted[key]
+
+        component_type = self._component_type(fragment=fragment, location=location)
+        if component_type is None:
+            raise ValueError(f"No component for the reference:{target_uri}#{fragment}")
+
+        name = self._reserve_name(
+            component_type=component_type,
+            target_uri=target_uri,
+            fragment=fragment,
+        )
+        local_ref = get_component_ref(component_type=component_type, key=name)
+        self.lifted[key] = local_ref
+
+        target = self._target(target_uri=target_uri, fragment=fragment)
+        self._in_progress.append(key)
+        self.components.setdefault(component_type.value, {})[name] = self._rewrite(
+            obj=target,
+            document_uri=target_uri,
+            location=("components", component_type.value, name),
+        )
+        self._in_progress.pop()
+        return local_ref
+
+    def _rewrite_ref(
+        self,
+        *,
+        ref: str,
+        document_uri: str,
+        location: Location,
+    ) -> str:
+        if document_uri == self.base_uri and not is_external_ref(ref):
+            return ref
+
+        target_uri, fragment = self._split(document_uri=document_uri, ref=ref)
+        if target_uri == self.base_uri:
+            return f"#{fragment}"
+
+        return self._lift(
+            target_uri=target_uri,
+            fragment=fragment,
+            location=location,
+        )
+
+    def _inlined_target(
+        self,
+        *,
+        ref: str,
+        document_uri: str,
+        location: Location,
+    ) -> t.Optional[t.Tuple[str, str]]:
+        # external target of a reference without component slot
+        if document_uri == self.base_uri and not is_external_ref(ref):
+            return None
+        target_uri, fragment = self._split(document_uri=document_uri, ref=ref)
+        if target_uri == self.base_uri:
+            return None
+        if self._component_type(fragment=fragment, location=location):
+            return None
+        return target_uri, fragment
+
+    def _inline(
+        self,
+        *,
+        obj: t.Dict[str, t.Any],
+        document_uri: str,
+        target_uri: str,
+        fragment: str,
+        location: Location,
+    ) -> t.Any:
+        key = (target_uri, fragment)
+        if key in self._inlining:
+            raise ValueError(f"Reference cycle:{target_uri}#{fragment}")
+        self._inlining.append(key)
+        result = self._rewrite(
+            obj=self._target(target_uri=target_uri, fragment=fragment),
+            document_uri=target_uri,
+            location=location,
+        )
+        self._inlining.pop()
+
+        siblings = {name: value for name, value in obj.items() if name != "$ref"}
+        if siblings and isinstance(result, dict):
+            result = {
+                **result,
+                **self._rewrite_value(
+                    obj=siblings,
+                    document_uri=document_uri,
+                    location=location,
+                ),
+            }
+        return result
+
+    def _rewrite(
+        self,
+        *,
+        obj: t.Any,
+        document_uri: str,
+        location: Location,
+    ) -> t.Any:
+        # yaml aliases stay shared
+        key = (id(obj), document_uri)
+        if key in self._rewritten:
+            return self._rewritten[key]
+        result = self._rewrite_value(
+            obj=obj,
+            document_uri=document_uri,
+            location=location,
+        )
+        if isinstance(obj, (dict, list)):
+            self._rewritten[key] = result
+        return result
+
+    def _rewrite_value(
+        self,
+        *,
+        obj: t.Any,
+        document_uri: str,
+        location: Location,
+    ) -> t.Any:
+        if isinstance(obj, list):
+            return [
+                self._rewrite(
+                    obj=value,
+                    document_uri=document_uri,
+                    location=location + (index,),
+                )
+                for index, value in enumerate(obj)
+            ]
+        if not isinstance(obj, dict):
+            return obj
+
+        ref = obj.get("$ref")
+        inlined = isinstance(ref, str) and self._inlined_target(
+            ref=ref,
+            document_uri=document_uri,
+            location=location,
+        )
+        if inlined:
+            target_uri, fragment = inlined
+            return self._inline(
+                obj=obj,
+                document_uri=document_uri,
+                target_uri=target_uri,
+                fragment=fragment,
+                location=location,
+            )
+
+        result = {}
+        for key, value in obj.items():
+            if key == "$ref" and isinstance(value, str):
+                result[key] = self._rewrite_ref(
+                    ref=value,
+                    document_uri=document_uri,
+                    location=location,
+                )
+            else:
+                result[key] = self._rewrite(
+                    obj=value,
+                    document_uri=document_uri,
+                    location=location + (key,),
+                )
+        return result
+
+    def _merge_components(
+        self,
+        raw_api: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        components = dict(raw_api.get("components") or {})
+        for component_type, values in self.components.items():
+            components[component_type] = {
+                **(components.get(component_type) or {}),
+                **values,
+            }
+        return {**raw_api, "components": components}
+
+    async def resolve(
+        self,
+        *,
+        raw_api: t.Dict[str, t.Any],
+    ) -> t.Dict[str, t.Any]:
+        if not any(is_external_ref(ref) for ref in iter_references(raw_api)):
+            return raw_api
+
+        self.cache.add(self.base_uri, raw_api)
+        await self._load_documents()
+
+        # lifted components must not shadow names used by the root document
+        for component_type, values in (raw_api.get("components") or {}).items():
+            for name in values or {}:
+                self._names.add((component_type, name))
+        for ref in iter_references(raw_api):
+            target = split_component_ref(ref)
+            if target:
+                self._names.add(target)
+
+        rewritten = self._rewrite(
+            obj=raw_api,
+            document_uri=self.base_uri,
+            location=(),
+        )
+        return self._merge_components(rewritten)
+
+
+async def resolve_external_references(
+    *,
+    raw_api: t.Dict[str, t.Any],
+    base_uri: str,
+    loaders: t.Optional[t.Mapping[str, loaders_.DocumentLoader]] = None,
+) -> t.Dict[str, t.Any]:
+    return await ExternalReferencesResolver(
+        base_uri=base_uri,
+        loaders=loaders,
+    ).resolve(
+        raw_api=raw_api,
+    )
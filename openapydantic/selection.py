@@ -0,0 +1,237 @@
+import fnmatch
+import typing as t
+
+from openapydantic import common
+from openapydantic import pointer
+from openapydantic import resolver
+
+# security schemes are referenced by name (security requirements), not by $ref
+KEPT_COMPONENTS = {"securitySchemes"}
+
+
+def prune_components(
+    raw_api: t.Dict[str, t.Any],
+) -> t.Dict[str, t.Any]:
+    components = raw_api.get("components")
+    if not components:
+        return raw_api
+
+    used = resolver.referenced_components(
+        raw_api=raw_api,
+        obj={key: value for key, value in raw_api.items() if key != "components"},
+    )
+
+    pruned: t.Dict[str, t.Any] = {}
+    for component_type, values in components.items():
+        if component_type in KEPT_COMPONENTS:
+            pruned[component_type] = values
+            continue
+        kept = {
+            key: value
+            for key, value in (values or {}).items()
+            if pointer.build(("components", component_type, key)) in used
+        }
+        if kept:
+            pruned[component_type] = kept
+    return {**raw_api, "components": pruned}
+
+
+class OperationFilter:
+    """Operations selected by path (glob patterns), tag or operationId.
+
+    An operation is selected when it matches any of the given criteria.
+    """
+
+    def __init__(
+        self,
+        *,
+        paths: t.Optional[t.Iterable[str]] = None,
+        tags: t.Optional[t.Iterable[str]] = None,
+        operation_ids: t.Optional[t.Iterable[str]] = None,
+    ) -> None:
+        self.paths = list(paths or ())
+        self.tags = set(tags or ())
+        self.operation_ids = set(operation_ids or ())
+
+    def match_path(
+        self,
+        path: str,
+    ) -> bool:
+        return any(fnmatch.fnmatchcase(path, pattern) for pattern in self.paths)
+
+    def match_operation(
+        self,
+        operation: t.Any,
+    ) -> bool:
+        if not isinstance(operation, dict):
+            return False
+        return operation.get("operationId") in self.operation_ids or bool(
+            self.tags.intersection(operation.get("tags") or ()),
+        )
+
+
+def select_operations(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    include_paths: t.Optional[t.Iterable[str]] = None,
+    include_tags: t.Optional[t.Iterable[str]] = None,
+    include_operation_ids: t.Optional[t.Iterable[str]] = None,
+) -> t.Dict[str, t.Any]:
+    """Slice of a specification: selected operations and their dependencies.
+
+    Other operations (and path items without selected operation) are
+    dropped, then the components not referenced anymore.
+    """
+    operation_filter = OperationFilter(
+        paths=include_paths,
+        tags=include_tags,
+        operation_ids=include_operation_ids,
+    )
+    paths: t.Dict[str, t.Any] = {}
+    for path, path_item in (raw_api.get("paths") or {}).items():
+        if operation_filter.match_path(path):
+            paths[path] = path_item
+            continue
+        operations = {
+            method: operation
+            for method, operation in (path_item or {}).items()
+            if method in common.HTTP_METHODS
+            and operation_filter.match_operation(operation)
+        }
+        if operations:
+            paths[path] = {
+                **{
+                    key: value
+                    for key, value in path_item.items()
+                    if key not in common.HTTP_METHODS
+                },
+                **operations,
+            }
+    return prune_components({**raw_api, "paths": paths})
+
+
+DEFAULT_SHARD = "default"
+
+# (path, method, operation) -> names of the shards of the operation
+ShardKey = t.Callable[[str, str, t.Dict[str, t.Any]], t.Iterable[str]]
+
+
+def by_tag(
+    path: str,
+    method: str,
+    operation: t.Dict[str, t.Any],
+) -> t.Iterable[str]:
+    return operation.get("tags") or (DEFAULT_SHARD,)
+
+
+def by_path_prefix(
+    path: str,
+    method: str,
+    operation: t.Dict[str, t.Any],
+) -> t.Iterable[str]:
+    # "/pets/{id}" -> "pets"
+    return (path.strip("/").split("/")[0] or DEFAULT_SHARD,)
+
+
+def by_extension(
+    name: str,
+) -> ShardKey:
+    # e.g. by_extension("x-service"), the value can be a name or a list
+    def key(
+        path: str,
+        method: str,
+        operation: t.Dict[str, t.Any],
+    ) -> t.Iterable[str]:
+        value = operation.get(name) or DEFAULT_SHARD
+        return [value] if isinstance(value, str) else value
+
+    return key
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.paths: t.Dict[str, t.Dict[str, t.Any]] = {}
+        self.roots: t.Set[str] = set()
+        self.tags: t.Set[str] = set()
+
+
+def _component_refs(
+    obj: t.Any,
+) -> t.Set[str]:
+    result = set()
+    for ref in resolver.iter_references(obj):
+        target = resolver.split_component_ref(ref)
+        if target:
+            result.add(pointer.build(("components",) + target))
+    return result
+
+
+def _split_paths(
+    raw_api: t.Dict[str, t.Any],
+    key: ShardKey,
+) -> t.Dict[str, _Shard]:
+    shards: t.Dict[str, _Shard] = {}
+    for path, path_item in (raw_api.get("paths") or {}).items():
+        common_fields = {
+            field: value
+            for field, value in (path_item or {}).items()
+            if field not in common.HTTP_METHODS
+        }
+        common_roots = _component_refs(common_fields)
+        for method, operation in (path_item or {}).items():
+            if method not in common.HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            roots = _component_refs(operation)
+            for name in key(path, method, operation):
+                shard = shards.setdefault(name, _Shard())
+                shard.paths.setdefault(path, dict(common_fields))[method] = operation
+                shard.roots.update(roots, common_roots)
+                shard.tags.update(operation.get("tags") or ())
+    return shards
+
+
+def split_spec(
+    raw_api: t.Dict[str, t.Any],
+    *,
+    key: ShardKey = by_tag,
+) -> t.Dict[str, t.Dict[str, t.Any]]:
+    """Split a specification into sub-specifications (shards).
+
+    Each shard contains its operations (see key, one operation can belong to
+    several shards) and the closure of the components they reference. The
+    document is traversed once: the closures are computed on the reference
+    graph of the components. Shards share their objects with raw_api.
+    """
+    shards = _split_paths(raw_api, key)
+    graph = resolver.build_reference_graph(raw_api)
+    # top level references (security...) belong to every shard
+    roots = _component_refs(
+        {
+            field: value
+            for field, value in raw_api.items()
+            if field not in ("paths", "components")
+        },
+    )
+    components = raw_api.get("components") or {}
+    # components keep their order of the document
+    order = {ref: index for index, ref in enumerate(graph)}
+
+    result = {}
+    for name, shard in shards.items():
+        used = resolver.reachable_components(graph=graph, roots=shard.roots | roots)
+        shard_components: t.Dict[str, t.Dict[str, t.Any]] = {}
+        for ref in sorted(used.intersection(order), key=order.__getitem__):
+            component_type, component_key = pointer.parse(ref)[1:3]
+            values = shard_components.setdefault(component_type, {})
+            values[component_key] = components[component_type][component_key]
+        for component_type in KEPT_COMPONENTS:
+            if component_type in components:
+                shard_components[component_type] = components[component_type]
+
+        document = {**raw_api, "paths": shard.paths, "components": shard_components}
+        if "tags" in raw_api:
+            document["tags"] = [
+                tag for tag in raw_api["tags"] if tag.get("name") in shard.tags
+            ]
+        result[name] = document
+    return result
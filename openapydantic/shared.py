@@ -0,0 +1,488 @@
+import collections.abc
+import json
+import mmap
+import os
+import struct
+import typing as t
+
+# a loaded api encoded once into a read-only binary document, placed in
+# shared memory or in a file mapped by every worker process: values are
+# decoded on access, the document is neither copied nor validated again.
+#
+# layout (little endian): header, nodes, strings table
+# - header: magic, format version, root node offset, strings table offset
+# - node: tag, then
+#   - int: i64, float: f64, string and big int: string index
+#   - array: count, node offsets
+#   - object: count, (key string index, node offset) in document order,
+#     then positions of the entries sorted by key (binary search)
+# - strings table: count, count + 1 offsets in the utf-8 blob, blob
+# identical strings and nodes (e.g. interpolated references) are stored once
+
+MAGIC = b"OAPV"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHII")
+U32 = struct.Struct("<I")
+PAIR = struct.Struct("<II")
+
+NULL, FALSE, TRUE, INT, FLOAT, STRING, ARRAY, OBJECT, BIG_INT = range(9)
+
+# openapi fields whose value maps names to objects (e.g: paths, schemas)
+MAP_FIELDS = {
+    "callbacks",
+    "content",
+    "encoding",
+    "examples",
+    "headers",
+    "links",
+    "mapping",
+    "parameters",
+    "paths",
+    "properties",
+    "requestBodies",
+    "responses",
+    "schemas",
+    "scopes",
+    "securitySchemes",
+    "variables",
+}
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.nodes = bytearray(HEADER.size)
+        # encoded node -> offset
+        self.offsets: t.Dict[bytes, int] = {}
+        self.strings: t.Dict[str, int] = {}
+
+    def string(
+        self,
+        value: str,
+    ) -> int:
+        return self.strings.setdefault(value, len(self.strings))
+
+    def node(
+        self,
+        data: bytes,
+    ) -> int:
+        offset = self.offsets.get(data)
+        if offset is None:
+            offset = self.offsets[data] = len(self.nodes)
+            self.nodes += data
+        return offset
+
+    def _object(
+        self,
+        value: t.Dict[str, t.Any],
+    ) -> bytes:
+        keys = list(value)
+        entries = []
+        for key, item in value.items():
+            entries += [self.string(key), self.encode(item)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return struct.pack(
+            f"<BI{len(entries)}I{len(order)}I",
+            OBJECT,
+            len(keys),
+            *entries,
+            *order,
+        )
+
+    def encode(
+        self,
+        value: t.Any,
+    ) -> int:
+        if value is None or isinstance(value, bool):
+            return self.node(bytes([{None: NULL, False: FALSE, True: TRUE}[value]]))
+        if isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                return self.node(struct.pack("<Bq", INT, value))
+            return self.node(struct.pack("<BI", BIG_INT, self.string(str(value))))
+        if isinstance(value, float):
+            return self.node(struct.pack("<Bd", FLOAT, value))
+        if isinstance(value, str):
+            return self.node(struct.pack("<BI", STRING, self.string(value)))
+        if isinstance(value, (list, tuple)):
+            offsets = [self.encode(item) for item in value]
+            return self.node(
+                struct.pack(f"<BI{len(offsets)}I", ARRAY, len(offsets), *offsets),
+            )
+        if isinstance(value, dict):
+            return self.node(self._object(value))
+        raise TypeError(f"Value not json serializable:{type(value).__name__}")
+
+    def finish(
+        self,
+        root: int,
+    ) -> bytes:
+        blob = [value.encode() for value in self.strings]
+        positions = [0]
+        for value in blob:
+            positions.append(positions[-1] + len(value))
+        strings_offset = len(self.nodes)
+        self.nodes[: HEADER.size] = HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            root,
+            strings_offset,
+        )
+        return b"".join(
+            [
+                bytes(self.nodes),
+                struct.pack(f"<I{len(positions)}I", len(blob), *positions),
+                *blob,
+            ],
+        )
+
+
+def encode(
+    document: t.Any,
+) -> bytes:
+    """Binary encoding of a json document."""
+    encoder = _Encoder()
+    return encoder.finish(encoder.encode(document))
+
+
+def dump(
+    api: t.Any,
+) -> bytes:
+    # resolved api: clean export, references interpolated, with components
+    return encode(json.loads(api.as_clean_json(exclude_components=False)))
+
+
+class _Document:
+    def __init__(
+        self,
+        buffer: t.Any,
+    ) -> None:
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError("Not an encoded api")
+        magic, version, self.root, strings = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not an encoded api (or another format version)")
+        count = U32.unpack_from(self.buffer, strings)[0]
+        self.string_offsets = strings + 4
+        self.blob = self.string_offsets + 4 * (count + 1)
+
+    def string(
+        self,
+        index: int,
+    ) -> str:
+        start, end = PAIR.unpack_from(self.buffer, self.string_offsets + 4 * index)
+        start += self.blob
+        end += self.blob
+        return str(self.buffer[start:end], "utf-8")
+
+    def value(
+        self,
+        offset: int,
+        *,
+        is_map: bool = False,
+    ) -> t.Any:
+        tag = self.buffer[offset]
+        if tag <= TRUE:
+            return (None, False, True)[tag]
+        if tag == INT:
+            return struct.unpack_from("<q", self.buffer, offset + 1)[0]
+        if tag == FLOAT:
+            return struct.unpack_from("<d", self.buffer, offset + 1)[0]
+        if tag == STRING:
+            return self.string(U32.unpack_from(self.buffer, offset + 1)[0])
+        if tag == BIG_INT:
+            return int(self.string(U32.unpack_from(self.buffer, offset + 1)[0]))
+        if tag == ARRAY:
+            return ArrayView(self, offset)
+        return (MapView if is_map else ModelView)(self, offset)
+
+    def count(
+        self,
+        offset: int,
+    ) -> int:
+        return U32.unpack_from(self.buffer, offset + 1)[0]  # type: ignore
+
+    def entry(
+        self,
+        offset: int,
+        position: int,
+    ) -> t.Tuple[str, int]:
+        key, value = PAIR.unpack_from(self.buffer, offset + 5 + 8 * position)
+        return self.string(key), value
+
+    def lookup(
+        self,
+        offset: int,
+        key: str,
+    ) -> t.Optional[int]:
+        # value offset of a key, binary search on the sorted entries
+        count = self.count(offset)
+        order = offset + 5 + 8 * count
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            position = U32.unpack_from(self.buffer, order + 4 * middle)[0]
+            entry_key, value = self.entry(offset, position)
+            if entry_key == key:
+                return value  # type: ignore
+            if entry_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+def _to_python(
+    value: t.Any,
+) -> t.Any:
+    if isinstance(value, (ModelView, MapView, ArrayView)):
+        return value.to_python()
+    return value
+
+
+def field_key(
+    name: str,
+) -> str:
+    # model attribute -> json key: operation_id -> operationId, in_ -> in
+    if name == "ref":
+        return "$ref"
+    first, *others = name.rstrip("_").split("_")
+    return first + "".join(other.title() for other in others)
+
+
+class ModelView:
+    """Read-only view of an encoded openapi object.
+
+    Fields are attributes, named as the model attributes (operation_id for
+    operationId), None when missing; keys (e.g. extensions) are items.
+    Scalars are json values: enums are not converted.
+    """
+
+    __slots__ = ("_document", "_offset")
+
+    def __init__(
+        self,
+        document: _Document,
+        offset: int,
+    ) -> None:
+        self._document = document
+        self._offset = offset
+
+    def _get(
+        self,
+        key: str,
+    ) -> t.Any:
+        offset = self._document.lookup(self._offset, key)
+        if offset is None:
+            raise KeyError(key)
+        return self._document.value(offset, is_map=key in MAP_FIELDS)
+
+    def __getattr__(
+        self,
+        name: str,
+    ) -> t.Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._get(field_key(name))
+        except KeyError:
+            return None
+
+    def __getitem__(
+        self,
+        key: str,
+    ) -> t.Any:
+        return self._get(key)
+
+    def __contains__(
+        self,
+        key: object,
+    ) -> bool:
+        return (
+            isinstance(key, str)
+            and self._document.lookup(self._offset, key) is not None
+        )
+
+    def __iter__(self) -> t.Iterator[str]:
+        for position in range(self._document.count(self._offset)):
+            yield self._document.entry(self._offset, position)[0]
+
+    def __len__(self) -> int:
+        return self._document.count(self._offset)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(self)})"
+
+    def to_python(self) -> t.Dict[str, t.Any]:
+        return {key: _to_python(self._get(key)) for key in self}
+
+
+class MapView(collections.abc.Mapping):  # type: ignore
+    """Read-only view of an encoded map of openapi objects (e.g. paths)."""
+
+    __slots__ = ("_document", "_offset")
+
+    def __init__(
+        self,
+        document: _Document,
+        offset: int,
+    ) -> None:
+        self._document = document
+        self._offset = offset
+
+    def __getitem__(
+        self,
+        key: str,
+    ) -> t.Any:
+        offset = self._document.lookup(self._offset, key)
+        if offset is None:
+            raise KeyError(key)
+        return self._document.value(offset)
+
+    def __iter__(self) -> t.Iterator[str]:
+        for position in range(self._document.count(self._offset)):
+            yield self._document.entry(self._offset, position)[0]
+
+    def __len__(self) -> int:
+        return self._document.count(self._offset)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(self)})"
+
+    def to_python(self) -> t.Dict[str, t.Any]:
+        return {key: _to_python(value) for key, value in self.items()}
+
+
+class ArrayView(collections.abc.Sequence):  # type: ignore
+    __slots__ = ("_document", "_offset")
+
+    def __init__(
+        self,
+        document: _Document,
+        offset: int,
+    ) -> None:
+        self._document = document
+        self._offset = offset
+
+    def __getitem__(  # type: ignore
+        self,
+        index: int,
+    ) -> t.Any:
+        if isinstance(index, slice):
+            return [self[position] for position in range(len(self))[index]]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(index)
+        offset = U32.unpack_from(self._document.buffer, self._offset + 5 + 4 * index)
+        return self._document.value(offset[0])
+
+    def __len__(self) -> int:
+        return self._document.count(self._offset)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} items)"
+
+    def to_python(self) -> t.List[t.Any]:
+        return [_to_python(value) for value in self]
+
+
+class ApiView(ModelView):
+    """Read-only view of an encoded api, with the attributes of the api
+    model (info, paths, components...). Close it to release the buffer."""
+
+    __slots__ = ("_close",)
+
+    def __init__(
+        self,
+        buffer: t.Any,
+        *,
+        close: t.Optional[t.Callable[[], None]] = None,
+    ) -> None:
+        document = _Document(buffer)
+        super().__init__(document, document.root)
+        self._close = close
+
+    def close(self) -> None:
+        self._document.buffer.release()
+        if self._close is not None:
+            self._close()
+
+    def __enter__(self) -> "ApiView":
+        return self
+
+    def __exit__(
+        self,
+        *args: t.Any,
+    ) -> None:
+        self.close()
+
+
+def write(
+    api: t.Any,
+    file_path: str,
+) -> int:
+    content = dump(api)
+    temporary_path = f"{file_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(content)
+    os.replace(temporary_path, file_path)
+    return len(content)
+
+
+def open_file(
+    file_path: str,
+) -> ApiView:
+    # pages of the mapped file are shared by the processes mapping it
+    with open(file_path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return ApiView(mapped, close=mapped.close)
+
+
+def share(
+    api: t.Any,
+    *,
+    name: t.Optional[str] = None,
+) -> t.Any:
+    """Encoded api in a new shared memory block.
+
+    The block (multiprocessing.shared_memory.SharedMemory) belongs to the
+    caller: close and unlink it once the workers are done.
+    """
+    from multiprocessing import shared_memory
+
+    content = dump(api)
+    memory = shared_memory.SharedMemory(name=name, create=True, size=len(content))
+    memory.buf[: len(content)] = content
+    _created.add(memory.name)
+    return memory
+
+
+# blocks created by share in this process (or its parent, when forked)
+_created: t.Set[str] = set()
+
+
+def _attach_memory(
+    name: str,
+) -> t.Any:
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore
+    except TypeError:
+        # python < 3.13: attached blocks are registered to be unlinked when
+        # the process exits. The owner unlinks it: unregistered, unless the
+        # resource tracker is the owner one (same or forked process)
+        memory = shared_memory.SharedMemory(name=name)
+        if os.name == "posix" and memory.name not in _created:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+def attach(
+    name: str,
+) -> ApiView:
+    memory = _attach_memory(name)
+    return ApiView(memory.buf, close=memory.close)
@@ -0,0 +1,271 @@
+import asyncio
+import concurrent.futures
+import enum
+import functools
+import glob
+import hashlib
+import json
+import os
+import time
+import typing as t
+import xml.etree.ElementTree as ET  # nosec
+
+from openapydantic import common
+from openapydantic import loaders
+from openapydantic import versions
+from openapydantic.compat import pydantic
+
+STATE_FILE = ".openapydantic-state.json"
+SPEC_EXTENSIONS = (".yaml", ".yml", ".json")
+
+
+class Status(enum.Enum):
+    passed = "passed"
+    failed = "failed"
+    skipped = "skipped"  # unchanged since a previous successful validation
+
+
+class FileResult(pydantic.BaseModel):
+    file_path: str
+    status: Status
+    duration: float = 0
+    error: t.Optional[str] = None
+    # local documents of the specification (root included) -> content hash
+    dependencies: t.Dict[str, str] = {}
+
+
+class ValidationReport(pydantic.BaseModel):
+    results: t.List[FileResult]
+
+    @property
+    def failed(self) -> t.List[FileResult]:
+        return [result for result in self.results if result.status == Status.failed]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def count(
+        self,
+        status: Status,
+    ) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    def text(self) -> str:
+        lines = []
+        for result in self.results:
+            lines.append(f"{result.status.value.upper()} {result.file_path}")
+            if result.error:
+                lines.append(result.error)
+        lines.append(
+            ", ".join(f"{self.count(status)} {status.value}" for status in Status),
+        )
+        return "\n".join(lines)
+
+    def junit(self) -> str:
+        suite = ET.Element(
+            "testsuite",
+            name="openapydantic",
+            tests=str(len(self.results)),
+            failures=str(self.count(Status.failed)),
+            skipped=str(self.count(Status.skipped)),
+            time=f"{sum(result.duration for result in self.results):.3f}",
+        )
+        for result in self.results:
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname="openapydantic.validate",
+                name=result.file_path,
+                time=f"{result.duration:.3f}",
+            )
+            if result.status == Status.failed:
+                failure = ET.SubElement(
+                    case,
+                    "failure",
+                    message=(result.error or "").split("\n")[0],
+                )
+                failure.text = result.error
+            elif result.status == Status.skipped:
+                ET.SubElement(case, "skipped", message="unchanged")
+        return ET.tostring(suite, encoding="unicode")
+
+
+def expand_paths(
+    patterns: t.Iterable[str],
+) -> t.List[str]:
+    """Files matching paths, glob patterns ("**" supported) or directories.
+
+    Directories are searched recursively for yaml and json files.
+    """
+    result: t.Dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                match
+                for match in glob.glob(
+                    os.path.join(pattern, "**", "*"),
+                    recursive=True,
+                )
+                if match.endswith(SPEC_EXTENSIONS)
+            ]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        for match in sorted(matches):
+            if os.path.isfile(match):
+                result[os.path.abspath(match)] = None
+    return list(result)
+
+
+def content_hash(
+    file_path: str,
+) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(functools.partial(file.read, 1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationState:
+    """Files validated successfully by previous runs, with their content hash.
+
+    A file is skipped while neither it nor the documents it references
+    changed. The state is bound to the library and pydantic versions and to
+    the validation options.
+    """
+
+    def __init__(
+        self,
+        *,
+        file_path: str = STATE_FILE,
+        options: str = "",
+    ) -> None:
+        self.file_path = file_path
+        self.key = (
+            f"openapydantic:{common.LIBRARY_VERSION}:"
+            f"pydantic:{pydantic.VERSION}:{options}"
+        )
+        self.files: t.Dict[str, t.Dict[str, str]] = {}
+        if os.path.exists(file_path):
+            with open(file_path) as file:
+                content = json.load(file)
+            if content.get("key") == self.key:
+                self.files = content.get("files") or {}
+
+    def is_unchanged(
+        self,
+        file_path: str,
+    ) -> bool:
+        dependencies = self.files.get(file_path)
+        if not dependencies:
+            return False
+        try:
+            return all(
+                content_hash(dependency) == digest
+                for dependency, digest in dependencies.items()
+            )
+        except OSError:
+            return False
+
+    def record(
+        self,
+        result: FileResult,
+    ) -> None:
+        if result.status == Status.passed:
+            self.files[result.file_path] = result.dependencies
+        elif result.status == Status.failed:
+            self.files.pop(result.file_path, None)
+
+    def save(self) -> None:
+        temporary_path = f"{self.file_path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"key": self.key, "files": self.files}, file, indent=1)
+        os.replace(temporary_path, self.file_path)
+
+
+def validate_file(
+    file_path: str,
+    *,
+    version: t.Optional[common.OpenApiVersion] = None,
+    backend: common.ModelBackend = common.ModelBackend.pydantic_v1,
+    fail_fast: bool = False,
+    max_errors: t.Optional[int] = None,
+) -> FileResult:
+    file_loader = loaders.TrackingFileLoader()
+    start = time.perf_counter()
+    try:
+        asyncio.run(
+            versions.load_api(
+                file_path=file_path,
+                version=version,
+                backend=backend,
+                loaders={"file": file_loader},
+                fail_fast=fail_fast,
+                max_errors=max_errors,
+            ),
+        )
+    except Exception as error:
+        return FileResult(
+            file_path=file_path,
+            status=Status.failed,
+            duration=time.perf_counter() - start,
+            error=f"{type(error).__name__}: {error}",
+        )
+    return FileResult(
+        file_path=file_path,
+        status=Status.passed,
+        duration=time.perf_counter() - start,
+        dependencies={
+            path: content_hash(path) for path in [file_path, *file_loader.paths]
+        },
+    )
+
+
+def validate_files(
+    file_paths: t.Sequence[str],
+    *,
+    version: t.Optional[common.OpenApiVersion] = None,
+    backend: common.ModelBackend = common.ModelBackend.pydantic_v1,
+    workers: t.Optional[int] = None,
+    state: t.Optional[ValidationState] = None,
+    fail_fast: bool = False,
+    max_errors: t.Optional[int] = None,
+) -> ValidationReport:
+    """Validate files in a pool of worker processes.
+
+    Files unchanged since a successful validation recorded in the state
+    are skipped. The state is updated (but not saved) with the results.
+    With fail_fast or max_errors, files are pre-checked (see precheck).
+    """
+    results: t.Dict[str, FileResult] = {}
+    pending = []
+    for file_path in file_paths:
+        if state is not None and state.is_unchanged(file_path):
+            results[file_path] = FileResult(
+                file_path=file_path,
+                status=Status.skipped,
+            )
+        else:
+            pending.append(file_path)
+
+    validate = functools.partial(
+        validate_file,
+        version=version,
+        backend=backend,
+        fail_fast=fail_fast,
+        max_errors=max_errors,
+    )
+    if workers == 1 or len(pending) <= 1:
+        validated = list(map(validate, pending))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            validated = list(executor.map(validate, pending))
+
+    for result in validated:
+        results[result.file_path] = result
+        if state is not None:
+            state.record(result)
+    return ValidationReport(
+        results=[results[file_path] for file_path in file_paths],
+    )
@@ -1,50 +1,235 @@
+import contextlib
+import importlib
+import types
 import typing as t
 
-import yaml
-
 from openapydantic import common
-from openapydantic.versions import openapi_302
+from openapydantic import fingerprint as fingerprint_
+from openapydantic import interning
+from openapydantic import limits as limits_
+from openapydantic import loaders as loaders_
+from openapydantic import normalize
+from openapydantic import pool as pool_
+from openapydantic import precheck as precheck_
+from openapydantic import resolver
+from openapydantic import selection
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from openapydantic.versions import openapi_302
+    from openapydantic.versions import openapi_302_v2
+
+OpenApi = t.Union[
+    "openapi_302.OpenApi302",
+    "openapi_302_v2.OpenApi302",
+]  # a version module is only imported when a spec of this version is loaded
+
+ModelBackend = common.ModelBackend
+
+# openapi version -> model backend -> module implementing it (load_api,
+# get_component_object, and construct_api for the pydantic v1 backend)
+VERSION_MODULES: t.Dict[common.OpenApiVersion, t.Dict[ModelBackend, str]] = {
+    common.OpenApiVersion.v3_0_2: {
+        ModelBackend.pydantic_v1: "openapydantic.versions.openapi_302",
+        ModelBackend.pydantic_v2: "openapydantic.versions.openapi_302_v2",
+    },
+}
+
+
+def register_version(
+    *,
+    version: common.OpenApiVersion,
+    module_name: str,
+    backend: ModelBackend = ModelBackend.pydantic_v1,
+) -> None:
+    VERSION_MODULES.setdefault(version, {})[backend] = module_name
 
-OpenApi = (
-    openapi_302.OpenApi302
-)  # will be a tuple when there'll be more than one version
+
+def get_version_module(
+    version: common.OpenApiVersion,
+    backend: ModelBackend = ModelBackend.pydantic_v1,
+) -> types.ModuleType:
+    module_name = VERSION_MODULES.get(version, {}).get(backend)
+    if module_name is None:
+        raise NotImplementedError(
+            f"Unsupported openapi version:{version.value} ({backend.value})"
+        )
+    return importlib.import_module(module_name)
+
+
+def __getattr__(
+    name: str,
+) -> types.ModuleType:
+    # versions.openapi_302 and co are imported on first access
+    for modules in VERSION_MODULES.values():
+        for module_name in modules.values():
+            if module_name == f"{__name__}.{name}":
+                return importlib.import_module(module_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def load_spec(
     *,
     file_path: str,
     mode: t.Optional[str] = None,
+    intern: bool = False,
+    max_aliases: t.Optional[int] = None,
 ) -> t.Dict[t.Any, t.Any]:
+    import yaml
+
     if not mode:
         mode = "r"
 
     with open(file_path, "r") as file:
-        result = yaml.safe_load(file)
+        if max_aliases is None:
+            result = yaml.safe_load(file)
+        else:
+            loader = limits_.alias_limited_loader(max_aliases)
+            result = yaml.load(file, Loader=loader)  # nosec
+
+    if intern:
+        result = interning.intern_spec(result)
 
     return result
 
 
+def _get_api_version(
+    *,
+    spec_version: str,
+    version: t.Optional[common.OpenApiVersion],
+) -> common.OpenApiVersion:
+    if version in VERSION_MODULES:
+        return version  # type: ignore
+    try:
+        api_version = common.OpenApiVersion(spec_version)
+    except ValueError:
+        api_version = None
+    if api_version not in VERSION_MODULES:
+        raise NotImplementedError(f"Unsupported openapi version:{spec_version}")
+    return api_version  # type: ignore
+
+
+def _load_context(
+    *,
+    raw_api: t.Dict[str, t.Any],
+    pool: t.Optional[pool_.ComponentPool],
+    share_aliases: bool,
+) -> contextlib.ExitStack:
+    # activated when created
+    stack = contextlib.ExitStack()
+    if pool is not None:
+        stack.enter_context(pool.activate(raw_api=raw_api))
+    if share_aliases:
+        stack.enter_context(pool_.SourceSharing().activate())
+    return stack
+
+
+def _check_backend(
+    backend: ModelBackend,
+    *,
+    pool: t.Optional[pool_.ComponentPool],
+    trusted: bool,
+) -> None:
+    if backend == ModelBackend.pydantic_v1:
+        return
+    if pool is not None:
+        raise ValueError("The component pool requires the pydantic_v1 backend")
+    if trusted:
+        raise ValueError("Trusted mode requires the pydantic_v1 backend")
+
+
 async def load_api(
     *,
     file_path: str,
     version: t.Optional[common.OpenApiVersion] = None,
+    intern: bool = False,
+    trusted: bool = False,
+    fingerprint: t.Optional[str] = None,
+    loaders: t.Optional[t.Mapping[str, loaders_.DocumentLoader]] = None,
+    pool: t.Optional[pool_.ComponentPool] = None,
+    backend: ModelBackend = ModelBackend.pydantic_v1,
+    include_paths: t.Optional[t.Iterable[str]] = None,
+    include_tags: t.Optional[t.Iterable[str]] = None,
+    include_operation_ids: t.Optional[t.Iterable[str]] = None,
+    precheck: bool = False,
+    fail_fast: bool = False,
+    max_errors: t.Optional[int] = None,
+    limits: t.Optional[limits_.Limits] = None,
+    share_aliases: bool = False,
+    normalizer: t.Optional[normalize.SchemaNormalizer] = None,
 ) -> OpenApi:
-    raw_api = await load_spec(file_path=file_path)
+    _check_backend(backend, pool=pool, trusted=trusted)
+
+    guard = limits_.LoadGuard(limits)
+    guard.check_document(file_path)
+    raw_api = await load_spec(
+        file_path=file_path,
+        max_aliases=guard.limits.max_aliases,
+    )
     if not raw_api:
         raise ValueError("Api specification looks empty")
+    # yaml aliases are shared by the loader: bombs are caught before any
+    # walk of the document
+    guard.check_expansion(raw_api)
+
+    # structural errors are reported before the (slow) resolution
+    if precheck or fail_fast or max_errors is not None:
+        precheck_.check(raw_api, fail_fast=fail_fast, max_errors=max_errors)
+
+    # pruned first: only the documents and components of the selected
+    # operations are then resolved and validated
+    if any(
+        include is not None
+        for include in (include_paths, include_tags, include_operation_ids)
+    ):
+        raw_api = selection.select_operations(
+            raw_api,
+            include_paths=include_paths,
+            include_tags=include_tags,
+            include_operation_ids=include_operation_ids,
+        )
+
+    raw_api = await guard.within_time(
+        resolver.resolve_external_references(
+            raw_api=raw_api,
+            base_uri=loaders_.path_to_uri(file_path),
+            loaders=loaders,
+        ),
+        "external references",
+    )
+    # again with the external documents, before the interpolation copies
+    # anything
+    guard.check_expansion(raw_api)
+    guard.check_time("models")
+
+    if intern:
+        raw_api = interning.intern_spec(raw_api)
+    # after the interning, which would copy the shared references
+    if normalizer is not None:
+        raw_api = normalizer.normalize(raw_api)
+        share_aliases = True
 
     spec_version = raw_api.get("openapi")
 
     if not spec_version:
         raise ValueError("openapi version not specified")
 
-    if (
-        version == common.OpenApiVersion.v3_0_2
-        or spec_version == openapi_302.OpenApi302.__version__.value
-    ):
-        return openapi_302.load_api(raw_api=raw_api)
+    version_module = get_version_module(
+        _get_api_version(
+            spec_version=spec_version,
+            version=version,
+        ),
+        backend,
+    )
 
-    raise NotImplementedError(f"Unsupported openapi version:{spec_version}")
+    if trusted:
+        fingerprint_.check_fingerprint(
+            raw_api=raw_api,
+            fingerprint=fingerprint,
+        )
+    with _load_context(raw_api=raw_api, pool=pool, share_aliases=share_aliases):
+        if trusted:
+            return version_module.construct_api(raw_api=raw_api)  # type: ignore
+        return version_module.load_api(raw_api=raw_api)  # type: ignore
 
 
 def get_component_object_proxy(
@@ -52,9 +237,7 @@ def get_component_object_proxy(
     values: t.Dict[str, t.Any],
     version: common.OpenApiVersion,
 ) -> t.Dict[str, t.Any]:
-    if version == common.OpenApiVersion.v3_0_2:
-        return openapi_302.get_component_object(
-            component_type=component_type,
-            values=values,
-        )
-    raise NotImplementedError()
+    return get_version_module(version).get_component_object(  # type: ignore
+        component_type=component_type,
+        values=values,
+    )
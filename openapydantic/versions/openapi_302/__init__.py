@@ -1,11 +1,16 @@
 # https://github.com/OAI/OpenAPI-Specification/blob/main/versions/3.0.2.md
 
+import json
 import typing as t
 
-import pydantic
-
 from openapydantic import common
+from openapydantic import construct
+from openapydantic import fingerprint
+from openapydantic import pointer
+from openapydantic import pool
+from openapydantic import query
 from openapydantic import resolver
+from openapydantic.compat import pydantic
 from openapydantic.versions.openapi_302 import models
 
 Field = pydantic.Field
@@ -28,10 +33,33 @@ class OpenApi302(OpenApiBaseModel):
         alias="externalDocs",
     )
     raw_api: t.Dict[str, t.Any]
+    # clean dict view of the api, built by the first query
+    _query_view: t.Optional[t.Dict[str, t.Any]] = pydantic.PrivateAttr(None)
 
     class Config:
         extra = "forbid"
 
+    def fingerprint(self) -> str:
+        return fingerprint.compute_fingerprint(
+            raw_api=self.raw_api,
+        )
+
+    def query(
+        self,
+        expression: str,
+    ) -> t.List[t.Any]:
+        """Values matching a jsonpath expression (e.g. "$.paths.*.get").
+
+        The query runs over the clean json view of the api (references
+        interpolated, components included), built once. Returned values are
+        shared between queries and must not be modified.
+        """
+        if self._query_view is None:
+            self._query_view = json.loads(
+                self.as_clean_json(exclude_components=False),
+            )
+        return query.query(self._query_view, expression)
+
 
 def load_api(
     *,
@@ -50,6 +78,94 @@ def load_api(
     return api
 
 
+class TrustedConstructor(construct.ModelConstructor):
+    def __init__(
+        self,
+        *,
+        raw_api: t.Dict[str, t.Any],
+    ) -> None:
+        super().__init__(resolve_reference=self._resolve_reference)
+        self.raw_api = raw_api
+        self.components: t.Dict[str, t.Any] = raw_api.get("components") or {}
+        self.references: t.Dict[t.Tuple[str, type], t.Any] = {}
+        self.in_progress: t.Set[str] = set()
+
+    def construct(
+        self,
+        model: t.Type[construct.Model],
+        values: t.Dict[str, t.Any],
+    ) -> construct.Model:
+        if not issubclass(model, models.RefModel):
+            return super().construct(model, values)
+        return pool.pooled(
+            model,
+            values,
+            lambda values_: super(TrustedConstructor, self).construct(model, values_),
+        )
+
+    def _reference_target(
+        self,
+        ref: str,
+    ) -> t.Any:
+        if resolver.is_document_ref(ref):
+            return pointer.resolve(self.raw_api, ref)
+        ref_type, ref_key, ref_path = resolver.parse_ref(ref)
+        ref_found = self.components.get(ref_type.value, {}).get(ref_key)
+        if not ref_found:
+            raise ValueError(f"Reference not found:{ref_type}/{ref_key}")
+        return pointer.resolve(ref_found, ref_path)
+
+    def _resolve_reference(
+        self,
+        model: t.Type[pydantic.BaseModel],
+        values: t.Dict[str, t.Any],
+    ) -> t.Optional[pydantic.BaseModel]:
+        ref = values.get("$ref")
+        if (
+            not ref
+            or not issubclass(model, models.RefModel)
+            or resolver.ComponentsResolver.is_self_reference(ref)
+            or ref in self.in_progress
+        ):
+            return None
+
+        instance = self.references.get((ref, model))
+        if instance is not None:
+            return instance  # type: ignore
+
+        ref_found = self._reference_target(ref)
+
+        self.in_progress.add(ref)
+        try:
+            instance = self.construct(model, ref_found)
+        finally:
+            self.in_progress.discard(ref)
+
+        self.references[(ref, model)] = instance
+        return instance  # type: ignore
+
+
+def construct_api(
+    *,
+    raw_api: t.Dict[str, t.Any],
+) -> OpenApi302:
+    # trusted mode: the specification was already validated (see
+    # fingerprint module), models are built without validation
+    resolver.ComponentsResolver.index(
+        raw_api=raw_api,
+    )
+    constructor = TrustedConstructor(
+        raw_api=raw_api,
+    )
+    return constructor.construct(
+        OpenApi302,
+        {
+            **raw_api,
+            "raw_api": raw_api,
+        },
+    )
+
+
 def get_component_object(
     component_type: common.ComponentType,
     values: t.Dict[str, t.Any],
@@ -1,10 +1,11 @@
 import enum
 import typing as t
 
-import pydantic
-
 from openapydantic import common
+from openapydantic import pointer
+from openapydantic import pool
 from openapydantic import resolver
+from openapydantic.compat import pydantic
 
 HTTPStatusCode = common.HTTPStatusCode
 MediaType = common.MediaType
@@ -22,11 +23,13 @@ def reference_interpolation(
     # print(f"ref:{ref}")
     if ref:
         # Avoir self reference here
-        if ref in resolver.ComponentsResolver.self_ref:
+        if resolver.ComponentsResolver.is_self_reference(ref):
             return values
-        ref_type, ref_key = resolver.get_ref_data(
-            ref=ref,
-        )
+        if resolver.is_document_ref(ref):
+            return reference_interpolation(
+                pointer.resolve(resolver.ComponentsResolver.raw_api, ref),
+            )
+        ref_type, ref_key, ref_path = resolver.parse_ref(ref)
         # print(f"ref_type:{ref_type.name}")
         # print(f"ref_key:{ref_key}")
         ref_found: t.Dict[str, t.Any] = resolver.ComponentsResolver.without_ref[
@@ -36,16 +39,27 @@ def reference_interpolation(
         if not ref_found:
             raise ValueError(f"Reference not found:{ref_type}/{ref_key}")
 
+        if ref_path:  # location inside the component
+            return pointer.resolve(ref_found, ref_path)  # type: ignore
         return ref_found
     return values
 
 
 class RefModel(OpenApiBaseModel):
+    __slots__ = ("__weakref__",)  # instances can be shared by a ComponentPool
+
     ref: t.Optional[str] = Field(
         None,
         alias="$ref",
     )
 
+    @classmethod
+    def validate(
+        cls,
+        value: t.Any,
+    ) -> "RefModel":
+        return pool.pooled(cls, value, super().validate)
+
     @pydantic.root_validator(
         pre=True,
         allow_reuse=True,
@@ -0,0 +1,70 @@
+# https://github.com/OAI/OpenAPI-Specification/blob/main/versions/3.0.2.md
+# pydantic v2 backend, see versions.openapi_302 for the pydantic v1 one
+
+import json
+import typing as t
+
+from openapydantic import common
+from openapydantic import fingerprint
+from openapydantic import query
+from openapydantic import resolver
+from openapydantic.versions.openapi_302_v2 import models
+
+Field = models.Field
+
+OpenApiVersion = common.OpenApiVersion
+
+
+class OpenApi302(models.OpenApiBaseModel):
+    __version__: t.ClassVar[OpenApiVersion] = OpenApiVersion.v3_0_2
+    model_config = models.pydantic.ConfigDict(extra="forbid")
+
+    components: t.Optional[models.Components] = None
+    openapi: OpenApiVersion
+    info: models.Info
+    paths: models.Paths
+    tags: t.Optional[t.List[models.Tag]] = None
+    servers: t.Optional[t.List[models.Server]] = None
+    security: t.Optional[t.List[models.SecurityRequirement]] = None
+    external_docs: t.Optional[models.ExternalDocs] = Field(
+        None,
+        alias="externalDocs",
+    )
+    raw_api: t.Dict[str, t.Any]
+    # clean dict view of the api, built by the first query
+    _query_view: t.Optional[t.Dict[str, t.Any]] = models.pydantic.PrivateAttr(None)
+
+    def fingerprint(self) -> str:
+        return fingerprint.compute_fingerprint(
+            raw_api=self.raw_api,
+        )
+
+    def query(
+        self,
+        expression: str,
+    ) -> t.List[t.Any]:
+        """Values matching a jsonpath expression (e.g. "$.paths.*.get").
+
+        The query runs over the clean json view of the api (references
+        interpolated, components included), built once. Returned values are
+        shared between queries and must not be modified.
+        """
+        if self._query_view is None:
+            self._query_view = json.loads(
+                self.as_clean_json(exclude_components=False),
+            )
+        return query.query(self._query_view, expression)
+
+
+def load_api(
+    *,
+    raw_api: t.Dict[str, t.Any],
+) -> OpenApi302:
+    data: t.Dict[str, t.Any] = {
+        **raw_api,
+        "raw_api": raw_api,
+    }
+    return OpenApi302.model_validate(
+        data,
+        context=resolver.ReferenceTargets(raw_api=raw_api),
+    )
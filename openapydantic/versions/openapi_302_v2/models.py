@@ -0,0 +1,623 @@
+# pydantic v2 (pydantic-core) models, with the same fields and aliases than
+# versions.openapi_302.models
+import enum
+import json
+import typing as t
+
+import pydantic
+import typing_extensions
+
+from openapydantic import common
+from openapydantic import compat
+from openapydantic import export
+from openapydantic import pool
+from openapydantic import resolver
+
+if not compat.PYDANTIC_V2:
+    raise ImportError("The pydantic_v2 backend requires pydantic>=2")
+
+HTTPStatusCode = common.HTTPStatusCode
+MediaType = common.MediaType
+
+Annotated = typing_extensions.Annotated
+Field = pydantic.Field
+
+# pydantic v1 tries the members of an union from left to right
+LEFT_TO_RIGHT = Field(union_mode="left_to_right")
+_URL_ADAPTER: pydantic.TypeAdapter[pydantic.AnyUrl] = pydantic.TypeAdapter(
+    pydantic.AnyUrl,
+)
+
+
+def _check_url(
+    value: str,
+) -> str:
+    # validated like pydantic.AnyUrl, but kept as provided (pydantic v2
+    # normalizes urls)
+    _URL_ADAPTER.validate_python(value)
+    return value
+
+
+def _coerce_str(
+    value: t.Any,
+) -> t.Any:
+    # pydantic v1 converts booleans to strings
+    return str(value) if isinstance(value, bool) else value
+
+
+AnyUrl = Annotated[str, pydantic.AfterValidator(_check_url)]
+CoercedStr = Annotated[str, pydantic.BeforeValidator(_coerce_str)]
+
+
+class OpenApiBaseModel(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(coerce_numbers_to_str=True)
+
+    def _exclude(
+        self,
+        *,
+        exclude_components: bool,
+        exclude_raw_api: bool,
+        keep_references: bool,
+    ) -> t.Tuple[t.Dict[str, t.Any], export.References]:
+        exclude: t.Dict[str, t.Any] = {}
+        references: export.References = []
+
+        if keep_references:
+            raw_api = getattr(self, "raw_api", None)
+            if raw_api is None:
+                raise ValueError("References can only be kept in an api export")
+            # components are kept, the references point to them
+            exclude, references = export.reference_exclusions(raw_api, self)
+        elif exclude_components:
+            exclude["components"] = True
+
+        if exclude_raw_api:
+            exclude["raw_api"] = True
+
+        return exclude, references
+
+    def _dump(
+        self,
+        *,
+        mode: str,
+        exclude_components: bool,
+        exclude_raw_api: bool,
+        keep_references: bool,
+    ) -> t.Dict[str, t.Any]:
+        exclude, references = self._exclude(
+            exclude_components=exclude_components,
+            exclude_raw_api=exclude_raw_api,
+            keep_references=keep_references,
+        )
+        document = self.model_dump(
+            mode=mode,
+            by_alias=True,
+            exclude_unset=True,
+            exclude_none=True,
+            exclude=exclude,
+        )
+        return export.insert_references(document, references)  # type: ignore
+
+    def as_clean_json(
+        self,
+        *,
+        exclude_components: bool = True,
+        exclude_raw_api: bool = True,
+        keep_references: bool = False,
+    ) -> str:
+        # same output than the pydantic v1 .json()
+        return json.dumps(
+            self._dump(
+                mode="json",
+                exclude_components=exclude_components,
+                exclude_raw_api=exclude_raw_api,
+                keep_references=keep_references,
+            ),
+        )
+
+    def as_clean_dict(
+        self,
+        *,
+        exclude_components: bool = True,
+        exclude_raw_api: bool = True,
+        keep_references: bool = False,
+    ) -> t.Dict[str, t.Any]:
+        return self._dump(
+            mode="python",
+            exclude_components=exclude_components,
+            exclude_raw_api=exclude_raw_api,
+            keep_references=keep_references,
+        )
+
+
+class RefModel(OpenApiBaseModel):
+    ref: t.Optional[str] = Field(
+        None,
+        alias="$ref",
+    )
+
+    @pydantic.model_validator(mode="before")
+    @classmethod
+    def _reference_interpolation(
+        cls,
+        values: t.Any,
+        info: pydantic.ValidationInfo,
+    ) -> t.Any:
+        # the validation context is the references targets of the api
+        if isinstance(values, dict) and "$ref" in values and info.context:
+            targets: resolver.ReferenceTargets = info.context
+            return targets.resolve(values)
+        return values
+
+    # wrap validators run before the "before" ones defined above them
+    @pydantic.model_validator(mode="wrap")
+    @classmethod
+    def _share_source(
+        cls,
+        values: t.Any,
+        handler: pydantic.ValidatorFunctionWrapHandler,
+    ) -> t.Any:
+        sharing = pool.SourceSharing.active
+        if sharing is None or not isinstance(values, dict):
+            return handler(values)
+        return sharing.get_or_create(cls, values, handler)
+
+
+class BaseModelForbid(RefModel):
+    model_config = pydantic.ConfigDict(extra="forbid")
+
+
+class BaseModelAllow(RefModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+
+
+class JsonType(enum.Enum):
+    integer = "integer"
+    string = "string"
+    array = "array"
+    object_ = "object"
+    boolean = "boolean"
+    number = "number"
+
+
+class SecurityIn(enum.Enum):
+    query = "query"
+    header = "header"
+    cookie = "cookie"
+
+
+Discriminator = t.Mapping[str, t.Dict[str, str]]
+
+
+class XML(BaseModelForbid):
+    name: t.Optional[str] = None
+    namespace: t.Optional[AnyUrl] = None
+    prefix: t.Optional[str] = None
+    attribute: t.Optional[bool] = None
+    wrapped: t.Optional[bool] = None
+
+
+class ExternalDocs(BaseModelForbid):
+    description: t.Optional[str] = None
+    url: t.Optional[AnyUrl] = None
+
+
+SchemaUnion = Annotated[
+    t.Union[
+        t.Mapping[str, "Schema"],
+        "Schema",
+    ],
+    LEFT_TO_RIGHT,
+]
+
+
+class Schema(BaseModelAllow):
+    title: t.Optional[str] = None
+    multiple_of: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="multipleOf",
+    )
+    maximum: t.Optional[int] = None
+    exclusive_maximum: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="exclusiveMaximum",
+    )
+    minimum: t.Optional[int] = None
+    exclusive_minimum: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="exclusiveMinimum",
+    )
+    max_length: t.Optional[int] = Field(
+        None,
+        alias="maxLength",
+    )
+    min_length: t.Optional[int] = Field(
+        None,
+        alias="minLength",
+    )
+    pattern: t.Optional[t.Pattern] = None
+    max_items: t.Optional[int] = Field(
+        None,
+        alias="maxItems",
+    )
+    min_items: t.Optional[int] = Field(
+        None,
+        alias="minItems",
+    )
+    unique_items: t.Optional[t.Any] = Field(
+        None,
+        alias="uniqueItems",
+    )
+    max_properties: t.Optional[int] = Field(
+        None,
+        alias="maxProperties",
+    )
+    min_properties: t.Optional[int] = Field(
+        None,
+        alias="minProperties",
+    )
+    required: t.Optional[t.List[str]] = None
+    enum: t.Optional[t.List[CoercedStr]] = None
+    type: t.Optional[JsonType] = None
+    all_of: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="allOf",
+    )
+    one_of: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="oneOf",
+    )
+    any_of: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="anyOf",
+    )
+    not_: t.Optional[t.List[SchemaUnion]] = Field(
+        None,
+        alias="not",
+    )
+    items: t.Optional[SchemaUnion] = None
+    properties: t.Optional[SchemaUnion] = None
+    additional_properties: t.Optional[SchemaUnion] = Field(
+        None,
+        alias="additionalProperties",
+    )
+    description: t.Optional[str] = None
+    format: t.Optional[str] = None
+    default: t.Any = None
+    nullable: t.Optional[bool] = None
+    discriminator: t.Optional[Discriminator] = None
+    read_only: t.Optional[bool] = Field(
+        None,
+        alias="readOnly",
+    )
+    write_only: t.Optional[bool] = Field(
+        None,
+        alias="writeOnly",
+    )
+    xml: t.Optional[XML] = None
+    external_docs: t.Optional[ExternalDocs] = Field(
+        None,
+        alias="externalDocs",
+    )
+    example: t.Any = None
+    deprecated: t.Optional[CoercedStr] = None
+
+
+class Example(BaseModelAllow):
+    summary: t.Optional[str] = None
+    description: t.Optional[str] = None
+    value: t.Any = None
+    externalValue: t.Optional[AnyUrl] = None
+
+
+class Header(BaseModelForbid):
+    description: t.Optional[str] = None
+    required: t.Optional[bool] = None
+    deprecated: t.Optional[bool] = None
+    allow_empty_value: t.Optional[bool] = Field(
+        None,
+        alias="allowEmptyValue",
+    )
+    schema_: t.Optional[SchemaUnion] = Field(
+        None,
+        alias="schema",
+    )
+
+
+HeadersUnion = t.Optional[t.Mapping[str, Header]]
+
+
+class Encoding(BaseModelForbid):
+    content_type: t.Optional[t.Union[str, MediaType]] = Field(
+        None,
+        alias="contentType",
+    )
+    headers: HeadersUnion = None
+    style: t.Optional[str] = None
+    explode: t.Optional[bool] = None
+    allow_reserved: t.Optional[bool] = Field(
+        None,
+        alias="allowReserved",
+    )
+
+
+class MediaTypeObject(OpenApiBaseModel):
+    schema_: t.Optional[SchemaUnion] = Field(
+        None,
+        alias="schema",
+    )
+    example: t.Any = None
+    examples: t.Optional[t.Mapping[str, Example]] = None
+    encoding: t.Optional[t.Mapping[str, Encoding]] = None
+
+
+MediaTypeMap = t.Mapping[MediaType, MediaTypeObject]
+
+
+class Response(BaseModelForbid):
+    description: str
+    content: t.Optional[MediaTypeMap] = None
+    headers: HeadersUnion = None
+    links: t.Optional[t.Mapping[str, "Link"]] = None
+
+
+class RequestBody(BaseModelForbid):
+    description: t.Optional[str] = None
+    required: t.Optional[bool] = None
+    content: t.Optional[MediaTypeMap] = None
+
+
+class ServerVariables(BaseModelForbid):
+    enum: t.Optional[t.List[CoercedStr]] = None
+    default: str
+    description: t.Optional[str] = None
+
+
+class Server(BaseModelAllow):
+    url: t.Optional[str] = None
+    description: t.Optional[str] = None
+    variables: t.Optional[t.Mapping[str, ServerVariables]] = None
+
+
+SecurityRequirement = t.Mapping[str, t.List[str]]
+
+
+class Link(BaseModelForbid):
+    operation_ref: t.Optional[str] = Field(
+        None,
+        alias="operationRef",
+    )
+    operation_id: t.Optional[str] = Field(
+        None,
+        alias="operationId",
+    )
+    request_body: t.Optional[t.Any] = Field(
+        None,
+        alias="requestBody",
+    )
+    parameters: t.Optional[t.Mapping[str, t.Any]] = None
+    description: t.Optional[str] = None
+    server: t.Optional[Server] = None
+
+
+Response.model_rebuild()
+
+
+class Parameter(BaseModelForbid):
+    # https://github.com/OAI/OpenAPI-Specification/blob/main/versions/3.0.2.md#parameterObject
+    name: str
+    in_: str = Field(
+        alias="in",
+    )
+    description: t.Optional[str] = None
+    required: t.Optional[bool] = None
+    deprecated: t.Optional[bool] = None
+    allow_empty_value: t.Optional[bool] = Field(
+        None,
+        alias="allowEmptyValue",
+    )
+    schema_: t.Optional[SchemaUnion] = Field(
+        None,
+        alias="schema",
+    )
+    style: t.Optional[str] = None
+    explode: t.Optional[CoercedStr] = None
+    allow_reserved: t.Optional[bool] = Field(
+        None,
+        alias="allowReserved",
+    )
+    example: t.Any = None
+    examples: t.Optional[Example] = None
+
+
+Callback = t.Mapping[str, "PathItem"]
+
+
+class Operation(BaseModelAllow):
+    tags: t.Optional[t.List[str]] = None
+    summary: t.Optional[str] = None
+    description: t.Optional[str] = None
+    external_docs: t.Optional[ExternalDocs] = Field(
+        None,
+        alias="externalDocs",
+    )
+    operation_id: t.Optional[str] = Field(
+        None,
+        alias="operationId",
+    )
+    responses: t.Mapping[HTTPStatusCode, Response]
+    parameters: t.Optional[t.List[Parameter]] = None
+    request_body: t.Optional[RequestBody] = Field(
+        None,
+        alias="requestBody",
+    )
+    callbacks: t.Optional[t.Mapping[str, Callback]] = None
+    deprecated: t.Optional[bool] = None
+    security: t.Optional[t.List[SecurityRequirement]] = None
+    servers: t.Optional[t.List[Server]] = None
+
+
+class PathItem(BaseModelAllow):
+    summary: t.Optional[str] = None
+    description: t.Optional[str] = None
+    get: t.Optional[Operation] = None
+    post: t.Optional[Operation] = None
+    put: t.Optional[Operation] = None
+    path: t.Optional[Operation] = None
+    delete: t.Optional[Operation] = None
+    head: t.Optional[Operation] = None
+    options: t.Optional[Operation] = None
+    trace: t.Optional[Operation] = None
+    servers: t.Optional[t.List[Server]] = None
+    parameters: t.Optional[t.List[Parameter]] = None
+
+
+Operation.model_rebuild()
+
+
+class OAuthFlowImplicit(BaseModelForbid):
+    refresh_url: t.Optional[AnyUrl] = Field(
+        None,
+        alias="refreshUrl",
+    )
+    scopes: t.Optional[t.Dict[str, str]] = None
+    authorization_url: AnyUrl = Field(alias="authorizationUrl")
+
+
+class OAuthFlowPassword(BaseModelForbid):
+    refresh_url: t.Optional[AnyUrl] = Field(
+        None,
+        alias="refreshUrl",
+    )
+    scopes: t.Optional[t.Dict[str, str]] = None
+    token_url: AnyUrl = Field(alias="tokenUrl")
+
+
+class OAuthFlowClientCredentials(BaseModelForbid):
+    refresh_url: t.Optional[AnyUrl] = Field(
+        None,
+        alias="refreshUrl",
+    )
+    scopes: t.Optional[t.Dict[str, str]] = None
+    token_url: AnyUrl = Field(alias="tokenUrl")
+
+
+class OAuthFlowAuthorizationCode(BaseModelForbid):
+    refresh_url: t.Optional[AnyUrl] = Field(
+        None,
+        alias="refreshUrl",
+    )
+    scopes: t.Optional[t.Dict[str, str]] = None
+    token_url: AnyUrl = Field(alias="tokenUrl")
+    authorization_url: AnyUrl = Field(alias="authorizationUrl")
+
+
+class OAuthFlows(BaseModelForbid):
+    implicit: t.Optional[OAuthFlowImplicit] = None
+    password: t.Optional[OAuthFlowPassword] = None
+    client_credentials: t.Optional[OAuthFlowClientCredentials] = Field(
+        None,
+        alias="clientCredentials",
+    )
+    authorization_code: t.Optional[OAuthFlowAuthorizationCode] = Field(
+        None,
+        alias="authorizationCode",
+    )
+
+
+class SecuritySchemeOAuth2(BaseModelForbid):
+    type: str = "oauth2"
+    description: t.Optional[str] = None
+    flows: OAuthFlows
+
+
+class SecuritySchemeApiKey(BaseModelForbid):
+    type: str = "apiKey"
+    description: t.Optional[str] = None
+    name: str
+    in_: SecurityIn = Field(alias="in")
+
+
+class SecuritySchemeOpenIdConnect(BaseModelForbid):
+    type: str = "openIdConnect"
+    description: t.Optional[str] = None
+    open_id_connect_url: str = Field(alias="openIdConnectUrl")
+
+
+class SecuritySchemeHttp(BaseModelForbid):
+    type: str = "http"
+    description: t.Optional[str] = None
+    scheme: str
+    bearer_format: t.Optional[str] = Field(
+        None,
+        alias="bearerFormat",
+    )
+
+
+SecuritySchemeUnion = Annotated[
+    t.Union[
+        SecuritySchemeOAuth2,
+        SecuritySchemeApiKey,
+        SecuritySchemeOpenIdConnect,
+        SecuritySchemeHttp,
+    ],
+    LEFT_TO_RIGHT,
+]
+
+
+class Components(BaseModelForbid):
+    headers: HeadersUnion = None
+    schemas: t.Optional[t.Mapping[str, Schema]] = None
+    responses: t.Optional[t.Mapping[str, Response]] = None
+    parameters: t.Optional[t.Mapping[str, Parameter]] = None
+    examples: t.Optional[t.Mapping[str, Example]] = None
+    request_bodies: t.Optional[t.Mapping[str, RequestBody]] = Field(
+        None,
+        alias="requestBodies",
+    )
+    links: t.Optional[t.Mapping[str, Link]] = None
+    callbacks: t.Optional[t.Mapping[str, Callback]] = None
+    security_schemes: t.Optional[t.Mapping[str, SecuritySchemeUnion]] = Field(
+        None,
+        alias="securitySchemes",
+    )
+
+
+Paths = t.Mapping[str, PathItem]
+
+
+class Contact(BaseModelForbid):
+    name: t.Optional[str] = None
+    url: t.Optional[AnyUrl] = None
+    email: t.Optional[pydantic.EmailStr] = None
+
+
+class License(BaseModelForbid):
+    name: str
+    url: t.Optional[AnyUrl] = None
+
+
+class Info(BaseModelAllow):
+    contact: t.Optional[Contact] = None
+    description: t.Optional[str] = None
+    license: t.Optional[License] = None
+    terms_of_service: t.Optional[AnyUrl] = Field(
+        None,
+        alias="termsOfService",
+    )
+    title: str
+    version: str
+
+
+class Tag(BaseModelForbid):
+    name: str
+    description: t.Optional[str] = None
+    external_docs: t.Optional[ExternalDocs] = Field(
+        None,
+        alias="externalDocs",
+    )
+
+
+Schema.model_rebuild()
+PathItem.model_rebuild()
+Components.model_rebuild()
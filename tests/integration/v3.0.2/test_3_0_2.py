@@ -1,9 +1,16 @@
 import json
+import os
+import typing as t
 
 import pytest
+import yaml
 
 import openapydantic
 from openapydantic import common
+from openapydantic import compat
+from openapydantic import limits
+from openapydantic import pool
+from openapydantic import precheck
 from openapydantic import versions
 from tests.integration import conftest
 
@@ -12,6 +19,7 @@ SpecVersion = conftest.SpecVersion
 FixtureLoader = conftest.FixtureLoader
 FixturesVersion = conftest.FixturesVersion
 OpenApiVersion = common.OpenApiVersion
+ModelBackend = common.ModelBackend
 
 load_api = openapydantic.load_api
 load_api_302 = versions.openapi_302.load_api
@@ -96,6 +104,77 @@ async def test_parse_api_self_reference(
     assert expected == json.loads(api.as_clean_json())
 
 
+@pytest.mark.asyncio
+async def test_parse_api_mutual_reference(
+    fixture_loader: FixtureLoader,
+) -> None:
+    expected = fixture_loader.load_json(filename="mutual-reference.json")
+    raw_api = fixture_loader.load_yaml(filename="mutual-reference.yaml")
+
+    api = load_api_302(raw_api=raw_api)
+
+    assert expected == json.loads(api.as_clean_json())
+
+
+@pytest.mark.asyncio
+async def test_parse_api_json_pointer(
+    fixture_loader: FixtureLoader,
+) -> None:
+    expected = fixture_loader.load_json(filename="json-pointer.json")
+    raw_api = fixture_loader.load_yaml(filename="json-pointer.yaml")
+
+    api = load_api_302(raw_api=raw_api)
+    trusted_api = versions.openapi_302.construct_api(raw_api=raw_api)
+
+    assert expected == json.loads(api.as_clean_json())
+    assert expected == json.loads(trusted_api.as_clean_json())
+    if compat.PYDANTIC_V2:
+        v2_api = versions.get_version_module(
+            OpenApiVersion.v3_0_2,
+            ModelBackend.pydantic_v2,
+        ).load_api(raw_api=raw_api)
+        assert expected == json.loads(v2_api.as_clean_json())
+
+
+@pytest.mark.asyncio
+async def test_load_api_external_references(
+    fixture_loader: FixtureLoader,
+) -> None:
+    expected = fixture_loader.load_json(filename="external.json")
+    file_path = os.path.join(fixture_loader.fixture_dir, "external", "api.yaml")
+
+    api = await load_api(file_path=file_path)
+
+    assert expected == json.loads(api.as_clean_json())
+    assert set(api.raw_api["components"]["schemas"]) == {
+        "Pet",
+        "Error",
+        "pet",
+        "Category",
+        "Node",
+        "edge",
+    }
+
+
+@pytest.mark.asyncio
+async def test_load_api_split_path_items(
+    fixture_loader: FixtureLoader,
+) -> None:
+    file_path = os.path.join(fixture_loader.fixture_dir, "split", "api.yaml")
+
+    api = await load_api(file_path=file_path)
+
+    # path items have no component slot: inlined, not lifted as schemas
+    components = api.raw_api["components"]
+    assert set(components) == {"parameters", "schemas"}
+    assert set(components["schemas"]) == {"Pet"}
+    assert api.paths["/pets"].get.summary == "List pets"
+    assert api.paths["/pets"].get.parameters[0].name == "limit"
+    assert api.paths["/pets/{id}"].parameters[0].in_ == "path"
+    schema = api.paths["/pets/{id}"].get.responses["200"].content["application/json"]
+    assert schema.schema_.properties["name"].type.value == "string"
+
+
 @pytest.mark.parametrize(
     "api_index",
     [(1), (2), (3), (4)],
@@ -113,6 +192,310 @@ async def test_reference_interpolation_x(
     assert expected == json.loads(api.as_clean_json())
 
 
+@pytest.mark.parametrize(
+    "file_path",
+    retro_fixture.ok + fixtures_v3_0_2.ok,
+)
+@pytest.mark.asyncio
+async def test_load_api_trusted_same_as_validated(
+    file_path: str,
+) -> None:
+    api = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+    )
+
+    trusted_api = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+        trusted=True,
+        fingerprint=api.fingerprint(),
+    )
+
+    assert trusted_api.as_clean_dict(
+        exclude_components=False,
+        exclude_raw_api=False,
+    ) == api.as_clean_dict(
+        exclude_components=False,
+        exclude_raw_api=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    retro_fixture.ok + fixtures_v3_0_2.ok,
+)
+@pytest.mark.asyncio
+async def test_load_api_pool(
+    file_path: str,
+) -> None:
+    component_pool = pool.ComponentPool()
+    api = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+    )
+
+    first = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+        pool=component_pool,
+    )
+    second = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+        pool=component_pool,
+        trusted=True,
+        fingerprint=api.fingerprint(),
+    )
+
+    for pooled_api in (first, second):
+        assert pooled_api.as_clean_dict(exclude_components=False) == (
+            api.as_clean_dict(exclude_components=False)
+        )
+    for path, path_item in first.paths.items():
+        assert second.paths[path] is path_item
+
+
+@pytest.mark.asyncio
+async def test_load_api_include(
+    fixture_loader: FixtureLoader,
+) -> None:
+    file_path = os.path.join(fixture_loader.fixture_dir, "ok", "petstore.yaml")
+    api = await load_api(file_path=file_path)
+
+    sliced_api = await load_api(
+        file_path=file_path,
+        include_paths=["/user/*"],
+        include_tags=["store"],
+        include_operation_ids=["getPetById"],
+    )
+
+    assert list(sliced_api.paths) == [
+        "/pet/{petId}",
+        "/store/inventory",
+        "/store/order",
+        "/store/order/{orderId}",
+        "/user/createWithArray",
+        "/user/createWithList",
+        "/user/login",
+        "/user/logout",
+        "/user/{username}",
+    ]
+    assert list(sliced_api.paths["/pet/{petId}"].dict(exclude_none=True)) == ["get"]
+    assert sliced_api.paths["/user/login"] == api.paths["/user/login"]
+    assert set(sliced_api.components.schemas) == {  # type: ignore
+        "Category",
+        "Order",
+        "Pet",
+        "Tag",
+        "User",
+    }
+
+
+@pytest.mark.parametrize("file_path", fixtures_v3_0_2.ok)
+@pytest.mark.asyncio
+async def test_load_api_precheck_ok(
+    file_path: str,
+) -> None:
+    await load_api(file_path=file_path, precheck=True)
+
+
+@pytest.mark.asyncio
+async def test_load_api_precheck_ko(
+    tmp_path: t.Any,
+) -> None:
+    file_path = str(tmp_path / "api.yaml")
+    with open(file_path, "w") as file:
+        yaml.safe_dump(
+            {
+                "openapi": "3.0.2",
+                "info": {"title": "api"},
+                "paths": {"/pets": {"get": {"$ref": "#/components/schemas/Pet"}}},
+            },
+            file,
+        )
+
+    with pytest.raises(precheck.PrecheckError) as error:
+        await load_api(file_path=file_path, max_errors=5)
+    assert [str(issue) for issue in error.value.issues] == [
+        "#/info: missing required key:version",
+        "#/paths/~1pets/get: missing required key:responses",
+        "#/paths/~1pets/get/$ref: unresolvable reference #/components/schemas/Pet "
+        "(Pointer not found:#/components/schemas/Pet)",
+    ]
+
+    with pytest.raises(precheck.PrecheckError) as error:
+        await load_api(file_path=file_path, fail_fast=True)
+    assert len(error.value.issues) == 1
+
+
+@pytest.mark.parametrize("file_path", fixtures_v3_0_2.ok)
+@pytest.mark.asyncio
+async def test_load_api_limits_ok(
+    file_path: str,
+) -> None:
+    await load_api(file_path=file_path, limits=limits.Limits.untrusted())
+
+
+@pytest.mark.asyncio
+async def test_load_api_limits_ko(
+    tmp_path: t.Any,
+) -> None:
+    schemas: t.Dict[str, t.Any] = {"S0": {"type": "string"}}
+    for index in range(1, 41):
+        previous = {"$ref": f"#/components/schemas/S{index - 1}"}
+        schemas[f"S{index}"] = {"properties": {"a": previous, "b": previous}}
+    file_path = str(tmp_path / "api.yaml")
+    with open(file_path, "w") as file:
+        yaml.safe_dump(
+            {
+                "openapi": "3.0.2",
+                "info": {"title": "api", "version": "1"},
+                "paths": {},
+                "components": {"schemas": schemas},
+            },
+            file,
+        )
+
+    with pytest.raises(limits.LimitExceeded, match="5000000 nodes"):
+        await load_api(file_path=file_path, limits=limits.Limits.untrusted())
+    with pytest.raises(limits.LimitExceeded, match="bytes"):
+        await load_api(file_path=file_path, limits=limits.Limits(max_document_size=10))
+
+
+ALIASES_SPEC = """
+openapi: 3.0.2
+info: {title: api, version: '1'}
+paths:
+  /pets:
+    get:
+      responses:
+        '200': &ok
+          description: ok
+          content:
+            application/json:
+              schema: &pet {type: object, properties: {id: {type: integer}}}
+  /users:
+    get:
+      responses:
+        '200': *ok
+        '201': {description: created, content: {application/json: {schema: *pet}}}
+"""
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        ModelBackend.pydantic_v1,
+        pytest.param(
+            ModelBackend.pydantic_v2,
+            marks=pytest.mark.skipif(
+                not compat.PYDANTIC_V2,
+                reason="requires pydantic v2",
+            ),
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_load_api_share_aliases(
+    tmp_path: t.Any,
+    backend: ModelBackend,
+) -> None:
+    file_path = str(tmp_path / "api.yaml")
+    with open(file_path, "w") as file:
+        file.write(ALIASES_SPEC)
+
+    api = await load_api(file_path=file_path, backend=backend)
+    shared_api = await load_api(
+        file_path=file_path,
+        backend=backend,
+        share_aliases=True,
+    )
+
+    def responses(api: t.Any) -> t.List[t.Any]:
+        return [
+            api.paths["/pets"].get.responses["200"],
+            api.paths["/users"].get.responses["200"],
+            api.paths["/users"].get.responses["201"],
+        ]
+
+    first, second, created = responses(shared_api)
+    assert first is second
+    assert (
+        first.content["application/json"].schema_
+        is created.content["application/json"].schema_
+    )
+    first, second, _ = responses(api)
+    assert first is not second
+    assert shared_api.as_clean_json() == api.as_clean_json()
+
+
+@pytest.mark.asyncio
+async def test_query(
+    fixture_loader: FixtureLoader,
+) -> None:
+    file_path = os.path.join(fixture_loader.fixture_dir, "ok", "petstore.yaml")
+    api = await load_api(file_path=file_path)
+
+    assert api.query("$.paths['/pet/{petId}'].get.operationId") == ["getPetById"]
+    assert "array" in api.query("$.paths.*.*.responses['200'].content.*.schema.type")
+    assert api.query("$..operationId") == [
+        operation["operationId"]
+        for path_item in api.raw_api["paths"].values()
+        for operation in path_item.values()
+    ]
+    # references are interpolated
+    user = json.loads(api.as_clean_json(exclude_components=False))["components"][
+        "schemas"
+    ]["User"]
+    schemas = api.query("$.paths['/user/{username}'].get.responses.*.content.*.schema")
+    assert schemas[0] == user
+
+
+@pytest.mark.skipif(not compat.PYDANTIC_V2, reason="requires pydantic v2")
+@pytest.mark.parametrize(
+    "file_path",
+    retro_fixture.ok + fixtures_v3_0_2.ok,
+)
+@pytest.mark.asyncio
+async def test_load_api_pydantic_v2_backend_same_as_v1(
+    file_path: str,
+) -> None:
+    api = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+    )
+
+    v2_api = await load_api(
+        file_path=file_path,
+        version=OpenApiVersion.v3_0_2,
+        backend=ModelBackend.pydantic_v2,
+    )
+
+    assert v2_api.__version__ == api.__version__
+    # enums are distinct classes in each backend: compared as json
+    assert json.loads(v2_api.as_clean_json(exclude_components=False)) == (
+        json.loads(api.as_clean_json(exclude_components=False))
+    )
+
+
+@pytest.mark.skipif(not compat.PYDANTIC_V2, reason="requires pydantic v2")
+@pytest.mark.parametrize(
+    "file_path",
+    retro_fixture.ko + fixtures_v3_0_2.ko,
+)
+@pytest.mark.asyncio
+async def test_load_api_pydantic_v2_backend_ko(
+    file_path: str,
+) -> None:
+    with pytest.raises(Exception):
+        await load_api(
+            file_path=file_path,
+            version=OpenApiVersion.v3_0_2,
+            backend=ModelBackend.pydantic_v2,
+        )
+
+
 # @pytest.mark.asyncio
 # async def test_reference_interpolation_x_index(fixture_loader: FixtureLoader) -> None:
 #     raw_api = fixture_loader.load_yaml(filename="components_4.yaml")
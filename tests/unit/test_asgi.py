@@ -0,0 +1,257 @@
+import asyncio
+import json
+import os
+import typing as t
+
+import pytest
+
+from openapydantic import asgi
+from openapydantic import payloads
+from openapydantic import versions
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+PET = {"id": 1, "name": "rex", "photoUrls": []}
+
+
+@pytest.fixture(name="api", scope="module")
+def fixture_api() -> t.Any:
+    file_path = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    return asyncio.run(versions.load_api(file_path=file_path))
+
+
+async def pets_app(
+    scope: t.Dict[str, t.Any],
+    receive: t.Any,
+    send: t.Any,
+) -> None:
+    # echoes the request body, or returns PET (with ?name=... as name)
+    message = await receive()
+    body = message.get("body") or json.dumps(PET).encode()
+    if scope["query_string"].startswith(b"name="):
+        body = json.dumps({**PET, "name": int(scope["query_string"][5:])}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _call(
+    app: t.Any,
+    method: str,
+    path: str,
+    *,
+    query: bytes = b"",
+    body: bytes = b"",
+    content_type: bytes = b"application/json",
+) -> t.Tuple[int, t.Any]:
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(b"content-type", content_type)],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent: t.List[t.Dict[str, t.Any]] = []
+
+    async def receive() -> t.Dict[str, t.Any]:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: t.Dict[str, t.Any]) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def _request(
+    app: t.Any,
+    method: str,
+    path: str,
+    **kwargs: t.Any,
+) -> t.Tuple[int, t.Any]:
+    return asyncio.run(_call(app, method, path, **kwargs))
+
+
+def test_route_index() -> None:
+    operation = {"responses": {}}
+    raw_api = {
+        "paths": {
+            "/pets/{id}": {"get": operation},
+            "/pets/{id}/photos/{photo}": {"get": operation},
+            "/pets/mine": {"get": operation},
+            "/users/{user}.json": {"put": operation},
+        },
+    }
+    index = asgi.RouteIndex(raw_api, base_path="/v1/")
+
+    assert index.match("GET", "/v1/pets/mine") == asgi.Route("/pets/mine", "get", {})
+    assert index.match("GET", "/v1/pets/3") == asgi.Route(
+        "/pets/{id}",
+        "get",
+        {"id": "3"},
+    )
+    assert index.match("GET", "/v1/pets/3/photos/a b") == asgi.Route(
+        "/pets/{id}/photos/{photo}",
+        "get",
+        {"id": "3", "photo": "a b"},
+    )
+    assert index.match("PUT", "/v1/users/ann.json").params == {"user": "ann"}
+    assert index.match("POST", "/v1/pets/3") is None
+    assert index.match("GET", "/pets/3") is None
+    assert index.match("GET", "/v1/pets") is None
+
+
+def test_middleware_requests(
+    api: t.Any,
+) -> None:
+    violations: t.List[asgi.Violation] = []
+    app = asgi.ContractValidationMiddleware(
+        pets_app,
+        api=api,
+        on_violation=violations.append,
+    )
+
+    assert _request(app, "GET", "/pet/1") == (200, PET)
+    assert _request(app, "GET", "/pet/x") == (
+        400,
+        {
+            "errors": [
+                {"location": "path:petId#", "message": "expected integer, got string"},
+            ],
+        },
+    )
+    status, content = _request(app, "GET", "/pet/findByStatus")
+    assert content["errors"] == [
+        {"location": "query:status", "message": "missing parameter"},
+    ]
+    status, content = _request(
+        app,
+        "GET",
+        "/pet/findByStatus",
+        query=b"status=sold,lost",
+    )
+    assert content["errors"] == [
+        {"location": "query:status#/1", "message": "not one of the enum values"},
+    ]
+    assert _request(app, "GET", "/pet/findByStatus", query=b"status=sold")[0] == 200
+
+    body = json.dumps({"name": "rex"}).encode()
+    status, content = _request(app, "POST", "/pet", body=body)
+    assert content["errors"] == [
+        {"location": "body#", "message": "missing required property:photoUrls"},
+    ]
+    xml = {"body": b"<pet/>", "content_type": b"text/xml"}
+    status, content = _request(app, "POST", "/pet", **xml)
+    assert content["errors"][0]["message"] == "undocumented media type:text/xml"
+    # pass through
+    assert _request(app, "GET", "/unknown")[0] == 200
+
+    assert [violation.path for violation in violations] == [
+        "/pet/{petId}",
+        "/pet/findByStatus",
+        "/pet/findByStatus",
+        "/pet",
+        "/pet",
+    ]
+    assert app.metrics.requests == 8
+    assert app.metrics.invalid_requests == 5
+    assert app.metrics.unmatched == 1
+    assert app.metrics.sampled_responses == 0
+    assert 0 < app.metrics.mean_overhead <= app.metrics.max_overhead
+
+
+def test_middleware_report_only(
+    api: t.Any,
+) -> None:
+    app = asgi.ContractValidationMiddleware(
+        pets_app,
+        api=api,
+        reject_invalid_requests=False,
+    )
+
+    # the application gets the body read by the middleware
+    body = json.dumps({"name": "rex"}).encode()
+    assert _request(app, "PUT", "/pet", body=body) == (200, {"name": "rex"})
+    assert app.metrics.invalid_requests == 1
+
+
+def test_middleware_responses(
+    api: t.Any,
+) -> None:
+    violations: t.List[asgi.Violation] = []
+    app = asgi.ContractValidationMiddleware(
+        pets_app,
+        api=api,
+        response_sample_rate=1,
+        on_violation=violations.append,
+    )
+
+    assert _request(app, "GET", "/pet/1")[0] == 200
+    assert not violations
+    assert _request(app, "GET", "/pet/1", query=b"name=3")[0] == 200
+    # PUT /pet does not document 200 responses
+    assert _request(app, "PUT", "/pet", body=json.dumps(PET).encode())[0] == 200
+
+    error = payloads.PayloadError("response#/name", "expected string, got integer")
+    assert violations == [
+        asgi.Violation("response", "get", "/pet/{petId}", 200, [error]),
+        asgi.Violation(
+            "response",
+            "put",
+            "/pet",
+            200,
+            [payloads.PayloadError("response", "undocumented status:200")],
+        ),
+    ]
+    assert app.metrics.sampled_responses == 3
+    assert app.metrics.invalid_responses == 2
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"background": True}, {"latency_budget": 0}],
+)
+def test_middleware_responses_in_background(
+    api: t.Any,
+    options: t.Dict[str, t.Any],
+) -> None:
+    app = asgi.ContractValidationMiddleware(
+        pets_app,
+        api=api,
+        response_sample_rate=1,
+        **options,
+    )
+
+    async def requests() -> None:
+        await _call(app, "GET", "/pet/1", query=b"name=3")
+        await app.drain()
+
+    asyncio.run(requests())
+
+    assert app.metrics.invalid_responses == 1
+    assert app.metrics.over_budget == ("latency_budget" in options)
+
+
+def test_middleware_not_sampled(
+    api: t.Any,
+) -> None:
+    app = asgi.ContractValidationMiddleware(
+        pets_app,
+        api=api,
+        response_sample_rate=0,
+    )
+
+    assert _request(app, "GET", "/pet/1", query=b"name=3")[0] == 200
+    assert app.metrics.sampled_responses == 0
+    assert app.metrics.invalid_responses == 0
@@ -0,0 +1,133 @@
+import json
+import os
+import typing as t
+
+import pytest
+import yaml
+
+from openapydantic import bundler
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+def _schema_ref(name: str) -> t.Dict[str, str]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+def test_deduplicate_components() -> None:
+    error = {"type": "object", "properties": {"message": {"type": "string"}}}
+    raw_api = {
+        "paths": {"/a": {"$ref": "#/components/schemas/error"}},
+        "components": {
+            "schemas": {
+                "Error": error,
+                "error": dict(error),
+                "Wrapper": {"items": _schema_ref("error")},
+                "wrapper": {"items": _schema_ref("Error")},
+                "Tag": {"type": "string"},
+                "tag": {"type": "string"},
+            },
+        },
+    }
+
+    result = bundler.deduplicate_components(
+        raw_api,
+        lifted=[
+            "#/components/schemas/error",
+            "#/components/schemas/wrapper",
+            "#/components/schemas/tag",
+        ],
+    )
+
+    assert set(result["components"]["schemas"]) == {"Error", "Wrapper", "Tag"}
+    assert result["paths"]["/a"] == _schema_ref("Error")
+    assert result["components"]["schemas"]["Wrapper"] == {"items": _schema_ref("Error")}
+
+
+def test_deduplicate_components_keep_root_components() -> None:
+    raw_api = {
+        "components": {
+            "schemas": {"A": {"type": "string"}, "B": {"type": "string"}},
+        },
+    }
+
+    result = bundler.deduplicate_components(raw_api, lifted=[])
+
+    assert set(result["components"]["schemas"]) == {"A", "B"}
+
+
+def test_prune_components() -> None:
+    raw_api = {
+        "paths": {"/a": {"get": {"schema": _schema_ref("A")}}},
+        "components": {
+            "schemas": {
+                "A": {"properties": {"b": _schema_ref("B")}},
+                "B": {"properties": {"a": _schema_ref("A")}},
+                "Unused": {"properties": {"a": _schema_ref("A")}},
+            },
+            "responses": {"Unused": {"description": "unused"}},
+            "securitySchemes": {"api_key": {"type": "apiKey"}},
+        },
+    }
+
+    result = bundler.prune_components(raw_api)
+
+    assert result["components"] == {
+        "schemas": {
+            "A": raw_api["components"]["schemas"]["A"],
+            "B": raw_api["components"]["schemas"]["B"],
+        },
+        "securitySchemes": raw_api["components"]["securitySchemes"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_bundle() -> None:
+    result = await bundler.bundle(
+        file_path=os.path.join(FIXTURE_DIR, "external", "api.yaml"),
+    )
+
+    assert set(result["components"]["schemas"]) == {
+        "Error",
+        "Category",
+        "pet",
+        "edge",
+        "Node",
+    }
+    assert result["components"]["parameters"]["limit"]["name"] == "limit"
+
+
+@pytest.mark.asyncio
+async def test_bundle_split_path_items() -> None:
+    result = await bundler.bundle(
+        file_path=os.path.join(FIXTURE_DIR, "split", "api.yaml"),
+    )
+
+    assert result["paths"]["/pets"]["get"]["summary"] == "List pets"
+    assert result["paths"]["/pets/{id}"]["get"]["responses"]["200"]["content"] == {
+        "application/json": {"schema": {"$ref": "#/components/schemas/Pet"}},
+    }
+    assert set(result["components"]["schemas"]) == {"Pet"}
+
+
+@pytest.mark.parametrize(
+    "output_format,loader",
+    [("json", json.loads), ("yaml", yaml.safe_load)],
+)
+def test_dump(
+    output_format: str,
+    loader: t.Callable[[str], t.Any],
+) -> None:
+    raw_api = {"openapi": "3.0.2", "paths": {}}
+
+    assert loader(bundler.dump(raw_api, output_format=output_format)) == raw_api
+
+
+def test_dump_ko() -> None:
+    with pytest.raises(ValueError):
+        bundler.dump({}, output_format="xml")
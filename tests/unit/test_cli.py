@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import typing as t
+
+import pytest
+import yaml
+
+import openapydantic
+from openapydantic import cli
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+def test_bundle(
+    tmp_path: t.Any,
+) -> None:
+    source = os.path.join(FIXTURE_DIR, "external", "api.yaml")
+    output = str(tmp_path / "bundle.json")
+
+    result = cli.main(["bundle", source, "-o", output, "-f", "json"])
+
+    assert result == 0
+    bundled_api = asyncio.run(openapydantic.load_api(file_path=output))
+    source_api = asyncio.run(openapydantic.load_api(file_path=source))
+    assert json.loads(bundled_api.as_clean_json()) == json.loads(
+        source_api.as_clean_json(),
+    )
+
+
+def test_bundle_stdout(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    source = os.path.join(FIXTURE_DIR, "external", "api.yaml")
+
+    cli.main(["bundle", source, "-f", "json"])
+
+    assert json.loads(capsys.readouterr().out)["openapi"] == "3.0.2"
+
+
+def test_diff(
+    tmp_path: t.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    source = os.path.join(FIXTURE_DIR, "self-reference.yaml")
+    with open(source) as file:
+        raw_api = yaml.safe_load(file)
+    del raw_api["paths"][next(iter(raw_api["paths"]))]
+    new = str(tmp_path / "new.yaml")
+    with open(new, "w") as file:
+        yaml.safe_dump(raw_api, file)
+
+    assert cli.main(["diff", source, source]) == 0
+    assert capsys.readouterr().out == ""
+
+    assert cli.main(["diff", source, new, "--fail-on-breaking"]) == 1
+    assert capsys.readouterr().out.startswith("BREAKING removed path #/paths/")
+
+    assert cli.main(["diff", source, new, "-f", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["changes"][0]["breaking"]
+
+
+def test_validate(
+    tmp_path: t.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    state = str(tmp_path / "state.json")
+    source = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    arguments = ["validate", source, "--state", state, "-f", "json"]
+
+    assert cli.main(arguments) == 0
+    assert json.loads(capsys.readouterr().out)["results"][0]["status"] == "passed"
+
+    assert cli.main(arguments) == 0
+    assert json.loads(capsys.readouterr().out)["results"][0]["status"] == "skipped"
+
+    source = os.path.join(FIXTURE_DIR, "ref-error-invalid-path-format.yaml")
+    assert cli.main(["validate", source, "--no-state"]) == 1
+    assert capsys.readouterr().out.startswith(f"FAILED {source}")
+
+    assert cli.main(["validate", str(tmp_path / "*.yaml")]) == 2
+
+    source = str(tmp_path / "broken.yaml")
+    with open(source, "w") as file:
+        yaml.safe_dump({"openapi": "3.0.2", "paths": []}, file)
+    assert cli.main(["validate", source, "--no-state", "--fail-fast"]) == 1
+    assert capsys.readouterr().out.splitlines()[1:3] == [
+        "PrecheckError: 1 structural error(s)",
+        "#: missing required key:info",
+    ]
+
+
+def test_daemon_not_running(
+    tmp_path: t.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    socket_path = str(tmp_path / "missing.sock")
+
+    assert cli.main(["daemon", "--socket", socket_path, "ping"]) == 2
+    assert capsys.readouterr().err
+
+
+def test_split(
+    tmp_path: t.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    source = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    output = str(tmp_path / "shards")
+
+    assert cli.main(["split", source, "-o", output, "-f", "json"]) == 0
+
+    assert sorted(os.listdir(output)) == ["pet.json", "store.json", "user.json"]
+    assert len(capsys.readouterr().out.splitlines()) == 3
+    api = asyncio.run(
+        openapydantic.load_api(file_path=os.path.join(output, "store.json")),
+    )
+    assert list(api.paths) == [
+        "/store/inventory",
+        "/store/order",
+        "/store/order/{orderId}",
+    ]
+
+
+def test_payloads(
+    tmp_path: t.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    source = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    pets = str(tmp_path / "pets.ndjson")
+    with open(pets, "w") as file:
+        file.write('[{"name": "a", "photoUrls": []}]\n[{"name": 1}]\n')
+    arguments = ["payloads", source, pets, "--operation", "findPetsByStatus"]
+
+    assert cli.main([*arguments, "--status-code", "200"]) == 1
+    assert capsys.readouterr().out.splitlines()[:3] == [
+        "line 2: #/0: missing required property:photoUrls",
+        "line 2: #/0/name: expected string, got integer",
+        "2 records, 1 valid, 1 invalid",
+    ]
+
+    assert cli.main(["payloads", source, pets, "--component", "Pet", "-f", "json"]) == 1
+    assert json.loads(capsys.readouterr().out)["errors"] == {
+        "#: expected object, got array": 2,
+    }
@@ -0,0 +1,105 @@
+import enum
+import re
+import typing as t
+
+from openapydantic import construct
+from openapydantic.compat import pydantic
+
+Field = pydantic.Field
+
+
+class Color(enum.Enum):
+    red = "red"
+    blue = "blue"
+
+
+class Child(pydantic.BaseModel):
+    name: str
+    in_: t.Optional[str] = Field(None, alias="in")
+
+    class Config:
+        extra = "forbid"
+
+
+class Parent(pydantic.BaseModel):
+    color: t.Optional[Color]
+    pattern: t.Optional[t.Pattern]
+    label: t.Optional[str]
+    children: t.Optional[t.List[Child]]
+    by_name: t.Optional[t.Mapping[str, Child]]
+    union: t.Optional[t.Union[t.Mapping[str, Child], Child]]
+    url: t.Optional[pydantic.AnyUrl]
+
+    class Config:
+        extra = "allow"
+
+
+def test_construct_nested_models_and_aliases() -> None:
+    values = {
+        "color": "red",
+        "pattern": "^a+$",
+        "label": 1,
+        "children": [{"name": "a", "in": "query"}],
+        "by_name": {"b": {"name": "b"}},
+        "x-extension": {"free": "value"},
+    }
+
+    result = construct.ModelConstructor().construct(Parent, values)
+
+    assert isinstance(result, Parent)
+    assert result.color == Color.red
+    assert isinstance(result.pattern, re.Pattern)
+    assert result.label == "1"
+    assert isinstance(result.children[0], Child)
+    assert result.children[0].in_ == "query"
+    assert isinstance(result.by_name["b"], Child)
+    assert result.union is None
+    assert result.dict(by_alias=True, exclude_unset=True) == Parent(**values).dict(
+        by_alias=True,
+        exclude_unset=True,
+    )
+
+
+def test_construct_union_structural_match() -> None:
+    constructor = construct.ModelConstructor()
+
+    mapping = constructor.construct(Parent, {"union": {"a": {"name": "a"}}})
+    single = constructor.construct(Parent, {"union": {"name": "a"}})
+
+    assert isinstance(mapping.union["a"], Child)
+    assert isinstance(single.union, Child)
+
+
+def test_construct_validates_remaining_types() -> None:
+    result = construct.ModelConstructor().construct(
+        Parent,
+        {"url": "http://swagger.io"},
+    )
+
+    assert isinstance(result.url, pydantic.AnyUrl)
+
+
+def test_construct_reference_hook() -> None:
+    shared = Child(name="shared")
+
+    def resolve_reference(
+        model: t.Type[pydantic.BaseModel],
+        values: t.Dict[str, t.Any],
+    ) -> t.Optional[pydantic.BaseModel]:
+        if values.get("$ref"):
+            return shared
+        return None
+
+    constructor = construct.ModelConstructor(resolve_reference=resolve_reference)
+
+    result = constructor.construct(Parent, {"children": [{"$ref": "#/a"}]})
+
+    assert result.children[0] is shared
+
+
+def test_get_model_signature() -> None:
+    signature = construct.get_model_signature(Child)
+
+    assert set(signature.fields) == {"name", "in"}
+    assert signature.required == {"name"}
+    assert signature.forbid_extra
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import shutil
+import socket
+import stat
+import typing as t
+
+import pytest
+
+from openapydantic import daemon
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+@pytest.fixture
+def spec_path(
+    tmp_path: t.Any,
+) -> str:
+    shutil.copytree(os.path.join(FIXTURE_DIR, "external"), tmp_path / "external")
+    return str(tmp_path / "external" / "api.yaml")
+
+
+@pytest.mark.asyncio
+async def test_spec_cache_mtime_invalidation(
+    spec_path: str,
+) -> None:
+    cache = daemon.SpecCache()
+
+    spec, cached = await cache.get(spec_path)
+    assert spec.error is None
+    assert not cached
+    assert (await cache.get(spec_path))[1]
+
+    # a referenced document changed
+    pet_path = os.path.join(os.path.dirname(spec_path), "schemas", "pet.yaml")
+    stat = os.stat(pet_path)
+    os.utime(pet_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert spec.is_stale
+    new_spec, cached = await cache.get(spec_path)
+    assert not cached
+    assert new_spec is not spec
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_spec_cache_invalid_spec(
+    tmp_path: t.Any,
+) -> None:
+    file_path = str(tmp_path / "api.yaml")
+    shutil.copy(
+        os.path.join(FIXTURE_DIR, "ref-error-invalid-path-format.yaml"),
+        file_path,
+    )
+    cache = daemon.SpecCache()
+
+    spec, _ = await cache.get(file_path)
+
+    assert spec.api is None
+    assert spec.error
+    with pytest.raises(ValueError):
+        await cache.get_api(file_path)
+
+
+@pytest.mark.asyncio
+async def test_daemon_handle(
+    tmp_path: t.Any,
+    spec_path: str,
+) -> None:
+    server = daemon.Daemon(socket_path=str(tmp_path / "daemon.sock"))
+
+    response = await server.handle({"command": "validate", "file_path": spec_path})
+    assert response["ok"]
+    assert response["result"]["valid"]
+    assert not response["result"]["cached"]
+
+    response = await server.handle(
+        {"command": "query", "file_path": spec_path, "expression": "$.info.title"},
+    )
+    assert response == {"ok": True, "result": ["Multi file example"]}
+
+    response = await server.handle(
+        {"command": "diff", "old": spec_path, "new": spec_path},
+    )
+    assert response["result"]["changes"] == []
+
+    response = await server.handle({"command": "unknown"})
+    assert not response["ok"]
+
+    response = await server.handle({"command": "validate"})
+    assert response["error"].startswith("KeyError")
+
+
+@pytest.mark.asyncio
+async def test_daemon_serve(
+    tmp_path: t.Any,
+    spec_path: str,
+) -> None:
+    socket_path = str(tmp_path / "daemon.sock")
+    server = daemon.Daemon(socket_path=socket_path)
+    task = asyncio.ensure_future(server.serve())
+    while not os.path.exists(socket_path):
+        await asyncio.sleep(0.01)
+
+    loop = asyncio.get_event_loop()
+    result = await loop.run_in_executor(
+        None,
+        lambda: daemon.request(
+            {"command": "validate", "file_path": spec_path},
+            socket_path=socket_path,
+        ),
+    )
+    assert result["valid"]
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    # a live socket is not replaced
+    with pytest.raises(FileExistsError, match="already listening"):
+        await daemon.Daemon(socket_path=socket_path).serve()
+
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write(b"not json\n")
+    assert b"Invalid json request" in await reader.readline()
+
+    writer.write(b'{"command": "shutdown"}\n')
+    assert await reader.readline() == b'{"ok": true, "result": null}\n'
+    await asyncio.wait_for(task, timeout=5)
+    writer.close()
+    assert not os.path.exists(socket_path)
+
+
+@pytest.mark.asyncio
+async def test_daemon_serve_socket_checks(
+    tmp_path: t.Any,
+) -> None:
+    # socket left by a daemon which is gone
+    socket_path = str(tmp_path / "run" / "daemon.sock")
+    os.makedirs(os.path.dirname(socket_path), mode=0o700)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+    server = daemon.Daemon(socket_path=socket_path)
+    task = asyncio.ensure_future(server.serve())
+    while not server._connections:
+        try:
+            await asyncio.open_unix_connection(socket_path)
+        except ConnectionRefusedError:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0)
+    await server.handle({"command": "shutdown"})
+    await asyncio.wait_for(task, timeout=5)
+
+    file_path = tmp_path / "daemon.sock"
+    file_path.write_text("")
+    with pytest.raises(FileExistsError, match="Not a socket"):
+        await daemon.Daemon(socket_path=str(file_path)).serve()
+
+    unsafe = tmp_path / "unsafe"
+    unsafe.mkdir()
+    unsafe.chmod(0o777)
+    with pytest.raises(PermissionError):
+        await daemon.Daemon(socket_path=str(unsafe / "daemon.sock")).serve()
+
+
+def test_default_socket_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("OPENAPYDANTIC_SOCKET", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+
+    assert daemon.default_socket_path() == "/run/user/1000/openapydantic.sock"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert (
+        os.path.basename(daemon.runtime_directory()) == f"openapydantic-{os.getuid()}"
+    )
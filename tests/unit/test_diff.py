@@ -0,0 +1,166 @@
+import copy
+
+from openapydantic import diff
+
+
+def _raw_api() -> dict:
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "Example", "version": "1.0.0"},
+        "paths": {
+            "/user": {
+                "get": {
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Limit"},
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "ok",
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/User"},
+                                },
+                            },
+                        },
+                        "404": {"description": "not found"},
+                    },
+                },
+                "post": {
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/User"},
+                            },
+                        },
+                    },
+                    "responses": {"201": {"description": "created"}},
+                },
+            },
+            "/health": {"get": {"responses": {"200": {"description": "ok"}}}},
+        },
+        "components": {
+            "parameters": {
+                "Limit": {
+                    "name": "limit",
+                    "in": "query",
+                    "schema": {"type": "integer"},
+                },
+            },
+            "schemas": {
+                "User": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string"},
+                        "role": {"type": "string", "enum": ["admin", "user"]},
+                        "friend": {"$ref": "#/components/schemas/User"},
+                    },
+                },
+            },
+        },
+    }
+
+
+def _locations(result: diff.SpecDiff, *, breaking: bool = False) -> set:
+    changes = result.breaking_changes if breaking else result.changes
+    return {(change.kind.value, change.pointer) for change in changes}
+
+
+def test_diff_identical() -> None:
+    raw_api = _raw_api()
+    result = diff.diff_specs(raw_api, copy.deepcopy(raw_api))
+
+    assert result.changes == []
+    assert not result.is_breaking
+
+
+def test_diff_paths_and_operations() -> None:
+    old = _raw_api()
+    new = copy.deepcopy(old)
+    del new["paths"]["/health"]
+    del new["paths"]["/user"]["post"]
+    new["paths"]["/user"]["delete"] = {"responses": {"204": {"description": "ok"}}}
+    new["paths"]["/status"] = {"get": {"responses": {"200": {"description": "ok"}}}}
+
+    result = diff.diff_specs(old, new)
+
+    assert _locations(result) == {
+        ("removed", "#/paths/~1health"),
+        ("added", "#/paths/~1status"),
+        ("changed", "#/paths/~1user"),
+        ("removed", "#/paths/~1user/post"),
+        ("added", "#/paths/~1user/delete"),
+    }
+    assert _locations(result, breaking=True) == {
+        ("removed", "#/paths/~1health"),
+        ("removed", "#/paths/~1user/post"),
+    }
+
+
+def test_diff_parameters() -> None:
+    old = _raw_api()
+    new = copy.deepcopy(old)
+    new["components"]["parameters"]["Limit"]["required"] = True
+    new["paths"]["/user"]["get"]["parameters"].append(
+        {"name": "offset", "in": "query", "required": True},
+    )
+
+    result = diff.diff_specs(old, new)
+
+    assert _locations(result, breaking=True) == {
+        ("changed", "#/paths/~1user/get/parameters/limit(query)"),
+        ("added", "#/paths/~1user/get/parameters/offset(query)"),
+    }
+
+
+def test_diff_schemas() -> None:
+    old = _raw_api()
+    new = copy.deepcopy(old)
+    user = new["components"]["schemas"]["User"]
+    user["properties"]["role"]["enum"].append("guest")
+    user["properties"]["name"]["description"] = "user name"
+    user["required"].append("role")
+    new["components"]["schemas"]["Tag"] = {"type": "string"}
+
+    result = diff.diff_specs(old, new)
+    breaking = _locations(result, breaking=True)
+    schema = "#/components/schemas/User"
+    body = "#/paths/~1user/post/requestBody/content/application~1json/schema"
+    response = "#/paths/~1user/get/responses/200/content/application~1json/schema"
+
+    assert ("added", "#/components/schemas/Tag") in _locations(result)
+    assert ("changed", f"{schema}/properties/name") in _locations(result)
+    # new required property in a request
+    assert ("added", f"{body}/required/role") in breaking
+    assert ("added", f"{response}/required/role") not in breaking
+    # new enum value in a response
+    assert ("added", f"{response}/properties/role/enum/guest") in breaking
+    assert ("added", f"{body}/properties/role/enum/guest") not in breaking
+
+
+def test_diff_schema_type_and_removed_property() -> None:
+    old = _raw_api()
+    new = copy.deepcopy(old)
+    user = new["components"]["schemas"]["User"]
+    user["properties"]["name"]["type"] = "integer"
+    del user["properties"]["role"]
+
+    result = diff.diff_specs(old, new)
+    breaking = _locations(result, breaking=True)
+
+    assert ("changed", "#/components/schemas/User/properties/name/type") in breaking
+    assert ("removed", "#/components/schemas/User/properties/role") in breaking
+    assert result.is_breaking
+
+
+def test_diff_responses() -> None:
+    old = _raw_api()
+    new = copy.deepcopy(old)
+    del new["paths"]["/user"]["get"]["responses"]["404"]
+
+    result = diff.diff_specs(old, new)
+
+    assert _locations(result, breaking=True) == {
+        ("removed", "#/paths/~1user/get/responses/404"),
+    }
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import typing as t
+
+import pytest
+
+from openapydantic import common
+from openapydantic import compat
+from openapydantic import export
+from openapydantic import pointer
+from openapydantic import versions
+
+SPEC = """
+openapi: 3.0.2
+info: {title: export, version: 1.0.0}
+paths:
+  /pets:
+    get:
+      parameters:
+        - $ref: '#/components/parameters/Limit'
+        - {name: tag, in: query, schema: {type: string}}
+        - $ref: '#/components/parameters/Offset'
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema: {type: array, items: {$ref: '#/components/schemas/Pet'}}
+  /nodes:
+    get:
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema: {$ref: '#/components/schemas/Node'}
+components:
+  parameters:
+    Limit: {name: limit, in: query, schema: {type: integer, format: int32}}
+    Offset: {name: offset, in: query, schema: {type: integer}}
+  schemas:
+    Pet:
+      type: object
+      properties:
+        name: {type: string}
+    Node:
+      type: object
+      properties:
+        pet: {$ref: '#/components/schemas/Pet'}
+        label: {$ref: '#/components/schemas/Pet/properties/name'}
+        children: {type: array, items: {$ref: '#/components/schemas/Node'}}
+"""
+
+
+def _expand(
+    node: t.Any,
+    document: t.Dict[str, t.Any],
+) -> t.Any:
+    # references interpolated, except the cyclic ones
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if ref and ref != "#/components/schemas/Node":
+            return _expand(pointer.resolve(document, ref), document)
+        return {key: _expand(value, document) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_expand(value, document) for value in node]
+    return node
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        common.ModelBackend.pydantic_v1,
+        pytest.param(
+            common.ModelBackend.pydantic_v2,
+            marks=pytest.mark.skipif(
+                not compat.PYDANTIC_V2,
+                reason="requires pydantic v2",
+            ),
+        ),
+    ],
+)
+def test_keep_references(
+    tmp_path: t.Any,
+    backend: common.ModelBackend,
+) -> None:
+    file_path = str(tmp_path / "api.yaml")
+    with open(file_path, "w") as file:
+        file.write(SPEC)
+    api = asyncio.run(versions.load_api(file_path=file_path, backend=backend))
+
+    result = json.loads(api.as_clean_json(keep_references=True))
+
+    get = result["paths"]["/pets"]["get"]
+    assert get["parameters"] == [
+        {"$ref": "#/components/parameters/Limit"},
+        {"name": "tag", "in": "query", "schema": {"type": "string"}},
+        {"$ref": "#/components/parameters/Offset"},
+    ]
+    schema = get["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}
+    node = result["components"]["schemas"]["Node"]
+    assert node["properties"]["label"] == {
+        "$ref": "#/components/schemas/Pet/properties/name",
+    }
+    assert _expand(result, result) == json.loads(
+        api.as_clean_json(exclude_components=False),
+    )
+    document = api.as_clean_dict(keep_references=True)
+    assert document["paths"]["/pets"]["get"]["parameters"][2] == get["parameters"][2]
+    assert "raw_api" in api.as_clean_dict(keep_references=True, exclude_raw_api=False)
+
+    with pytest.raises(ValueError, match="only be kept in an api export"):
+        api.paths["/pets"].as_clean_json(keep_references=True)
+
+
+def test_reference_exclusions() -> None:
+    raw = {"a": [{"$ref": "#/components/schemas/A"}, {"b": {"$ref": "#/x"}}]}
+    value = {"a": [{"type": "object"}, {"b": {"type": "string"}}]}
+
+    exclude, references = export.reference_exclusions(raw, value)
+
+    assert exclude == {"a": {0: True}}
+    assert references == [(("a", 0), "#/components/schemas/A")]
+    document = {"a": [{"b": {"type": "string"}}]}
+    assert export.insert_references(document, references) == {
+        "a": [{"$ref": "#/components/schemas/A"}, {"b": {"type": "string"}}],
+    }
@@ -0,0 +1,54 @@
+import typing as t
+
+import pytest
+from pytest_mock import MockerFixture
+
+from openapydantic import common
+from openapydantic import fingerprint
+
+RAW_API: t.Dict[str, t.Any] = {
+    "openapi": "3.0.2",
+    "info": {"title": "Example", "version": "1.0.0"},
+    "paths": {},
+}
+
+
+def test_compute_fingerprint_stable() -> None:
+    reordered = {
+        "paths": {},
+        "info": {"version": "1.0.0", "title": "Example"},
+        "openapi": "3.0.2",
+    }
+
+    assert fingerprint.compute_fingerprint(
+        raw_api=RAW_API,
+    ) == fingerprint.compute_fingerprint(
+        raw_api=reordered,
+    )
+
+
+def test_compute_fingerprint_library_version(
+    mocker: MockerFixture,
+) -> None:
+    before = fingerprint.compute_fingerprint(raw_api=RAW_API)
+    mocker.patch.object(common, "LIBRARY_VERSION", "0.0.0")
+
+    assert fingerprint.compute_fingerprint(raw_api=RAW_API) != before
+
+
+def test_check_fingerprint_ok() -> None:
+    fingerprint.check_fingerprint(
+        raw_api=RAW_API,
+        fingerprint=fingerprint.compute_fingerprint(raw_api=RAW_API),
+    )
+
+
+@pytest.mark.parametrize("value", [None, "", "invalid"])
+def test_check_fingerprint_ko(
+    value: t.Optional[str],
+) -> None:
+    with pytest.raises(ValueError):
+        fingerprint.check_fingerprint(
+            raw_api=RAW_API,
+            fingerprint=value,
+        )
@@ -0,0 +1,103 @@
+import copy
+
+from openapydantic import hashing
+
+
+def _raw_api() -> dict:
+    return {
+        "paths": {
+            "/user": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/User"},
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Name": {"type": "string"},
+                "User": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"$ref": "#/components/schemas/Name"},
+                        "friend": {"$ref": "#/components/schemas/User"},
+                    },
+                },
+            },
+        },
+    }
+
+
+def test_hash_is_content_based() -> None:
+    raw_api = _raw_api()
+    other = copy.deepcopy(raw_api)
+
+    assert hashing.MerkleHasher(raw_api).hexdigest(raw_api) == (
+        hashing.MerkleHasher(other).hexdigest(other)
+    )
+
+    other["components"]["schemas"]["Name"]["type"] = "integer"
+    assert hashing.MerkleHasher(raw_api).hexdigest(raw_api) != (
+        hashing.MerkleHasher(other).hexdigest(other)
+    )
+
+
+def test_hash_reference_as_target() -> None:
+    raw_api = _raw_api()
+    hasher = hashing.MerkleHasher(raw_api)
+    name = raw_api["components"]["schemas"]["Name"]
+    user = raw_api["components"]["schemas"]["User"]
+
+    ref = "#/components/schemas/Name"
+    assert hasher.hash({"$ref": ref}) == hasher.hash(name)
+    assert hasher.hash({"$ref": f"{ref}/type"}) == hasher.hash("string")
+    assert hasher.hash(user) == hasher.hash(copy.deepcopy(user))
+    assert hasher.hash("1") != hasher.hash(1)
+    assert hasher.hash(1) != hasher.hash(True)
+
+
+def test_hash_component_once(mocker) -> None:
+    raw_api = _raw_api()
+    hasher = hashing.MerkleHasher(raw_api)
+    spy = mocker.spy(hashing.pointer, "resolve")
+
+    hasher.hash(raw_api)
+    hasher.hash({"$ref": "#/components/schemas/Name"})
+
+    calls = [call for call in spy.call_args_list if call.args[1].endswith("/Name")]
+    assert len(calls) == 1
+
+
+def test_deref() -> None:
+    raw_api = _raw_api()
+    hasher = hashing.MerkleHasher(raw_api)
+
+    assert hasher.deref({"$ref": "#/components/schemas/User"}) is (
+        raw_api["components"]["schemas"]["User"]
+    )
+    assert hasher.deref({"$ref": "#/components/schemas/Missing"}) == {
+        "$ref": "#/components/schemas/Missing",
+    }
+    assert hasher.deref({"$ref": "other.yaml"}) == {"$ref": "other.yaml"}
+
+
+def test_hash_cycle() -> None:
+    raw_api = _raw_api()
+    other = copy.deepcopy(raw_api)
+    other["components"]["schemas"]["Name"]["type"] = "integer"
+    ref = {"$ref": "#/components/schemas/User"}
+
+    # a change inside a recursive component changes its references hash
+    assert hashing.MerkleHasher(raw_api).hash(ref) != (
+        hashing.MerkleHasher(other).hash(ref)
+    )
+    assert hashing.MerkleHasher(raw_api).hash(ref) == (
+        hashing.MerkleHasher(copy.deepcopy(raw_api)).hash(ref)
+    )
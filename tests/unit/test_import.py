@@ -0,0 +1,53 @@
+import subprocess  # nosec
+import sys
+import typing as t
+
+import pytest
+
+HEAVY_MODULES = [
+    "email_validator",
+    "jsonpath_ng",
+    "openapydantic.versions.openapi_302.models",
+    "pydantic",
+    "yaml",
+]
+
+
+def _imported_modules(
+    statement: str,
+) -> t.List[str]:
+    # fresh interpreter: modules already imported by the tests do not count
+    return subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {statement}; print(' '.join(sys.modules))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_import_openapydantic_is_lazy(
+    module: str,
+) -> None:
+    assert module not in _imported_modules("import openapydantic")
+
+
+def test_import_versions_is_lazy() -> None:
+    modules = _imported_modules("from openapydantic import versions")
+
+    assert "openapydantic.versions.openapi_302" not in modules
+    assert "jsonpath_ng" not in modules
+    assert "yaml" not in modules
+
+
+def test_lazy_attributes() -> None:
+    modules = _imported_modules(
+        "import openapydantic; openapydantic.load_api; openapydantic.OpenApiVersion"
+    )
+
+    assert "openapydantic.versions" in modules
+    assert "openapydantic.versions.openapi_302" not in modules
@@ -0,0 +1,60 @@
+import typing as t
+
+from openapydantic import interning
+
+
+def _build(value: str) -> str:
+    # build the string at runtime so the compiler does not share constants
+    return "".join(list(value))
+
+
+def test_intern_spec_keys_and_short_strings() -> None:
+    spec = {
+        _build("description"): _build("a short description"),
+        "nested": {_build("description"): _build("a short description")},
+    }
+
+    result = interning.intern_spec(spec)
+
+    assert result == spec
+    key_1 = [key for key in result if key == "description"][0]
+    key_2 = [key for key in result["nested"] if key == "description"][0]
+    assert key_1 is key_2
+    assert result["description"] is result["nested"]["description"]
+
+
+def test_intern_spec_long_strings_and_scalars() -> None:
+    long_value = "x" * (interning.MAX_INTERNED_LENGTH + 1)
+    spec = [
+        _build(long_value),
+        _build(long_value),
+        int("123456789"),
+        int("123456789"),
+        1.5,
+        True,
+        None,
+    ]
+
+    result = interning.intern_spec(spec)
+
+    assert result == spec
+    assert result[0] is result[1]
+    assert result[2] is result[3]
+    assert result[5] is True
+    assert result[6] is None
+
+
+def test_intern_spec_bool_not_merged_with_int() -> None:
+    result = interning.intern_spec([1, True, 1.0])
+
+    assert [type(value) for value in result] == [int, bool, float]
+
+
+def test_intern_spec_keep_shared_containers() -> None:
+    shared: t.Dict[str, t.Any] = {"type": "string"}
+    spec = {"a": shared, "b": shared}
+
+    result = interning.intern_spec(spec)
+
+    assert result["a"] is result["b"]
+    assert result["a"] is not shared
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import typing as t
+
+import pytest
+import yaml
+
+from openapydantic import limits
+from openapydantic import versions
+
+
+def _schema_ref(
+    name: str,
+) -> t.Dict[str, str]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+def _reference_bomb(
+    depth: int,
+) -> t.Dict[str, t.Any]:
+    # each schema references the previous one twice
+    schemas: t.Dict[str, t.Any] = {"S0": {"type": "string"}}
+    for index in range(1, depth + 1):
+        previous = _schema_ref(f"S{index - 1}")
+        schemas[f"S{index}"] = {"properties": {"a": previous, "b": previous}}
+    return {
+        "paths": {"/x": _schema_ref(f"S{depth}")},
+        "components": {"schemas": schemas},
+    }
+
+
+ALIAS_BOMB = "paths: {}\nx-0: &a0 [lol, lol]\n" + "".join(
+    f"x-{index}: &a{index} [*a{index - 1}, *a{index - 1}, *a{index - 1}]\n"
+    for index in range(1, 30)
+)
+
+
+def test_estimate_expansion() -> None:
+    raw_api = {
+        "paths": {"/x": _schema_ref("A")},
+        "components": {
+            "schemas": {
+                "A": {"type": "string"},
+                "B": {"properties": {"a": _schema_ref("A")}},
+                # kept as references
+                "C": {"properties": {"d": _schema_ref("D")}},
+                "D": {"properties": {"c": _schema_ref("C")}},
+            },
+        },
+    }
+
+    # root, paths (1 + A), components, schemas, A (type: 2),
+    # B (properties: 2 + A), C and D (properties: 2 + reference: 2)
+    assert limits.estimate_expansion(raw_api) == limits.Expansion(
+        nodes=1 + 3 + 1 + 1 + 2 + 4 + 4 + 4,
+        reference_depth=1,
+    )
+
+
+def test_estimate_expansion_bombs() -> None:
+    expansion = limits.estimate_expansion(_reference_bomb(40))
+    # the path reference, then S40 -> S39 ... -> S0
+    assert expansion.reference_depth == 41
+    assert expansion.nodes > 2**40
+
+    alias_bomb = yaml.safe_load(ALIAS_BOMB)
+    assert limits.estimate_expansion(alias_bomb).nodes > 3**29
+
+    with pytest.raises(limits.LimitExceeded, match="1000 nodes"):
+        limits.estimate_expansion(alias_bomb, max_nodes=1000)
+    with pytest.raises(limits.LimitExceeded, match="depth exceeds 10"):
+        limits.estimate_expansion(_reference_bomb(40), max_depth=10)
+
+
+def test_estimate_expansion_recursive_document() -> None:
+    with pytest.raises(ValueError, match="Recursive"):
+        limits.estimate_expansion(yaml.safe_load("paths: &a\n  x: *a\n"))
+
+
+def test_alias_limited_loader() -> None:
+    loader = limits.alias_limited_loader(10)
+
+    with pytest.raises(limits.LimitExceeded, match="10 yaml aliases"):
+        yaml.load(ALIAS_BOMB, Loader=loader)  # nosec
+    assert yaml.load("a: &a [1]\nb: *a\n", Loader=loader) == {  # nosec
+        "a": [1],
+        "b": [1],
+    }
+
+
+def test_load_guard(
+    tmp_path: t.Any,
+) -> None:
+    file_path = tmp_path / "api.yaml"
+    file_path.write_text("x" * 100)
+    guard = limits.LoadGuard(limits.Limits(max_document_size=10, timeout=0))
+
+    with pytest.raises(limits.LimitExceeded, match="exceeds 10 bytes"):
+        guard.check_document(str(file_path))
+    with pytest.raises(limits.LimitExceeded, match="before models"):
+        guard.check_time("models")
+
+    # no limit
+    guard = limits.LoadGuard()
+    guard.check_document(str(file_path))
+    guard.check_time("models")
+    guard.check_expansion(_reference_bomb(40))
+
+
+def test_load_guard_within_time() -> None:
+    guard = limits.LoadGuard(limits.Limits(timeout=0.05))
+
+    with pytest.raises(limits.LimitExceeded, match="during loading"):
+        asyncio.run(guard.within_time(asyncio.sleep(1), "loading"))
+
+
+def test_load_api_alias_bomb(
+    tmp_path: t.Any,
+) -> None:
+    # 69 aliases, far below max_aliases, expanding to 3**23 nodes
+    bomb = "".join(
+        f"    x-{index}: &a{index} [*a{index - 1}, *a{index - 1}, *a{index - 1}]\n"
+        for index in range(1, 24)
+    )
+    file_path = tmp_path / "api.yaml"
+    file_path.write_text(
+        "openapi: 3.0.2\n"
+        "info: {title: bomb, version: 1.0.0}\n"
+        "paths:\n"
+        "  /x:\n"
+        "    x-0: &a0 [{$ref: '#/components/schemas/A'}]\n"
+        f"{bomb}"
+        "components: {schemas: {A: {type: string}}}\n",
+    )
+    start = time.perf_counter()
+
+    with pytest.raises(limits.LimitExceeded, match="nodes"):
+        asyncio.run(
+            versions.load_api(
+                file_path=str(file_path),
+                precheck=True,
+                limits=limits.Limits.untrusted(),
+            ),
+        )
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import typing as t
+
+import pytest
+
+from openapydantic import loaders
+
+
+class FakeLoader(loaders.DocumentLoader):
+    def __init__(
+        self,
+        documents: t.Dict[str, t.Any],
+    ) -> None:
+        self.documents = documents
+        self.calls: t.List[str] = []
+
+    async def load(
+        self,
+        uri: str,
+    ) -> t.Any:
+        self.calls.append(uri)
+        await asyncio.sleep(0)
+        return self.documents[uri]
+
+
+def test_path_to_uri_and_back() -> None:
+    file_path = os.path.join(os.path.dirname(__file__), "fixture", "simple.yaml")
+
+    uri = loaders.path_to_uri(file_path)
+
+    assert uri.startswith("file://")
+    assert loaders.uri_to_path(uri) == os.path.abspath(file_path)
+
+
+@pytest.mark.asyncio
+async def test_file_loader() -> None:
+    file_path = os.path.join(os.path.dirname(__file__), "fixture", "simple.yaml")
+
+    result = await loaders.FileLoader().load(loaders.path_to_uri(file_path))
+
+    assert result["openapi"] == "3.0.2"
+
+
+@pytest.mark.asyncio
+async def test_document_cache_load_once() -> None:
+    loader = FakeLoader({"mem://a.yaml": {"a": 1}})
+    cache = loaders.DocumentCache(loaders={"mem": loader})
+
+    result = await cache.get_many(["mem://a.yaml", "mem://a.yaml"])
+    again = await cache.get("mem://a.yaml")
+
+    assert result == [{"a": 1}, {"a": 1}]
+    assert again == {"a": 1}
+    assert loader.calls == ["mem://a.yaml"]
+
+
+@pytest.mark.asyncio
+async def test_document_cache_no_loader() -> None:
+    cache = loaders.DocumentCache()
+
+    with pytest.raises(ValueError):
+        await cache.get("https://example.com/api.yaml")
+
+
+@pytest.mark.parametrize(
+    "ref,expected",
+    [
+        ("pet.yaml", "mem://root/dir/pet.yaml"),
+        ("../pet.yaml#/Pet", "mem://root/pet.yaml#/Pet"),
+        ("/abs/pet.yaml", "mem://root/abs/pet.yaml"),
+        ("#/components", "mem://root/dir/api.yaml#/components"),
+        ("https://example.com/pet.yaml", "https://example.com/pet.yaml"),
+    ],
+)
+def test_join_uri(
+    ref: str,
+    expected: str,
+) -> None:
+    assert loaders.join_uri("mem://root/dir/api.yaml", ref) == expected
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import typing as t
+
+import pytest
+import yaml
+
+from openapydantic import mapped
+from openapydantic import pointer
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+@pytest.fixture(name="raw_api", scope="module")
+def fixture_raw_api() -> t.Dict[str, t.Any]:
+    with open(os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")) as file:
+        return yaml.safe_load(file)  # type: ignore
+
+
+@pytest.fixture(name="file_path")
+def fixture_file_path(
+    raw_api: t.Dict[str, t.Any],
+    tmp_path: t.Any,
+) -> str:
+    file_path = str(tmp_path / "petstore.json")
+    with open(file_path, "w") as file:
+        json.dump(raw_api, file, indent=2)
+    return file_path
+
+
+def test_build_index() -> None:
+    nested = "[" * 40 + "]" * 40
+    document = (
+        '{"paths": {"/a\\"{": {"x": "]}\\\\", "y": %s}, "/b": null},'
+        ' "components": null, "n": -1.5e3}' % nested
+    ).encode()
+
+    index = mapped.build_index(document)
+
+    assert list(index["top"]) == ["paths", "components", "n"]
+    assert list(index["paths"]) == ['/a"{', "/b"]
+    start, end = index["paths"]['/a"{']
+    assert json.loads(document[start:end])["x"] == "]}\\"
+    assert index["components"] == {}
+
+    with pytest.raises(ValueError, match="Not a json object"):
+        mapped.build_index(b"openapi: 3.0.2")
+    with pytest.raises(ValueError, match="unterminated value"):
+        mapped.build_index(b'{"a": [[{"b": 1}]')
+    with pytest.raises(ValueError, match="expected , or }"):
+        mapped.build_index(b'{"a": 1 "b": 2}')
+
+
+def test_mapped_spec(
+    raw_api: t.Dict[str, t.Any],
+    file_path: str,
+) -> None:
+    with mapped.MappedSpec(file_path) as spec:
+        assert spec.paths == list(raw_api["paths"])
+        assert spec.components["requestBodies"] == ["Pet", "UserArray"]
+        assert spec.get("info") == raw_api["info"]
+        assert spec.get("tags") is None
+        assert spec.path_item("/pet") == raw_api["paths"]["/pet"]
+        schemas = raw_api["components"]["schemas"]
+        assert spec.component("schemas", "Tag") == schemas["Tag"]
+        assert spec.resolve("#/components/schemas/Pet/required/1") == "photoUrls"
+        assert spec.resolve("#/paths/~1pet~1{petId}/get/operationId") == "getPetById"
+        assert spec.resolve("#/openapi") == "3.0.2"
+        with pytest.raises(pointer.JsonPointerError):
+            spec.resolve("#/components/schemas/Unknown")
+        assert spec.get_raw_api() == raw_api
+
+        selected = spec.get_raw_api(include_paths=["/pet/{petId}"])
+    assert list(selected["paths"]) == ["/pet/{petId}"]
+    assert {key: set(values) for key, values in selected["components"].items()} == {
+        "schemas": {"Pet", "Category", "Tag"},
+        "securitySchemes": {"petstore_auth", "api_key"},
+    }
+
+
+def test_index_path(
+    file_path: str,
+    tmp_path: t.Any,
+) -> None:
+    index_path = str(tmp_path / "petstore.index")
+    mapped.MappedSpec(file_path, index_path=index_path).close()
+    with open(index_path) as file:
+        index = json.load(file)
+
+    # reused while the file is unchanged
+    index["paths"] = {"/cached": index["paths"]["/pet"]}
+    with open(index_path, "w") as file:
+        json.dump(index, file)
+    with mapped.MappedSpec(file_path, index_path=index_path) as spec:
+        assert spec.paths == ["/cached"]
+
+    os.utime(file_path, ns=(0, 0))
+    with mapped.MappedSpec(file_path, index_path=index_path) as spec:
+        assert spec.paths[0] == "/pet"
+
+
+def test_load_api(
+    file_path: str,
+) -> None:
+    with mapped.MappedSpec(file_path) as spec:
+        api = asyncio.run(spec.load_api(include_paths=["/store/*"]))
+
+    assert list(api.paths) == [
+        "/store/inventory",
+        "/store/order",
+        "/store/order/{orderId}",
+    ]
+    assert list(api.components.schemas) == ["Order"]
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+import tracemalloc
+import typing as t
+
+from openapydantic import memory
+from openapydantic import versions
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+def _schema_ref(
+    name: str,
+) -> t.Dict[str, str]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+def test_count_expansions() -> None:
+    raw_api = {
+        "paths": {
+            "/pets": {
+                "get": {"responses": {"200": {"schema": _schema_ref("Pets")}}},
+                "post": {"responses": {"200": {"schema": _schema_ref("Pets")}}},
+            },
+            "/nodes": {"get": {"responses": {"200": {"schema": _schema_ref("A")}}}},
+        },
+        "components": {
+            "schemas": {
+                "Pets": {"items": _schema_ref("Pet")},
+                "Pet": {
+                    "properties": {
+                        "owner": _schema_ref("User"),
+                        "id": {"$ref": "#/components/schemas/Id/properties/id"},
+                    },
+                },
+                "User": {"type": "object"},
+                "Id": {"properties": {"id": {"type": "integer"}}},
+                "A": {"properties": {"b": _schema_ref("B")}},
+                "B": {
+                    "properties": {"a": _schema_ref("A"), "user": _schema_ref("User")}
+                },
+            },
+        },
+    }
+
+    assert memory.count_expansions(raw_api) == {
+        "#/components/schemas/Pets": 2,
+        # in Pets and its 2 copies
+        "#/components/schemas/Pet": 3,
+        # in Pet and its 3 copies, in B
+        "#/components/schemas/User": 5,
+        "#/components/schemas/Id": 4,
+        # mutually recursive: kept as references
+        "#/components/schemas/A": 0,
+        "#/components/schemas/B": 0,
+    }
+
+
+def test_size_counter() -> None:
+    shared = ["x" * 100]
+    counter = memory.SizeCounter()
+
+    # alive during the count: objects are identified by their id
+    objects = [{"a": shared}, {"b": shared, "example": {"value": "y" * 50}}]
+    first = counter.size(objects[0])
+    second = counter.size(objects[1])
+
+    example = objects[1]["example"]
+    assert first == sum(
+        map(sys.getsizeof, (objects[0], "a", shared, shared[0])),
+    )
+    assert counter.examples == sum(
+        map(sys.getsizeof, (example, "value", example["value"])),
+    )
+    # the shared list is counted once
+    assert second == counter.examples + sum(
+        map(sys.getsizeof, (objects[1], "b", "example")),
+    )
+
+
+def test_memory_report() -> None:
+    file_path = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    api = asyncio.run(versions.load_api(file_path=file_path))
+
+    report = memory.memory_report(api)
+
+    assert report.total == sum(section.size for section in report.sections)
+    assert {section.name for section in report.sections} == {
+        "components",
+        "paths",
+        "raw_api",
+        "api",
+        *memory.SECTIONS,
+    }
+    assert sorted(path.name for path in report.paths) == sorted(api.paths)
+    pet = next(
+        component
+        for component in report.components
+        if (component.component_type, component.name) == ("schemas", "Pet")
+    )
+    assert (
+        pet.expansions
+        == memory.count_expansions(api.raw_api)["#/components/schemas/Pet"]
+    )
+    assert report.components[0].retained_size >= pet.retained_size
+    assert "schemas/Pet" in report.text(limit=5)
+
+
+def test_profile_load() -> None:
+    file_path = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+
+    profile = asyncio.run(memory.profile_load(file_path=file_path))
+
+    assert [phase.name for phase in profile.phases] == [
+        "read",
+        "external references",
+        "models",
+    ]
+    assert profile.phases[-1].allocated > 0
+    assert profile.report.total > 0
+    assert not tracemalloc.is_tracing()
+    assert profile.text().startswith("read: ")
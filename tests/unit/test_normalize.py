@@ -0,0 +1,130 @@
+import asyncio
+import copy
+import json
+import typing as t
+
+import yaml
+
+from openapydantic import normalize
+from openapydantic import versions
+
+ADDRESS = {
+    "type": "object",
+    "properties": {
+        "street": {"type": "string"},
+        "zip": {"type": "string", "pattern": "^[0-9]+$"},
+    },
+}
+PET = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": {"type": "string"}, "tag": {"type": "string"}},
+}
+
+
+def _operation(
+    schema: t.Dict[str, t.Any],
+) -> t.Dict[str, t.Any]:
+    return {
+        "responses": {
+            "200": {
+                "description": "ok",
+                "content": {
+                    "application/json": {
+                        "schema": copy.deepcopy(schema),
+                        "example": copy.deepcopy(ADDRESS),
+                    },
+                },
+            },
+        },
+    }
+
+
+def _raw_api() -> t.Dict[str, t.Any]:
+    node = {
+        "type": "object",
+        "properties": {
+            "address": copy.deepcopy(ADDRESS),
+            "children": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Node"},
+            },
+        },
+    }
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "normalize", "version": "1.0.0"},
+        "paths": {
+            "/owner": {
+                "get": _operation(
+                    {
+                        "type": "object",
+                        "properties": {
+                            "home": copy.deepcopy(ADDRESS),
+                            "work": copy.deepcopy(ADDRESS),
+                        },
+                    },
+                ),
+            },
+            "/pet": {"get": _operation(PET), "put": _operation(PET)},
+            "/pets": {"get": _operation({"type": "array", "items": PET})},
+            "/node": {"get": _operation({"$ref": "#/components/schemas/Node"})},
+        },
+        "components": {"schemas": {"Pet": copy.deepcopy(PET), "Node": node}},
+    }
+
+
+def test_schema_normalizer() -> None:
+    raw_api = _raw_api()
+    normalizer = normalize.SchemaNormalizer()
+
+    result = normalizer.normalize(raw_api)
+
+    assert raw_api == _raw_api()
+    schemas = result["components"]["schemas"]
+    assert list(schemas)[:2] == ["Pet", "Node"]
+    # the cyclic component is left as it is
+    assert schemas["Node"] is raw_api["components"]["schemas"]["Node"]
+    (name,) = list(schemas)[2:]
+    assert name.startswith("Inline_")
+    assert schemas[name] == ADDRESS
+
+    owner = result["paths"]["/owner"]["get"]["responses"]["200"]["content"]
+    properties = owner["application/json"]["schema"]["properties"]
+    assert properties["home"] == {"$ref": f"#/components/schemas/{name}"}
+    assert properties["home"] is properties["work"]
+    assert owner["application/json"]["example"] == ADDRESS
+    pets = result["paths"]["/pets"]["get"]["responses"]["200"]["content"]
+    assert pets["application/json"]["schema"]["items"] == {
+        "$ref": "#/components/schemas/Pet",
+    }
+
+    report = normalizer.report
+    assert [(schema.name, schema.occurrences) for schema in report.lifted] == [
+        (name, 2),
+    ]
+    assert report.reused == 3
+    assert report.saved_nodes == 8 + 3 * 9
+    assert report.text().startswith("1 lifted schemas, 3 copies of components")
+
+
+def test_load_api_normalizer(
+    tmp_path: t.Any,
+) -> None:
+    file_path = str(tmp_path / "api.yaml")
+    with open(file_path, "w") as file:
+        yaml.safe_dump(_raw_api(), file)
+    normalizer = normalize.SchemaNormalizer()
+
+    api = asyncio.run(versions.load_api(file_path=file_path))
+    normalized = asyncio.run(
+        versions.load_api(file_path=file_path, normalizer=normalizer),
+    )
+
+    assert len(normalizer.report.lifted) == 1
+    assert json.loads(normalized.as_clean_json()) == json.loads(api.as_clean_json())
+    assert normalized.paths["/pet"].get is not api.paths["/pet"].get
+    pet = normalized.paths["/pet"].get.responses["200"].content["application/json"]
+    pets = normalized.paths["/pets"].get.responses["200"].content["application/json"]
+    # validated once
+    assert pet.schema_ is pets.schema_.items
@@ -0,0 +1,241 @@
+import json
+import os
+import pickle
+import typing as t
+
+import pytest
+import yaml
+
+from openapydantic import payloads
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+@pytest.fixture(name="raw_api")
+def fixture_raw_api() -> t.Dict[str, t.Any]:
+    with open(os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")) as file:
+        return yaml.safe_load(file)  # type: ignore
+
+
+def _errors(
+    schema: t.Dict[str, t.Any],
+    payload: t.Any,
+) -> t.List[t.Tuple[str, str]]:
+    return [
+        (error.location, error.message)
+        for error in payloads.SchemaValidator(schema).errors(payload)
+    ]
+
+
+@pytest.mark.parametrize(
+    "schema,payload,errors",
+    [
+        ({"type": "integer"}, 1, []),
+        ({"type": "integer"}, True, [("#", "expected integer, got boolean")]),
+        ({"type": "number"}, 1, []),
+        ({"type": "string"}, None, [("#", "expected string, got null")]),
+        ({"type": "string", "nullable": True}, None, []),
+        ({"enum": [1, "a"]}, "a", []),
+        ({"enum": [1, "a"]}, True, [("#", "not one of the enum values")]),
+        ({"minLength": 2, "maxLength": 3}, "a", [("#", "fewer than 2 characters")]),
+        ({"maxItems": 1}, [1, 2], [("#", "more than 1 items")]),
+        ({"uniqueItems": True}, [{"a": 1}, {"a": 1}], [("#", "items are not unique")]),
+        ({"pattern": "^a"}, "ba", [("#", "does not match pattern ^a")]),
+        ({"format": "date"}, "2020-02-30", [("#", "invalid date")]),
+        ({"format": "date-time"}, "2020-02-03T10:00:00Z", []),
+        ({"format": "uuid"}, "x", [("#", "invalid uuid")]),
+        ({"format": "int32"}, 2**31, [("#", "invalid int32")]),
+        ({"minimum": 1}, 1, []),
+        (
+            {"minimum": 1, "exclusiveMinimum": True},
+            1,
+            [("#", "out of exclusive minimum 1")],
+        ),
+        ({"maximum": 1}, 1.5, [("#", "out of maximum 1")]),
+        ({"multipleOf": 0.5}, 1.5, []),
+        ({"multipleOf": 2}, 3, [("#", "not a multiple of 2")]),
+        (
+            {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+            1.5,
+            [("#", "does not match any schema of anyOf")],
+        ),
+        (
+            {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+            1,
+            [("#", "matches 2 schemas of oneOf")],
+        ),
+        ({"not": {"type": "string"}}, "a", [("#", "matches the schema of not")]),
+        # keywords of other types are ignored
+        ({"minLength": 2, "minimum": 3}, [], []),
+    ],
+)
+def test_schema_validator_keywords(
+    schema: t.Dict[str, t.Any],
+    payload: t.Any,
+    errors: t.List[t.Tuple[str, str]],
+) -> None:
+    assert _errors(schema, payload) == errors
+
+
+def test_schema_validator_objects() -> None:
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "additionalProperties": False,
+    }
+
+    assert _errors(schema, {"tags": ["a", 1], "a/b": 1}) == [
+        ("#", "missing required property:id"),
+        ("#/tags/1", "expected string, got integer"),
+        ("#/a~1b", "additional property not allowed"),
+    ]
+    assert _errors(
+        {"additionalProperties": {"type": "integer"}},
+        {"a": 1, "b": "x"},
+    ) == [("#/b", "expected integer, got string")]
+    assert _errors({"allOf": [schema, {"minProperties": 2}]}, {"id": 1}) == [
+        ("#", "fewer than 2 properties"),
+    ]
+
+
+def test_schema_validator_references() -> None:
+    raw_api = {
+        "components": {
+            "schemas": {
+                "Node": {
+                    "properties": {
+                        "value": {"type": "integer"},
+                        "children": {
+                            "items": {"$ref": "#/components/schemas/Node"},
+                        },
+                    },
+                },
+            },
+        },
+    }
+    validator = payloads.SchemaValidator.from_spec(raw_api, component="Node")
+    payload = {"children": [{"children": [{"value": "x"}]}]}
+
+    assert validator.errors(payload) == [
+        payloads.PayloadError(
+            "#/children/0/children/0/value",
+            "expected integer, got string",
+        ),
+    ]
+    assert pickle.loads(pickle.dumps(validator)).errors(payload) == (
+        validator.errors(payload)
+    )
+    assert not validator.is_valid(payload)
+
+    with pytest.raises(ValueError, match="Invalid schema type:int"):
+        payloads.SchemaValidator({"type": "int"})
+    with pytest.raises(ValueError, match="external reference"):
+        payloads.SchemaValidator({"$ref": "other.yaml#/Node"})
+
+
+def test_payload_schema(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    assert payloads.payload_schema(raw_api, component="Pet") == {
+        "$ref": "#/components/schemas/Pet",
+    }
+    assert payloads.payload_schema(
+        raw_api,
+        operation="findPetsByStatus",
+        status_code=200,
+    ) == {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}
+    assert payloads.payload_schema(
+        raw_api,
+        operation="post /pet",
+    ) == {"$ref": "#/components/schemas/Pet"}
+
+    with pytest.raises(ValueError, match="Operation not found:x"):
+        payloads.payload_schema(raw_api, operation="x")
+    with pytest.raises(ValueError, match="Response 404 not found"):
+        payloads.payload_schema(raw_api, operation="findPetsByStatus", status_code=404)
+    media_types = "media types:application/json, application/xml"
+    with pytest.raises(ValueError, match=media_types):
+        payloads.payload_schema(
+            raw_api,
+            operation="findPetsByStatus",
+            status_code=200,
+            media_type="text/plain",
+        )
+    with pytest.raises(ValueError, match="Pointer not found"):
+        payloads.payload_schema(raw_api, component="Unknown")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_payloads(
+    raw_api: t.Dict[str, t.Any],
+    workers: int,
+) -> None:
+    validator = payloads.SchemaValidator.from_spec(raw_api, component="Pet")
+    pets = [
+        {"name": "a", "photoUrls": []},
+        {"name": "b", "photoUrls": [1]},
+        {"photoUrls": [], "tags": [{"id": "x"}, {"id": "y"}]},
+    ] * 3
+    statistics = payloads.PayloadStatistics()
+
+    results = list(
+        payloads.validate_payloads(
+            validator,
+            pets,
+            workers=workers,
+            chunk_size=2,
+            statistics=statistics,
+        ),
+    )
+
+    assert [result.index for result in results] == list(range(9))
+    assert [result.valid for result in results] == [True, False, False] * 3
+    assert (statistics.records, statistics.valid, statistics.invalid) == (9, 3, 6)
+    assert statistics.most_common() == [
+        ("#/tags/*/id: expected integer, got string", 6),
+        ("#/photoUrls/*: expected string, got integer", 3),
+        ("#: missing required property:name", 3),
+    ]
+    assert statistics.text(limit=1).split("\n") == [
+        "9 records, 3 valid, 6 invalid",
+        "       6 #/tags/*/id: expected integer, got string",
+    ]
+
+
+def test_validate_ndjson(
+    raw_api: t.Dict[str, t.Any],
+    tmp_path: t.Any,
+) -> None:
+    file_path = tmp_path / "pets.ndjson"
+    file_path.write_text(
+        json.dumps({"name": "a", "photoUrls": []}) + "\n\n{invalid\n" + "[]\n",
+    )
+    validator = payloads.SchemaValidator.from_spec(raw_api, component="Pet")
+
+    results = list(payloads.validate_ndjson(validator, str(file_path)))
+
+    assert results == [
+        payloads.PayloadResult(0, []),
+        payloads.PayloadResult(
+            2,
+            [
+                payloads.PayloadError(
+                    "#",
+                    "invalid json: Expecting property name enclosed in double quotes",
+                ),
+            ],
+        ),
+        payloads.PayloadResult(
+            3,
+            [payloads.PayloadError("#", "expected object, got array")],
+        ),
+    ]
@@ -0,0 +1,62 @@
+import pytest
+
+from openapydantic import pointer
+
+
+def test_parse() -> None:
+    assert pointer.parse("") == ()
+    assert pointer.parse("#") == ()
+    assert pointer.parse("/") == ("",)
+    assert pointer.parse("/a~1b/c~0d/0") == ("a/b", "c~d", "0")
+    assert pointer.parse("#/a%20b/c%25d") == ("a b", "c%d")
+    # percent-decoding only applies to the uri fragment representation
+    assert pointer.parse("/a%20b") == ("a%20b",)
+
+
+def test_parse_cached() -> None:
+    pointer.parse.cache_clear()
+
+    pointer.parse("#/components/schemas/Pet")
+    pointer.parse("#/components/schemas/Pet")
+
+    assert pointer.parse.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("value", ["a/b", "#a", "/a~2", "/a~"])
+def test_parse_ko(
+    value: str,
+) -> None:
+    with pytest.raises(pointer.JsonPointerError):
+        pointer.parse(value)
+
+
+def test_build() -> None:
+    tokens = ("components", "schemas", "a/b c~d")
+
+    result = pointer.build(tokens)
+
+    assert result == "#/components/schemas/a~1b%20c~0d"
+    assert pointer.parse(result) == tokens
+
+
+def test_resolve() -> None:
+    document = {"a/b": {"list": [{"c~d": 1}]}, "": 2}
+
+    assert pointer.resolve(document, "/a~1b/list/0/c~0d") == 1
+    assert pointer.resolve(document, "#/a~1b/list/0") == {"c~d": 1}
+    assert pointer.resolve(document, ("a/b", "list")) == [{"c~d": 1}]
+    assert pointer.resolve(document, "/") == 2
+    assert pointer.resolve(document, "") is document
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["/missing", "/a~1b/list/1", "/a~1b/list/01", "/a~1b/list/-", "/a~1b/x/y"],
+)
+def test_resolve_ko(
+    value: str,
+) -> None:
+    document = {"a/b": {"list": [{"c~d": 1}], "x": 1}}
+
+    with pytest.raises(pointer.JsonPointerError):
+        pointer.resolve(document, value)
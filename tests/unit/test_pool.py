@@ -0,0 +1,82 @@
+import gc
+import typing as t
+
+from openapydantic import pool
+from openapydantic.compat import pydantic
+
+
+class Item(pydantic.BaseModel):
+    __slots__ = ("__weakref__",)
+
+    name: str
+
+
+def _raw_api() -> t.Dict[str, t.Any]:
+    return {"components": {"schemas": {}}}
+
+
+def test_pooled_without_active_pool() -> None:
+    first = pool.pooled(Item, {"name": "a"}, Item.validate)
+    second = pool.pooled(Item, {"name": "a"}, Item.validate)
+
+    assert first == second
+    assert first is not second
+
+
+def test_pooled_shares_same_content() -> None:
+    component_pool = pool.ComponentPool()
+
+    with component_pool.activate(raw_api=_raw_api()):
+        first = pool.pooled(Item, {"name": "a"}, Item.validate)
+        other = pool.pooled(Item, {"name": "b"}, Item.validate)
+    with component_pool.activate(raw_api=_raw_api()):
+        second = pool.pooled(Item, {"name": "a"}, Item.validate)
+
+    assert first is second
+    assert other is not first
+    assert (component_pool.hits, component_pool.misses) == (1, 2)
+    assert len(component_pool) == 2
+    assert pool.ComponentPool.active is None
+
+
+def test_pool_releases_unused_instances() -> None:
+    component_pool = pool.ComponentPool()
+
+    with component_pool.activate(raw_api=_raw_api()):
+        first = pool.pooled(Item, {"name": "a"}, Item.validate)
+        second = pool.pooled(Item, {"name": "b"}, Item.validate)
+
+    del first
+    gc.collect()
+
+    assert len(component_pool) == 1
+    assert list(component_pool.instances.values()) == [second]
+
+
+def test_pooled_shares_same_source() -> None:
+    sharing = pool.SourceSharing()
+    source = {"name": "a"}
+
+    with sharing.activate():
+        first = pool.pooled(Item, source, Item.validate)
+        second = pool.pooled(Item, source, Item.validate)
+        other = pool.pooled(Item, {"name": "a"}, Item.validate)
+
+    assert first is second
+    assert other is not first
+    assert sharing.hits == 1
+    assert pool.SourceSharing.active is None
+
+
+def test_pooled_shares_same_source_with_pool() -> None:
+    component_pool = pool.ComponentPool()
+    sharing = pool.SourceSharing()
+    source = {"name": "a"}
+
+    with component_pool.activate(raw_api=_raw_api()), sharing.activate():
+        first = pool.pooled(Item, source, Item.validate)
+        second = pool.pooled(Item, source, Item.validate)
+        other = pool.pooled(Item, {"name": "a"}, Item.validate)
+
+    assert first is second is other
+    assert (sharing.hits, component_pool.hits, component_pool.misses) == (1, 1, 1)
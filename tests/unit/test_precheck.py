@@ -0,0 +1,114 @@
+import typing as t
+
+import pytest
+
+from openapydantic import precheck
+
+
+@pytest.fixture
+def raw_api() -> t.Dict[str, t.Any]:
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "api", "version": "1.0"},
+        "paths": {
+            "/pets": {
+                "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "pets",
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/Pets"},
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Pets": {"items": {"$ref": "#/components/schemas/Pet"}},
+                "Pet": {"properties": {"id": {"type": "integer"}}},
+                "PetId": {"$ref": "#/components/schemas/Pet/properties/id"},
+            },
+            "parameters": {"Limit": {"name": "limit", "in": "query"}},
+        },
+    }
+
+
+def test_find_issues_ok(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    assert precheck.find_issues(raw_api) == []
+    precheck.check(raw_api)
+
+
+def test_find_issues(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    del raw_api["info"]["version"]
+    operation = raw_api["paths"]["/pets"]["get"]
+    operation["parameters"] = [{"name": "id"}, "limit"]
+    operation["responses"]["404"] = {}
+    raw_api["paths"]["/pets"]["post"] = {"operationId": "createPet"}
+    schemas = raw_api["components"]["schemas"]
+    schemas["Pets"]["items"]["$ref"] = "#/components/schemas/Missing"
+    raw_api["components"]["parameters"] = []
+
+    assert [str(issue) for issue in precheck.find_issues(raw_api)] == [
+        "#/info: missing required key:version",
+        "#/paths/~1pets/get/responses/404: missing required key:description",
+        "#/paths/~1pets/get/parameters/0: missing required key:in",
+        "#/paths/~1pets/get/parameters/1: expected object, got string",
+        "#/paths/~1pets/post: missing required key:responses",
+        "#/components/parameters: expected object, got array",
+        "#/paths/~1pets/parameters/0/$ref: unresolvable reference "
+        "#/components/parameters/Limit (Invalid array index:Limit)",
+        "#/components/schemas/Pets/items/$ref: unresolvable reference "
+        "#/components/schemas/Missing (Pointer not found:#/components/schemas/"
+        "Missing)",
+    ]
+
+
+def test_find_issues_root() -> None:
+    assert [str(issue) for issue in precheck.find_issues([])] == [
+        "#: expected object, got array",
+    ]
+    assert [
+        str(issue) for issue in precheck.find_issues({"paths": None, "info": 1})
+    ] == [
+        "#: missing required key:openapi",
+        "#/info: expected object, got number",
+    ]
+
+
+def test_find_issues_error_budget(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    raw_api["paths"] = {f"/pets{index}": {"get": {}} for index in range(10)}
+
+    assert len(precheck.find_issues(raw_api)) == 10
+    assert len(precheck.find_issues(raw_api, max_errors=3)) == 3
+    issues = precheck.find_issues(raw_api, fail_fast=True)
+    assert [issue.location for issue in issues] == ["#/paths/~1pets0/get"]
+    with pytest.raises(ValueError):
+        precheck.find_issues(raw_api, max_errors=0)
+
+
+def test_check(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    raw_api["paths"]["/pets"]["get"]["responses"]["200"]["$ref"] = 1
+
+    with pytest.raises(precheck.PrecheckError) as error:
+        precheck.check(raw_api)
+
+    assert [issue.location for issue in error.value.issues] == [
+        "#/paths/~1pets/get/responses/200/$ref",
+    ]
+    assert str(error.value) == (
+        "1 structural error(s)\n"
+        "#/paths/~1pets/get/responses/200/$ref: $ref must be a string, got number"
+    )
@@ -0,0 +1,114 @@
+import jsonpath_ng
+import pytest
+
+from openapydantic import query
+
+DOCUMENT = {
+    "paths": {
+        "/pets": {
+            "get": {"responses": {"200": {"description": "ok"}, "404": None}},
+            "parameters": [{"name": "limit"}, {"name": "offset"}],
+        },
+        "/users": {"post": {"responses": {"201": {"description": "created"}}}},
+    },
+    "tags": ["a", "b"],
+    "info": {"title": "api", "x-a-b": 1, "@id": 2, "with space": 3},
+    "empty": None,
+}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "$",
+        "$.paths",
+        "$.paths.*",
+        "$.paths.*.*",
+        "$.paths.*.*.responses",
+        "$.paths.*.*.responses.*.description",
+        "$.paths.*.*.responses['200']",
+        "$.paths.*.*.responses.200",
+        "$.paths['/pets'].parameters[*].name",
+        "$.paths['/pets'].parameters[1]",
+        "$.paths['/pets'].parameters[-1]",
+        "$.paths['/pets'].parameters[5]",
+        '$.paths["/users"].post',
+        "$.paths.'/users'.post",
+        "$.tags[*]",
+        "$.tags.*",
+        "$.tags[0]",
+        "$.info[*]",
+        "$.info.title[*]",
+        "$.info.title[0]",
+        "$.info.x-a-b",
+        "$.info.@id",
+        "$.info['with space']",
+        "$.empty[*]",
+        "$.empty.*",
+        "$.missing.*",
+        "$[*]",
+        "$..description",
+        "$..name",
+        "$..*",
+        "$..[*]",
+        "$..parameters[0]",
+        "$..['200']",
+        "$.paths..responses..description",
+        "$..parameters[*].name",
+        "$..tags[0]",
+    ],
+)
+def test_query_same_as_jsonpath_ng(
+    expression: str,
+) -> None:
+    compiled = query.compile_query(expression)
+
+    assert compiled.is_simple
+    assert compiled.find(DOCUMENT) == [
+        match.value for match in jsonpath_ng.parse(expression).find(DOCUMENT)
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "$.paths['/pets'].parameters[0:1]",
+        "$.info['title','x-a-b']",
+        "paths.*",
+    ],
+)
+def test_query_jsonpath_ng_fallback(
+    expression: str,
+) -> None:
+    compiled = query.compile_query(expression)
+
+    assert not compiled.is_simple
+    assert compiled.find(DOCUMENT) == [
+        match.value for match in jsonpath_ng.parse(expression).find(DOCUMENT)
+    ]
+
+
+def test_query_cache() -> None:
+    assert query.compile_query("$.paths.*") is query.compile_query("$.paths.*")
+    assert query.query(DOCUMENT, "$.info.title") == ["api"]
+
+
+def test_parse_simple() -> None:
+    assert query.parse_simple("$.paths['/pets'].*[*][0]") == (
+        ("key", "paths"),
+        ("key", "/pets"),
+        ("values", None),
+        ("items", None),
+        ("index", 0),
+    )
+    assert query.parse_simple("$.a..b[*]") == (
+        ("key", "a"),
+        ("descendants", ("key", "b")),
+        ("items", None),
+    )
+    assert query.parse_simple("$.a[0:1]") is None
+
+
+def test_query_invalid_expression() -> None:
+    with pytest.raises(Exception):
+        query.compile_query("$.paths[")
@@ -6,6 +6,7 @@ from pytest_mock import MockerFixture
 
 from openapydantic import common
 from openapydantic import resolver
+from tests.unit import test_loaders
 
 ComponentType = common.ComponentType
 ComponentsResolver = resolver.ComponentsResolver
@@ -22,6 +23,19 @@ def test_get_ref_data_ok() -> None:
     assert ref_key == "Pet"
 
 
+def test_get_ref_data_json_pointer() -> None:
+    ref = "#/components/schemas/Pet%20Tag/properties/owner"
+
+    ref_type, ref_key = resolver.get_ref_data(
+        ref=ref,
+    )
+
+    assert ref_type == ComponentType.schemas
+    assert ref_key == "Pet Tag"
+    assert resolver.parse_ref(ref)[2] == ("properties", "owner")
+    assert resolver.get_ref_component(ref=ref) == "#/components/schemas/Pet%20Tag"
+
+
 def test_get_ref_data_ko() -> None:
     ref = "invalid-ref"
 
@@ -116,7 +130,7 @@ def test_components_resolver_list_self_reference_ok() -> None:
         references=references,
     )
 
-    assert ComponentsResolver.self_ref == references
+    assert ComponentsResolver.self_ref == set(references)
     ComponentsResolver.init()
 
 
@@ -131,4 +145,212 @@ def test_components_resolver_list_self_reference_ok_no_ref() -> None:
         references=references,
     )
 
-    assert ComponentsResolver.self_ref == []
+    assert ComponentsResolver.self_ref == set()
+
+
+def test_strongly_connected_components() -> None:
+    graph = {
+        "a": ["b"],
+        "b": ["c", "d"],
+        "c": ["b"],
+        "d": ["d"],
+        "e": [],
+    }
+
+    result = resolver.strongly_connected_components(graph)
+
+    assert [sorted(scc) for scc in result] == [["d"], ["b", "c"], ["a"], ["e"]]
+
+
+def test_components_resolver_index_mutual_references() -> None:
+    raw_api = {
+        "components": {
+            "schemas": {
+                "Node": {"properties": {"edge": {"$ref": "#/components/schemas/Edge"}}},
+                "Edge": {"properties": {"node": {"$ref": "#/components/schemas/Node"}}},
+                "Graph": {
+                    "properties": {"root": {"$ref": "#/components/schemas/Node"}}
+                },
+                "Label": {"type": "string"},
+            },
+        },
+    }
+
+    ComponentsResolver.index(raw_api=raw_api)
+
+    assert ComponentsResolver.self_ref == {
+        "#/components/schemas/Node",
+        "#/components/schemas/Edge",
+    }
+    assert ComponentsResolver.components_order[-1] == "#/components/schemas/Graph"
+    ComponentsResolver.init()
+
+
+def test_components_resolver_resolve_reference_not_found() -> None:
+    raw_api = {
+        "components": {
+            "schemas": {
+                "Pet": {
+                    "properties": {"owner": {"$ref": "#/components/schemas/Owner"}}
+                },
+            },
+        },
+    }
+
+    with pytest.raises(ValueError):
+        ComponentsResolver.resolve(
+            raw_api=raw_api,
+            version=common.OpenApiVersion.v3_0_2,
+        )
+    ComponentsResolver.init()
+
+
+def test_reference_targets() -> None:
+    raw_api = {
+        "components": {
+            "schemas": {
+                "Node": {"properties": {"next": {"$ref": "#/components/schemas/Node"}}},
+                "Alias": {"$ref": "#/components/schemas/Label"},
+                "Label": {"type": "string", "enum": ["a", "b"]},
+            },
+        },
+    }
+
+    targets = resolver.ReferenceTargets(raw_api=raw_api)
+
+    assert targets.kept == {"#/components/schemas/Node"}
+    assert targets.resolve({"$ref": "#/components/schemas/Alias"}) == {
+        "type": "string",
+        "enum": ["a", "b"],
+    }
+    assert targets.resolve({"$ref": "#/components/schemas/Label/enum"}) == ["a", "b"]
+    assert targets.resolve({"$ref": "#/components/schemas/Node"}) == {
+        "$ref": "#/components/schemas/Node"
+    }
+    with pytest.raises(ValueError):
+        targets.resolve({"$ref": "#/components/schemas/Owner"})
+
+
+def test_reference_targets_document_ref() -> None:
+    raw_api = {
+        "paths": {
+            "/pets": {"get": {"parameters": [{"$ref": "#/components/parameters/L"}]}},
+            "/loop": {"$ref": "#/paths/~1loop"},
+        },
+        "components": {"parameters": {"L": {"name": "limit", "in": "query"}}},
+    }
+
+    targets = resolver.ReferenceTargets(raw_api=raw_api)
+
+    assert targets.resolve({"$ref": "#/paths/~1pets/get/parameters/0"}) == {
+        "name": "limit",
+        "in": "query",
+    }
+    with pytest.raises(ValueError, match="cycle"):
+        targets.resolve({"$ref": "#/paths/~1loop"})
+
+
+@pytest.mark.parametrize(
+    "location,expected",
+    [
+        (("components", "responses", "NotFound"), ComponentType.responses),
+        (("paths", "/pets", "get", "parameters", 0), ComponentType.parameters),
+        (("paths", "/pets", "get", "responses", "404"), ComponentType.responses),
+        (("paths", "/pets", "post", "requestBody"), ComponentType.request_bodies),
+        (("content", "application/json", "schema"), ComponentType.schemas),
+        (("properties", "headers"), ComponentType.schemas),
+        (("paths", "/pets"), None),
+        ((), None),
+    ],
+)
+def test_infer_component_type(
+    location: resolver.Location,
+    expected: t.Optional[ComponentType],
+) -> None:
+    assert resolver.infer_component_type(location) == expected
+
+
+def test_resolve_fragment() -> None:
+    document = {"a/b": {"list": [{"c~d": 1}]}}
+
+    assert resolver.resolve_fragment(document, "/a~1b/list/0/c~0d") == 1
+    assert resolver.resolve_fragment(document, "") == document
+
+
+@pytest.mark.asyncio
+async def test_external_references_resolver() -> None:
+    documents = {
+        "mem://root/pet.yaml": {
+            "type": "object",
+            "properties": {"tag": {"$ref": "#/Tag"}},
+            "Tag": {"$ref": "other.yaml#/components/schemas/Tag"},
+        },
+        "mem://root/other.yaml": {
+            "components": {
+                "schemas": {
+                    "Tag": {"properties": {"pet": {"$ref": "pet.yaml"}}},
+                },
+            },
+        },
+    }
+    loader = test_loaders.FakeLoader(documents)
+    raw_api = {
+        "paths": {
+            "/pets": {"get": {"parameters": [{"$ref": "#/components/schemas/Tag"}]}},
+        },
+        "components": {"schemas": {"Pet": {"$ref": "pet.yaml"}}},
+    }
+    external_resolver = resolver.ExternalReferencesResolver(
+        base_uri="mem://root/api.yaml",
+        loaders={"mem": loader},
+    )
+
+    result = await external_resolver.resolve(raw_api=raw_api)
+
+    assert sorted(loader.calls) == ["mem://root/other.yaml", "mem://root/pet.yaml"]
+    schemas = result["components"]["schemas"]
+    assert schemas["Pet"] == {"$ref": "#/components/schemas/pet"}
+    assert schemas["pet"]["properties"]["tag"] == {"$ref": "#/components/schemas/Tag_2"}
+    assert schemas["Tag_2"] == {"$ref": "#/components/schemas/Tag_3"}
+    assert schemas["Tag_3"]["properties"]["pet"] == {
+        "$ref": "#/components/schemas/pet",
+    }
+    assert external_resolver.cycles
+    assert result["paths"] == raw_api["paths"]
+
+
+@pytest.mark.asyncio
+async def test_external_references_resolver_keeps_aliases() -> None:
+    loader = test_loaders.FakeLoader({"mem://root/pet.yaml": {"type": "object"}})
+    # the same object at two places, like a yaml alias
+    responses = {"200": {"schema": {"$ref": "pet.yaml"}}}
+    raw_api = {
+        "paths": {
+            "/pets": {"get": {"responses": responses}},
+            "/pets/{id}": {"get": {"responses": responses}},
+        },
+    }
+
+    result = await resolver.resolve_external_references(
+        raw_api=raw_api,
+        base_uri="mem://root/api.yaml",
+        loaders={"mem": loader},
+    )
+
+    paths = result["paths"]
+    assert paths["/pets"]["get"]["responses"] == {
+        "200": {"schema": {"$ref": "#/components/schemas/pet"}},
+    }
+    assert paths["/pets"]["get"]["responses"] is paths["/pets/{id}"]["get"]["responses"]
+
+
+@pytest.mark.asyncio
+async def test_external_references_resolver_no_external_reference() -> None:
+    raw_api = {"components": {"schemas": {"Pet": {"$ref": "#/components/schemas/A"}}}}
+
+    result = await resolver.resolve_external_references(
+        raw_api=raw_api,
+        base_uri="file:///api.yaml",
+    )
+
+    assert result is raw_api
@@ -0,0 +1,127 @@
+import typing as t
+
+import pytest
+
+from openapydantic import selection
+
+
+def _schema_ref(
+    name: str,
+) -> t.Dict[str, str]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+@pytest.fixture
+def raw_api() -> t.Dict[str, t.Any]:
+    return {
+        "openapi": "3.0.2",
+        "paths": {
+            "/pets": {
+                "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                "get": {
+                    "operationId": "listPets",
+                    "tags": ["pet"],
+                    "responses": {"200": {"schema": _schema_ref("Pets")}},
+                },
+                "post": {
+                    "operationId": "createPet",
+                    "tags": ["pet", "admin"],
+                    "responses": {"200": {"schema": _schema_ref("Pet")}},
+                },
+            },
+            "/users": {
+                "get": {
+                    "operationId": "listUsers",
+                    "tags": ["user"],
+                    "responses": {"200": {"schema": _schema_ref("User")}},
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Pets": {"items": _schema_ref("Pet")},
+                "Pet": {"properties": {"owner": _schema_ref("User")}},
+                "User": {"properties": {"pets": _schema_ref("Pets")}},
+                "Unused": {"type": "string"},
+            },
+            "parameters": {"Limit": {"name": "limit", "in": "query"}},
+            "securitySchemes": {"api_key": {"type": "apiKey"}},
+        },
+    }
+
+
+def test_select_operations_operation_ids(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    result = selection.select_operations(raw_api, include_operation_ids=["listUsers"])
+
+    assert result["paths"] == {"/users": raw_api["paths"]["/users"]}
+    # User -> Pets -> Pet -> User
+    assert set(result["components"]["schemas"]) == {"User", "Pets", "Pet"}
+    assert "parameters" not in result["components"]
+    assert result["components"]["securitySchemes"] == {"api_key": {"type": "apiKey"}}
+
+
+def test_select_operations_tags(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    result = selection.select_operations(raw_api, include_tags=["admin"])
+
+    assert list(result["paths"]) == ["/pets"]
+    assert set(result["paths"]["/pets"]) == {"parameters", "post"}
+    assert set(result["components"]) == {"schemas", "parameters", "securitySchemes"}
+
+
+def test_select_operations_paths(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    result = selection.select_operations(
+        raw_api,
+        include_paths=["/pet*"],
+        include_operation_ids=["listUsers"],
+    )
+
+    assert result["paths"] == raw_api["paths"]
+    assert "Unused" not in result["components"]["schemas"]
+    assert selection.select_operations(raw_api, include_paths=[])["paths"] == {}
+
+
+def test_split_spec(
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    raw_api["tags"] = [{"name": "pet"}, {"name": "admin"}, {"name": "user"}]
+    raw_api["paths"]["/health"] = {"get": {"responses": {}}}
+
+    shards = selection.split_spec(raw_api)
+
+    assert list(shards) == ["pet", "admin", "user", selection.DEFAULT_SHARD]
+    assert set(shards["pet"]["paths"]["/pets"]) == {"parameters", "get", "post"}
+    assert set(shards["admin"]["paths"]["/pets"]) == {"parameters", "post"}
+    assert list(shards["admin"]["components"]["schemas"]) == ["Pets", "Pet", "User"]
+    assert shards["admin"]["tags"] == [{"name": "pet"}, {"name": "admin"}]
+    assert shards["default"]["components"] == {
+        "securitySchemes": raw_api["components"]["securitySchemes"],
+    }
+    # same closure as a selective load
+    for name in ("pet", "user"):
+        assert shards[name]["components"] == (
+            selection.select_operations(raw_api, include_tags=[name])["components"]
+        )
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        (selection.by_path_prefix, ["pets", "users"]),
+        (selection.by_extension("x-service"), ["pets", "default"]),
+    ],
+)
+def test_split_spec_keys(
+    raw_api: t.Dict[str, t.Any],
+    key: selection.ShardKey,
+    expected: t.List[str],
+) -> None:
+    raw_api["paths"]["/pets"]["get"]["x-service"] = "pets"
+    raw_api["paths"]["/pets"]["post"]["x-service"] = ["pets"]
+
+    assert list(selection.split_spec(raw_api, key=key)) == expected
@@ -0,0 +1,106 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import typing as t
+
+import pytest
+
+from openapydantic import shared
+from openapydantic import versions
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+
+@pytest.fixture(name="api", scope="module")
+def fixture_api() -> t.Any:
+    file_path = os.path.join(FIXTURE_DIR, "ok", "petstore.yaml")
+    return asyncio.run(versions.load_api(file_path=file_path))
+
+
+def test_encode() -> None:
+    item = {"name": "é" * 100, "values": [1, -(2**70), 1.5, True, False, None]}
+    document = {"b": item, "a": [item, {}], "": "x"}
+
+    view = shared.ApiView(shared.encode(document))
+
+    assert view.to_python() == document
+    assert list(view) == ["b", "a", ""]
+    assert view[""] == "x"
+    assert view["b"]["values"][1] == -(2**70)
+    assert view.a[-1].to_python() == {}
+    assert view.a[:1][0]["name"] == "é" * 100
+    with pytest.raises(IndexError):
+        view.a[2]
+    with pytest.raises(KeyError):
+        view["c"]
+    # identical values are stored once
+    assert len(shared.encode(document)) < len(shared.encode(item)) + 100
+
+    with pytest.raises(ValueError, match="Not an encoded api"):
+        shared.ApiView(b"OAPX" + bytes(100))
+    with pytest.raises(TypeError, match="not json serializable:set"):
+        shared.encode({"a": set()})
+
+
+def test_api_view(
+    api: t.Any,
+) -> None:
+    view = shared.ApiView(shared.dump(api))
+
+    operation = view.paths["/pet/{petId}"].get
+    assert operation.operation_id == api.paths["/pet/{petId}"].get.operation_id
+    assert operation.request_body is None
+    assert [parameter.in_ for parameter in operation.parameters] == ["path"]
+    schema = view.paths["/pet"].post.request_body.content["application/json"].schema_
+    assert schema.required.to_python() == ["name", "photoUrls"]
+    tags = schema.properties["tags"]
+    assert (tags.xml.name, tags.items.xml.name) == ("tag", "Tag")
+    assert "Pet" in view.components.schemas
+    assert view.components.schemas.get("Unknown") is None
+    assert list(view.paths) == list(api.paths)
+    assert view.info.title == api.info.title
+    assert view.to_python() == json.loads(api.as_clean_json(exclude_components=False))
+
+
+def test_open_file(
+    api: t.Any,
+    tmp_path: t.Any,
+) -> None:
+    file_path = str(tmp_path / "api.bin")
+
+    assert shared.write(api, file_path) == os.path.getsize(file_path)
+
+    with shared.open_file(file_path) as view:
+        assert view.info.version == "1.0.0"
+
+
+def _operation_ids(
+    name: str,
+) -> t.List[str]:
+    with shared.attach(name) as view:
+        return [
+            operation.operation_id
+            for path_item in view.paths.values()
+            for operation in (path_item.get, path_item.post)
+            if operation is not None
+        ]
+
+
+def test_share(
+    api: t.Any,
+) -> None:
+    memory = shared.share(api)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+            operation_ids = executor.submit(_operation_ids, memory.name).result()
+        assert operation_ids[:2] == ["addPet", "findPetsByStatus"]
+        assert _operation_ids(memory.name) == operation_ids
+    finally:
+        memory.close()
+        memory.unlink()
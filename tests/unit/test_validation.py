@@ -0,0 +1,139 @@
+import os
+import shutil
+import typing as t
+import xml.etree.ElementTree as ET  # nosec
+
+import pytest
+
+from openapydantic import validation
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "integration",
+    "v3.0.2",
+    "fixture",
+)
+
+Status = validation.Status
+
+
+@pytest.fixture
+def specs(
+    tmp_path: t.Any,
+) -> t.Dict[str, str]:
+    shutil.copytree(os.path.join(FIXTURE_DIR, "external"), tmp_path / "external")
+    shutil.copy(os.path.join(FIXTURE_DIR, "ok", "petstore.yaml"), tmp_path)
+    shutil.copy(
+        os.path.join(FIXTURE_DIR, "ref-error-invalid-path-format.yaml"), tmp_path
+    )
+    return {
+        "external": str(tmp_path / "external" / "api.yaml"),
+        "ok": str(tmp_path / "petstore.yaml"),
+        "ko": str(tmp_path / "ref-error-invalid-path-format.yaml"),
+    }
+
+
+def test_expand_paths(
+    tmp_path: t.Any,
+    specs: t.Dict[str, str],
+) -> None:
+    assert validation.expand_paths([str(tmp_path / "*.yaml")]) == [
+        specs["ok"],
+        specs["ko"],
+    ]
+    result = validation.expand_paths([str(tmp_path), specs["ok"]])
+    assert specs["external"] in result
+    assert os.path.join(str(tmp_path), "external", "schemas", "pet.yaml") in result
+    assert len(result) == len(set(result))
+    assert validation.expand_paths([str(tmp_path / "missing.yaml")]) == []
+
+
+def test_validate_file(
+    specs: t.Dict[str, str],
+) -> None:
+    result = validation.validate_file(specs["external"])
+    assert result.status == Status.passed
+    assert specs["external"] in result.dependencies
+    assert (
+        os.path.join(os.path.dirname(specs["external"]), "schemas", "pet.yaml")
+        in result.dependencies
+    )
+
+    result = validation.validate_file(specs["ko"])
+    assert result.status == Status.failed
+    assert "invalid-format" in result.error  # type: ignore
+    assert not result.dependencies
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_files(
+    specs: t.Dict[str, str],
+    workers: int,
+) -> None:
+    file_paths = [specs["ok"], specs["ko"], specs["external"]]
+
+    report = validation.validate_files(file_paths, workers=workers)
+
+    assert [result.file_path for result in report.results] == file_paths
+    assert [result.status for result in report.results] == [
+        Status.passed,
+        Status.failed,
+        Status.passed,
+    ]
+    assert not report.ok
+
+
+def test_validate_files_state(
+    tmp_path: t.Any,
+    specs: t.Dict[str, str],
+) -> None:
+    state_path = str(tmp_path / "state.json")
+    file_paths = [specs["ok"], specs["ko"], specs["external"]]
+    state = validation.ValidationState(file_path=state_path)
+    validation.validate_files(file_paths, workers=1, state=state)
+    state.save()
+
+    state = validation.ValidationState(file_path=state_path)
+    report = validation.validate_files(file_paths, workers=1, state=state)
+    assert [result.status for result in report.results] == [
+        Status.skipped,
+        Status.failed,
+        Status.skipped,
+    ]
+
+    # a referenced document changed
+    pet_path = os.path.join(os.path.dirname(specs["external"]), "schemas", "pet.yaml")
+    with open(pet_path, "a") as file:
+        file.write("\n")
+    report = validation.validate_files(file_paths, workers=1, state=state)
+    assert report.results[2].status == Status.passed
+
+    # other options, other state
+    state = validation.ValidationState(file_path=state_path, options="other")
+    assert not state.is_unchanged(specs["ok"])
+
+
+def test_report_junit(
+    specs: t.Dict[str, str],
+) -> None:
+    report = validation.ValidationReport(
+        results=[
+            validation.FileResult(file_path=specs["ok"], status=Status.passed),
+            validation.FileResult(
+                file_path=specs["ko"],
+                status=Status.failed,
+                error="ValueError: invalid\ndetails",
+            ),
+            validation.FileResult(file_path="other.yaml", status=Status.skipped),
+        ],
+    )
+
+    suite = ET.fromstring(report.junit())  # nosec
+
+    assert suite.attrib["tests"] == "3"
+    assert suite.attrib["failures"] == "1"
+    assert suite.attrib["skipped"] == "1"
+    failure = suite.findall("testcase")[1].find("failure")
+    assert failure is not None
+    assert failure.attrib["message"] == "ValueError: invalid"
+    assert report.text().endswith("1 passed, 1 failed, 1 skipped")
@@ -7,6 +7,10 @@ import yaml
 from pytest_mock import MockerFixture
 
 from openapydantic import common
+from openapydantic import compat
+from openapydantic import fingerprint
+from openapydantic import interning
+from openapydantic import pool
 from openapydantic import versions
 
 
@@ -96,6 +100,7 @@ async def test_load_api_ok(
 
     m_load_spec.assert_called_once_with(
         file_path="fake",
+        max_aliases=None,
     )
     m_load_api_302.assert_called_once_with(
         raw_api=m_load_spec.return_value,
@@ -122,3 +127,119 @@ async def test_get_component_object_proxy_ok(
         component_type=common.ComponentType.schemas,
         values=raw_api,
     )
+
+
+@pytest.mark.asyncio
+async def test_load_spec_intern(
+    mocker: MockerFixture,
+    raw_api: t.Dict[str, t.Any],
+) -> None:
+    m_intern = mocker.spy(interning, "intern_spec")
+    file_path = os.path.join(os.path.dirname(__file__), "fixture", "simple.yaml")
+
+    result = await versions.load_spec(file_path=file_path, intern=True)
+
+    m_intern.assert_called_once()
+    assert result == raw_api
+
+
+@pytest.mark.asyncio
+async def test_load_api_trusted(
+    raw_api: t.Dict[str, t.Any],
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        versions,
+        "load_spec",
+        return_value=raw_api,
+    )
+    m_construct_api = mocker.patch.object(
+        versions.openapi_302,
+        "construct_api",
+    )
+    m_load_api_302 = mocker.patch.object(
+        versions.openapi_302,
+        "load_api",
+    )
+
+    await versions.load_api(
+        file_path="fake",
+        trusted=True,
+        fingerprint=fingerprint.compute_fingerprint(raw_api=raw_api),
+    )
+
+    m_construct_api.assert_called_once_with(raw_api=raw_api)
+    m_load_api_302.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_load_api_trusted_never_validated(
+    raw_api: t.Dict[str, t.Any],
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        versions,
+        "load_spec",
+        return_value=raw_api,
+    )
+
+    with pytest.raises(ValueError):
+        await versions.load_api(
+            file_path="fake",
+            trusted=True,
+            fingerprint="not-validated",
+        )
+
+
+@pytest.mark.asyncio
+async def test_load_api_pool_requires_pydantic_v1_backend() -> None:
+    with pytest.raises(ValueError):
+        await versions.load_api(
+            file_path="fake",
+            pool=pool.ComponentPool(),
+            backend=common.ModelBackend.pydantic_v2,
+        )
+
+
+@pytest.mark.asyncio
+async def test_load_api_trusted_requires_pydantic_v1_backend() -> None:
+    with pytest.raises(ValueError, match="Trusted mode"):
+        await versions.load_api(
+            file_path="fake",
+            trusted=True,
+            backend=common.ModelBackend.pydantic_v2,
+        )
+
+
+@pytest.mark.skipif(compat.PYDANTIC_V2, reason="pydantic v2 is installed")
+@pytest.mark.asyncio
+async def test_load_api_pydantic_v2_backend_not_installed(
+    raw_api: t.Dict[str, t.Any],
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        versions,
+        "load_spec",
+        return_value=raw_api,
+    )
+
+    with pytest.raises(ImportError):
+        await versions.load_api(
+            file_path="fake",
+            backend=common.ModelBackend.pydantic_v2,
+        )
+
+
+def test_get_version_module_unsupported_backend(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.dict(
+        versions.VERSION_MODULES,
+        {common.OpenApiVersion.v3_0_1: {}},
+    )
+
+    with pytest.raises(NotImplementedError):
+        versions.get_version_module(
+            common.OpenApiVersion.v3_0_1,
+            common.ModelBackend.pydantic_v2,
+        )